@@ -1,4 +1,4 @@
 # Capablanca: 2-Approximation Dominating Set Solver https://pypi.org/project/capablanca
 # Author: Frank Vega
 
-__all__ = ["utils", "algorithm", "parser", "applogger", "chordal", "test", "app", "batch"]
\ No newline at end of file
+__all__ = ["utils", "algorithm", "parser", "applogger", "chordal", "test", "app", "batch", "cache", "exact", "reduction", "greedy", "dynamic", "bench", "instrumentation", "compare", "localsearch", "validate", "serve", "external", "dispatch"]
\ No newline at end of file
@@ -2,15 +2,47 @@
 # Author: Frank Vega
 
 import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import networkx as nx
+import numpy as np
 from . import chordal
+from . import dispatch
+from . import exact
+from . import greedy
+from . import instrumentation
+from . import localsearch
+from . import reduction
 
-def find_dominating_set(graph):
+# Components are grouped into tasks of at least this many vertices and edges for the process pool
+MIN_TASK_SIZE = 4096
+
+# Versions of the solvers, bumped whenever a change may alter their results (which invalidates cached results)
+SOLVER_VERSIONS = {
+    "find_dominating_set": 4,
+    "find_dominating_set_brute_force": 2,
+    "find_dominating_set_approximation": 1,
+}
+
+def find_dominating_set(graph, workers=None, reduce=False, stats=None, time_budget=None, progress=None):
     """
     Find a 2-approximate dominating set with a 2-approximation ratio for an undirected graph by transforming it into a chordal graph.
 
     Args:
         graph (nx.Graph): A NetworkX Graph object representing the input graph.
+        workers (int, optional): Number of processes solving the connected components in parallel (sequential by default).
+        reduce (bool or tuple, optional): Solve the kernel of the reduction rules instead of the graph, either
+            computed here (True) or given as the result of reduction.reduce_graph(graph). Defaults to False.
+        stats (instrumentation.Stats, optional): Receives the time in nanoseconds of the isolates, reduction,
+            components, chordal_build and greedy phases and the number of components, lookup_components,
+            exact_components and chordal_components (see dispatch.strategy), edges_materialized (CSR entries
+            built) and neighborhood_scans. Without it nothing is measured. Defaults to None.
+        time_budget (float, optional): Seconds, counted from the call, until which the 2-approximation is
+            shrunk by local search (see localsearch.improve_dominating_set). Every intermediate set is a
+            valid dominating set. Defaults to None (no local search).
+        progress (callable, optional): Called by the local search as progress(size) with the size of the
+            2-approximation and of every smaller set it finds. Defaults to None.
 
     Returns:
         set: A set of vertex indices representing the 2-approximate dominating set.
@@ -24,77 +56,488 @@ def find_dominating_set(graph):
     if graph.number_of_nodes() == 0 or graph.number_of_edges() == 0:
         return set()
 
+    started = time.monotonic()
+    stats = stats or instrumentation.DISABLED
+
+    if reduce is True:
+        with stats.phase("reduction"):
+            reduce = reduction.reduce_graph(graph)
+    reduced = _reduce(graph, reduce)
+    if reduced is not None:
+        # The forced vertices already dominate some kernel vertices, which are left out of the greedy choices
+        kernel, forced, dominated, _ = reduced
+        dominating_set = forced | _find_dominating_set_in_components(kernel, workers, dominated, stats)
+        return _improve(graph, dominating_set, started, time_budget, progress, stats)
+
     # Include isolated nodes in the dominating set and remove them from the graph
-    optimal_dominating_set = set(nx.isolates(graph))
-    graph.remove_nodes_from(optimal_dominating_set)
+    with stats.phase("isolates"):
+        optimal_dominating_set = set(nx.isolates(graph))
+        graph.remove_nodes_from(optimal_dominating_set)
 
     # If the graph becomes empty after removing isolated nodes, return the set of isolated nodes
     if graph.number_of_nodes() == 0:
         return optimal_dominating_set
 
-    for component in nx.connected_components(graph):
-    
-        # Subgraph for the connected component
-        subgraph = graph.subgraph(component)
-    
-        # Create a new graph to transform the original into a chordal graph structure
-        chordal_graph = nx.Graph()
-        
-        # Add edges to create a chordal structure
-        # This ensures the dominating set in the chordal graph corresponds to one in the original subgraph
-        for i in subgraph.nodes():
-            chordal_graph.add_edge((i, 0), (i, 1))
-            for j in subgraph.neighbors(i):
-                    # Create tuple nodes in the chordal graph
-                    chordal_graph.add_edge((i, 0), (j, 1))
-        
-        # Add edges to ensure chordality by forming a clique among (i, 0) nodes
-        for i in subgraph.nodes():
-            for j in subgraph.nodes():
-                if i < j:
-                    chordal_graph.add_edge((i, 0), (j, 0))
-
-        # Compute the approximate dominating set in the transformed chordal graph
-        tuple_nodes = chordal.approximate_dominating_set_chordal(chordal_graph)
-
-        # Extract original nodes from the tuple nodes and update the dominating set
-        optimal_dominating_set.update({tuple_node[0] for tuple_node in tuple_nodes})
-
-    return optimal_dominating_set
-
-
-def find_dominating_set_brute_force(graph):
+    optimal_dominating_set.update(_find_dominating_set_in_components(graph, workers, stats=stats))
+    return _improve(graph, optimal_dominating_set, started, time_budget, progress, stats)
+
+def find_dominating_sets(graphs, stats=None):
+    """
+    Find 2-approximate dominating sets of many graphs in one batch, meant for large numbers of small graphs.
+
+    The graphs are packed into one block-diagonal CSR adjacency whose blocks are their connected
+    components. Every component is solved by the strategy of its size, as in find_dominating_set: the
+    tiny ones are looked up together in the tables of dispatch.optimal_table, the small ones are searched
+    one by one, and the chordal (split) transformations of all the large ones are built by the same array
+    operations and a single greedy pass solves them (see chordal.approximate_dominating_set_split_blocks),
+    so no NetworkX graph or subgraph is built for graphs given as edge arrays.
+
+    The vertices of every component are taken in the order of their graph and the neighbors of every
+    vertex in the order they were added, as in find_dominating_set, so every graph gets the same set
+    as from find_dominating_set.
+
+    Args:
+        graphs (iterable): The graphs, each one a NetworkX Graph or a tuple (rows, cols) of arrays with the
+            0-based endpoints of its edges in file order, as returned by parser.read_arrays.
+        stats (instrumentation.Stats, optional): Receives the time in nanoseconds of the components, chordal_build
+            and greedy phases and the number of components, lookup_components, exact_components, chordal_components
+            and edges_materialized of the whole batch. Defaults to None.
+
+    Returns:
+        list: The set of vertices of a 2-approximate dominating set of every graph, in order (an empty set for a
+            graph without edges).
+    """
+    import scipy.sparse as sparse
+    from scipy.sparse.csgraph import connected_components
+
+    stats = stats or instrumentation.DISABLED
+    graphs = list(graphs)
+
+    # Packing the graphs and finding their components is the components phase of the batch
+    with stats.phase("components"):
+        sizes = np.zeros(len(graphs), dtype=np.int64)
+        names = [None] * len(graphs)
+        # Every graph contributes its vertices in graph order, and the CSR entries of each vertex in the
+        # order its neighbors were added, as (graph, local source, local target) triples
+        entries = []
+
+        arrays = [g for g, graph in enumerate(graphs) if not isinstance(graph, nx.Graph) and len(graph[0])]
+        if arrays:
+            entry, vertices, labels = _pack_edge_arrays([graphs[g] for g in arrays])
+            sizes[arrays] = vertices
+            entries.append((np.asarray(arrays, dtype=np.int64)[entry[0]], entry[1], entry[2]))
+            for g, names_of_graph in zip(arrays, np.split(labels, np.cumsum(vertices)[:-1]), strict=True):
+                names[g] = names_of_graph
+
+        for g, graph in enumerate(graphs):
+            if isinstance(graph, nx.Graph) and graph.number_of_edges() > 0:
+                nodes = list(graph.nodes())
+                indptr, indices = chordal.graph_to_csr(graph, nodes)
+                sizes[g] = len(nodes)
+                names[g] = nodes
+                entries.append((np.full(len(indices), g, dtype=np.int64), np.repeat(np.arange(len(nodes), dtype=np.int64), np.diff(indptr)), indices))
+
+        # Global vertex numbers, the graphs one after another
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        n = int(offsets[-1])
+        if n == 0:
+            return [set() for _ in graphs]
+        owners = np.concatenate([owner for owner, _, _ in entries])
+        sources = offsets[owners] + np.concatenate([source for _, source, _ in entries])
+        targets = offsets[owners] + np.concatenate([target for _, _, target in entries])
+        # Sorting by source keeps the neighbor order of every vertex, the entries of one vertex come from one graph
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        indices = targets[order]
+
+        # The components in order of their first vertex, each one in graph order
+        count, labels = connected_components(sparse.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n)), directed=False)
+        first = np.full(count, n, dtype=np.int64)
+        np.minimum.at(first, labels, np.arange(n, dtype=np.int64))
+        permutation = np.argsort(first[labels], kind="stable")
+        position = np.empty(n, dtype=np.int64)
+        position[permutation] = np.arange(n, dtype=np.int64)
+        starts = np.flatnonzero(np.diff(first[labels][permutation], prepend=-1))
+
+        degree = np.diff(indptr)[permutation]
+        block_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degree, out=block_indptr[1:])
+        block_indices = position[indices[chordal._row_positions(indptr, permutation, degree)]]
+    stats.count("components", len(starts))
+
+    # Every component goes to the strategy of its size (see dispatch.strategy): the tiny ones are looked up
+    # all at once, the small ones searched one by one and the others solved together by the greedy pass
+    ends = np.append(starts[1:], n)
+    strategies = np.array([dispatch.strategy(size) for size in (ends - starts).tolist()])
+    chosen = []
+    tiny = strategies == "lookup"
+    stats.count("lookup_components", int(tiny.sum()))
+    chosen.append(dispatch.solve_tiny_blocks(block_indptr, block_indices, starts[tiny], ends[tiny]))
+    for start, end in zip(starts[strategies == "exact"].tolist(), ends[strategies == "exact"].tolist(), strict=True):
+        chosen.append(np.fromiter(dispatch.solve_component_csr(block_indptr, block_indices, np.arange(start, end), None, stats), dtype=np.int64))
+    large = strategies == "chordal"
+    if large.any():
+        # The large blocks are renumbered into a block-diagonal graph of their own
+        stats.count("chordal_components", int(large.sum()))
+        lengths = ends[large] - starts[large]
+        vertices = np.repeat(starts[large], lengths) + np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        renumber = np.full(n, -1, dtype=np.int64)
+        renumber[vertices] = np.arange(len(vertices), dtype=np.int64)
+        degree = block_indptr[vertices + 1] - block_indptr[vertices]
+        large_indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+        np.cumsum(degree, out=large_indptr[1:])
+        large_indices = renumber[block_indices[chordal._row_positions(block_indptr, vertices, degree)]]
+        large_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        chosen.append(vertices[sorted(chordal.approximate_dominating_set_split_blocks(large_indptr, large_indices, large_starts, stats))])
+
+    selected = permutation[np.sort(np.concatenate(chosen))]
+
+    # Back to the vertices of every graph
+    owner = np.searchsorted(offsets, selected, side="right") - 1
+    results = [set() for _ in graphs]
+    bounds = np.searchsorted(owner, np.arange(len(graphs) + 1))
+    for g in np.flatnonzero(np.diff(bounds)).tolist():
+        local = selected[bounds[g]:bounds[g + 1]] - offsets[g]
+        if isinstance(names[g], np.ndarray):
+            results[g] = set(names[g][local].tolist())
+        else:
+            results[g] = {names[g][i] for i in local.tolist()}
+    return results
+
+def _pack_edge_arrays(graphs):
+    """
+    Numbers the vertices of graphs given as edge arrays in the order edges_to_graph adds them, for all the graphs at once.
+
+    Args:
+        graphs (list): Tuples (rows, cols) of arrays with the 0-based endpoints of the edges of every graph, with at least one edge each.
+
+    Returns:
+        tuple: The CSR entries (graphs, sources, targets) of both directions of every edge (self loops left out) in edge
+            order, as integer arrays of the position of the graph in graphs and the local vertex numbers of the endpoints,
+            the number of vertices of every graph, and the 0-based vertex of every local vertex number, graph after graph.
+    """
+    counts = np.array([len(rows) for rows, _ in graphs], dtype=np.int64)
+    rows = np.concatenate([np.asarray(rows, dtype=np.int64) for rows, _ in graphs])
+    cols = np.concatenate([np.asarray(cols, dtype=np.int64) for _, cols in graphs])
+    edge_graph = np.repeat(np.arange(len(graphs), dtype=np.int64), counts)
+
+    # The endpoints in the order the edges add them, shifted so that no two graphs share a vertex number
+    endpoints = np.column_stack((rows, cols)).ravel()
+    span = np.maximum.reduceat(endpoints, 2 * np.concatenate(([0], np.cumsum(counts)[:-1]))) + 1
+    base = np.concatenate(([0], np.cumsum(span)[:-1]))
+    keys = endpoints + np.repeat(base[edge_graph], 2)
+
+    # A vertex is numbered by its first appearance, which also keeps the graphs in order
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    number = np.empty(len(unique), dtype=np.int64)
+    number[order] = np.arange(len(unique), dtype=np.int64)
+    vertex_graph = np.searchsorted(base, unique[order], side="right") - 1
+    vertices = np.bincount(vertex_graph, minlength=len(graphs))
+    offsets = np.concatenate(([0], np.cumsum(vertices)[:-1]))
+
+    ends = (number[inverse] - np.repeat(offsets[edge_graph], 2)).reshape(-1, 2)
+    loop = ends[:, 0] == ends[:, 1]
+    ends, edge_graph = ends[~loop], edge_graph[~loop]
+    # Both directions of every edge, the edge order deciding the neighbor order of every vertex
+    sources = ends.ravel()
+    targets = ends[:, ::-1].ravel()
+    return (np.repeat(edge_graph, 2), sources, targets), vertices, unique[order] - base[vertex_graph]
+
+def _improve(graph, dominating_set, started, time_budget, progress, stats):
+    """
+    Runs the local search of find_dominating_set until its time budget is spent.
+
+    Args:
+        graph (nx.Graph): The graph, possibly without the isolated vertices of the dominating set.
+        dominating_set (set): A dominating set of graph.
+        started (float): The time.monotonic() value at which find_dominating_set was called.
+        time_budget (float): Seconds from started until the search stops, or None to skip it.
+        progress (callable): Receives the size of every smaller set found, or None.
+        stats (instrumentation.Stats): Receives the local_search phase and its counters.
+
+    Returns:
+        set: A dominating set of graph no larger than dominating_set.
+    """
+    if time_budget is None:
+        return dominating_set
+    with stats.phase("local_search"):
+        return localsearch.improve_dominating_set(graph, dominating_set, started + time_budget, progress, stats)
+
+def _find_dominating_set_in_components(graph, workers=None, dominated=None, stats=instrumentation.DISABLED):
+    """
+    Solves every connected component of a graph without isolated nodes with the strategy of its size (see dispatch.strategy).
+
+    Args:
+        graph (nx.Graph): A NetworkX Graph object without isolated nodes.
+        workers (int, optional): Number of processes solving the connected components in parallel (sequential by default).
+        dominated (set, optional): Vertices that need no dominator. Defaults to None.
+        stats (instrumentation.Stats, optional): Receives the phases and counters (see find_dominating_set).
+
+    Returns:
+        set: A set of vertex indices representing the 2-approximate dominating set.
+    """
+    if workers is not None and workers > 1 and graph.number_of_nodes() > 0:
+        return _find_dominating_set_in_parallel(graph, workers, dominated, stats)
+
+    with stats.phase("components"):
+        nodes, components = _components_in_graph_order(graph)
+    stats.count("components", len(components))
+    if len(components) <= 1:
+        return dispatch.solve_component(graph, dominated, stats) if components else set()
+
+    # Tiny and small components are solved optimally (see dispatch.strategy), the others through
+    # the chordal transformation of the component: the (i, 0) nodes form a clique and (i, 0) is
+    # adjacent to (j, 1) for every j in N[i]. The transformation is handled implicitly from the
+    # CSR adjacency, so the O(n_i^2) clique edges are never materialized
+    with stats.phase("chordal_build"):
+        indptr, indices, marked = _graph_to_csr(graph, nodes, dominated)
+    stats.count("edges_materialized", len(indices))
+
+    dominating_set = set()
+    for component in components:
+        dominating_set.update(nodes[i] for i in dispatch.solve_component_csr(indptr, indices, component, marked, stats))
+
+    return dominating_set
+
+def _components_in_graph_order(graph):
+    """
+    Finds the connected components of a graph, each one with its vertices in graph order.
+
+    NetworkX iterates the subgraph of a component with fewer than half of the vertices of the graph
+    in the order of the component set, so the order is rebuilt here: it decides the ties between
+    candidates, and find_dominating_sets takes the vertices of every component in graph order too.
+
+    Args:
+        graph (nx.Graph): A NetworkX Graph object.
+
+    Returns:
+        tuple: The list of the vertices of graph, and the vertex indices into it of every component as
+            integer arrays, the components in order of their first vertex.
+    """
+    nodes = list(graph.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    labels = np.empty(len(nodes), dtype=np.int64)
+    for label, component in enumerate(nx.connected_components(graph)):
+        labels[[index[v] for v in component]] = label
+    order = np.argsort(labels, kind="stable")
+    return nodes, np.split(order, np.flatnonzero(np.diff(labels[order])) + 1) if nodes else []
+
+def _graph_to_csr(graph, nodes, dominated=None):
+    """
+    Converts a graph to the CSR arrays solved by dispatch.solve_component_csr.
+
+    Args:
+        graph (nx.Graph): A NetworkX Graph object.
+        nodes (list): The vertices of graph in graph order.
+        dominated (set, optional): Vertices that need no dominator. Defaults to None.
+
+    Returns:
+        tuple: The CSR row pointers and column indices, and a boolean array marking the dominated
+            vertices (None if there are none).
+    """
+    indptr, indices = chordal.graph_to_csr(graph, nodes)
+    marked = np.fromiter((v in dominated for v in nodes), dtype=bool, count=len(nodes)) if dominated else None
+    return indptr, indices, marked
+
+def _reduce(graph, reduce):
+    """
+    Resolves the reduce argument of the solvers.
+
+    Args:
+        graph (nx.Graph): The input graph.
+        reduce (bool or tuple): False, True or the result of reduction.reduce_graph(graph).
+
+    Returns:
+        tuple: The result of reduction.reduce_graph(graph), or None if the graph is not reduced.
+    """
+    if reduce is True:
+        return reduction.reduce_graph(graph)
+    return reduce or None
+
+
+def _find_dominating_set_in_parallel(graph, workers, dominated=None, stats=instrumentation.DISABLED):
+    """
+    Solves the connected components of a graph without isolated nodes in a process pool.
+
+    The adjacency is stored once in shared memory as CSR arrays and every task only carries the
+    vertex indices of its components, so no graph is pickled. Small components are grouped into
+    the same task, and results are merged in component order, giving the same set as the
+    sequential loop.
+
+    Args:
+        graph (nx.Graph): A NetworkX Graph object without isolated nodes.
+        workers (int): Number of processes.
+        dominated (set, optional): Vertices that need no dominator. Defaults to None.
+        stats (instrumentation.Stats, optional): Receives the phases and counters (see find_dominating_set),
+            the ones of the workers summed over all of them.
+
+    Returns:
+        set: A set of vertex indices representing the 2-approximate dominating set.
+    """
+    # Each component keeps the vertex order of the graph, which decides ties in the greedy choice
+    with stats.phase("components"):
+        nodes, components = _components_in_graph_order(graph)
+    stats.count("components", len(components))
+    if len(components) == 1:
+        return dispatch.solve_component(graph, dominated, stats)
+
+    with stats.phase("chordal_build"):
+        indptr, indices, marked = _graph_to_csr(graph, nodes, dominated)
+        if marked is None:
+            marked = np.zeros(len(nodes), dtype=bool)
+    stats.count("edges_materialized", len(indices))
+
+    # Group consecutive components until each task holds enough vertices and edges
+    total_size = len(nodes) + len(indices)
+    target_size = max(MIN_TASK_SIZE, total_size // (4 * workers))
+    tasks = []
+    task, task_size = [], 0
+    for component in components:
+        task.append(component)
+        task_size += len(component) + int((indptr[component + 1] - indptr[component]).sum())
+        if task_size >= target_size:
+            tasks.append(task)
+            task, task_size = [], 0
+    if task:
+        tasks.append(task)
+
+    dominating_set = set()
+    blocks = []
+    try:
+        layout = []
+        for array in (indptr, indices, marked):
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            layout.append((block.name, array.shape, array.dtype.str))
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_attach_shared_adjacency, initargs=(layout,)) as executor:
+            for result, worker_stats in executor.map(_solve_components, tasks, itertools.repeat(stats.enabled)):
+                dominating_set.update(nodes[i] for i in result)
+                if worker_stats is not None:
+                    stats.merge(worker_stats)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return dominating_set
+
+
+# CSR adjacency shared by the parent process, attached once per worker
+_shared_adjacency = None
+
+def _attach_shared_adjacency(layout):
+    """
+    Attaches a worker process to the CSR adjacency stored in shared memory.
+
+    Args:
+        layout: A list of (name, shape, dtype) tuples for the indptr, indices and dominated arrays.
+    """
+    global _shared_adjacency
+    blocks, arrays = [], []
+    for name, shape, dtype in layout:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+    _shared_adjacency = (blocks, arrays)
+
+def _solve_components(components, measure=False):
+    """
+    Solves a group of connected components against the shared CSR adjacency.
+
+    Args:
+        components: A list of integer arrays, the vertex indices of each component in graph order.
+        measure: Whether to collect the phases and counters of the task.
+
+    Returns:
+        tuple: The vertex indices of the 2-approximate dominating set of those components, and the
+            dictionary of the instrumentation.Stats of the task (None unless measured).
+    """
+    _, (indptr, indices, dominated) = _shared_adjacency
+    dominated = dominated if dominated.any() else None
+    stats = instrumentation.Stats() if measure else None
+    result = []
+    for component in components:
+        result.extend(sorted(dispatch.solve_component_csr(indptr, indices, component, dominated, stats)))
+    return result, stats.as_dict() if measure else None
+
+
+def find_dominating_set_brute_force(graph, node_limit=None, time_limit=None, reduce=False):
     """
     Computes an exact minimum dominating set in exponential time.
 
+    The search is a branch and bound over bitset closed neighborhoods (see exact.find_dominating_set_exact)
+    started from the dominating set of find_dominating_set as the initial upper bound.
+
     Args:
         graph: A NetworkX Graph.
+        node_limit: Maximum number of search nodes (unlimited by default).
+        time_limit: Maximum time in seconds (unlimited by default).
+        reduce: Search the kernel of the reduction rules (see find_dominating_set). Defaults to False.
 
     Returns:
         A set of vertex indices representing the exact dominating set, or None if the graph is empty.
+        When a limit is reached, the best dominating set found is returned instead.
+    """
+
+    dominating_set, _ = find_dominating_set_exact(graph, node_limit=node_limit, time_limit=time_limit, reduce=reduce)
+    return dominating_set
+
+def find_dominating_set_exact(graph, node_limit=None, time_limit=None, reduce=False):
+    """
+    Computes a minimum dominating set by branch and bound, reporting whether it is proven optimal.
+
+    Args:
+        graph: A NetworkX Graph.
+        node_limit: Maximum number of search nodes (unlimited by default).
+        time_limit: Maximum time in seconds, including the initial upper bound (unlimited by default).
+        reduce: Search the kernel of the reduction rules (see find_dominating_set), which preserves
+            the size of a minimum dominating set. Defaults to False.
+
+    Returns:
+        A tuple (dominating_set, optimal) with the best dominating set found and whether the search
+        finished within the limits, or (None, True) if the graph is empty or has no edges.
     """
 
     if graph.number_of_nodes() == 0 or graph.number_of_edges() == 0:
-        return None
+        return None, True
 
-    n_vertices = len(graph.nodes())
+    started = time.monotonic()
+    reduced = _reduce(graph, reduce)
+    if reduced is not None:
+        kernel, forced, dominated, _ = reduced
+        upper_bound = _find_dominating_set_in_components(kernel, dominated=dominated)
+        dominating_set, optimal = exact.find_dominating_set_exact(kernel, upper_bound, node_limit, _remaining(time_limit, started), dominated)
+        return forced | (dominating_set or set()), optimal
 
-    for k in range(1, n_vertices + 1): # Iterate through all possible sizes of the cover
-        for candidate in itertools.combinations(graph.nodes(), k):
-            cover_candidate = set(candidate)
-            if nx.dominating.is_dominating_set(graph, cover_candidate):
-                return cover_candidate
-                
-    return None
+    # find_dominating_set removes the isolated vertices from its input
+    upper_bound = find_dominating_set(graph.copy())
+    return exact.find_dominating_set_exact(graph, upper_bound, node_limit, _remaining(time_limit, started))
 
+def _remaining(time_limit, started):
+    """
+    Gets what is left of a time limit.
 
+    Args:
+        time_limit: A time limit in seconds, or None.
+        started: The time.monotonic() value at which the time limit started.
 
-def find_dominating_set_approximation(graph):
+    Returns:
+        The remaining seconds (at least 0), or None without a time limit.
+    """
+    return None if time_limit is None else max(0.0, time_limit - (time.monotonic() - started))
+
+
+def find_dominating_set_approximation(graph, reduce=False):
     """
     Find an approximate dominating set in polynomial time with a logarithmic approximation ratio for undirected graphs.
 
     Args:
         graph: A NetworkX Graph.
+        reduce: Solve the kernel of the reduction rules (see find_dominating_set). Defaults to False.
 
     Returns:
         A set of vertex indices representing the approximate dominating set, or None if the graph is empty.
@@ -103,6 +546,11 @@ def find_dominating_set_approximation(graph):
     if graph.number_of_nodes() == 0 or graph.number_of_edges() == 0:
         return None
 
-    #networkx doesn't have a guaranteed minimum dominating set function, so we use approximation
-    dominating_set = nx.approximation.dominating_set.min_weighted_dominating_set(graph)
+    reduced = _reduce(graph, reduce)
+    if reduced is not None:
+        kernel, forced, dominated, _ = reduced
+        return forced | greedy.greedy_dominating_set(kernel, dominated)
+
+    # The greedy algorithm with a lazy priority queue over CSR arrays, in O((n + m) log n) time
+    dominating_set = greedy.greedy_dominating_set(graph)
     return dominating_set
\ No newline at end of file
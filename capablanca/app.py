@@ -3,15 +3,19 @@
 #                      March 25th, 2025
 
 import argparse
+import contextlib
+import json
 import time
 import math
 
-from . import algorithm
-from . import parser
-from . import applogger
-from . import utils
+# Solvers compared with ours: the name in compare.SOLVERS (also the key of its record fields), the name
+# in algorithm.SOLVER_VERSIONS, the label of its output and the description of its log messages
+COMPARISONS = (
+    ("approximation", "find_dominating_set_approximation", "Approximation", "An Approximate Solution with a logarithmic approximation ratio"),
+    ("brute_force", "find_dominating_set_brute_force", "Brute Force", "A solution with an exponential-time complexity"),
+)
 
-def approximate_solution(inputFile, verbose=False, log=False, count=False, bruteForce=False, approximation=False):
+def approximate_solution(inputFile, verbose=False, log=False, count=False, bruteForce=False, approximation=False, jobs=None, use_cache=False, reduce=False, metrics=None, budget=None, concurrent=True, time_budget=None, verify=False, outputFile=None, memory_limit=None):
     """Find an approximate Dominating Set.
 
     Args:
@@ -21,57 +25,371 @@ def approximate_solution(inputFile, verbose=False, log=False, count=False, brute
         count: Measure the size of the Dominating Set.
         bruteForce: Enable brute force approach.
         approximation: Enable an approximate approach within a logarithmic factor.
+        jobs: Number of processes parsing the input and solving the connected components in parallel.
+        use_cache: Load the parsed graph and the solver results from the on-disk caches (and store them there).
+        reduce: Apply the reduction rules once and run every solver on the resulting kernel.
+        metrics: Output format of the per-phase timings and work counters of our solver ("json"), or None
+            to skip the instrumentation. Measuring always runs the solver, even if its result is cached.
+        budget: Wall-clock limit in seconds for the compared solvers: the brute force returns its best set
+            at the limit, reported as best found (never cached nor used for the exact ratio unless the search
+            completed), and the solvers still running are stopped. Unlimited by default.
+        concurrent: Run the compared solvers at the same time as ours, each one in its own process on a
+            shared read-only copy of the graph. They run one after another in this process otherwise,
+            and always do inside a daemon process (such as a batch_approx worker).
+        time_budget: Seconds given to our solver: its 2-approximation is shrunk by local search until then
+            and every smaller size is logged with its time. The result is not cached, as it depends on time.
+        verify: Check that every computed set dominates the input graph, straight from its edge arrays.
+        outputFile: Path of a file receiving our Dominating Set as sorted 1-based ids (see parser.save_dominating_set),
+            in which case only its size is printed, as for the compared solvers.
+        memory_limit: Bytes of memory for an out-of-core run (see external.OutOfCoreGraph), which keeps the
+            graph in temporary files and solves its connected components a batch at a time, or None to
+            build the whole graph in memory. The compared solvers, the reduction rules, the time budget
+            and the metrics need the whole graph and cannot be combined with it.
+
+    Returns:
+        A dictionary with the file name, the number of vertices n and edges m, the size of each
+        computed Dominating Set, the time in milliseconds of every phase, the solver phases
+        answered by the result cache, the compared solvers stopped by the budget (with the size of
+        their best set when they returned one) or failed, the
+        sizes found by the local search with their time, whether each set passed the verification
+        and the metrics of our solver when requested.
+
+    Raises:
+        ValueError: If memory_limit is combined with an option needing the whole graph in memory.
     """
-    
+    if memory_limit is not None:
+        if approximation or bruteForce or reduce or time_budget is not None or metrics:
+            raise ValueError("The memory limit cannot be combined with -a, -b, -r, --time-budget or --metrics.")
+        return _approximate_out_of_core(inputFile, memory_limit, verbose, log, count, jobs, verify, outputFile)
+
+    # The solvers and the scientific stack they need are imported here and not with the module,
+    # so that approx -h and --version start without them
+    import multiprocessing
+    from . import algorithm
+    from . import applogger
+    from . import cache
+    from . import compare
+    from . import instrumentation
+    from . import parser
+    from . import reduction
+    from . import utils
+    from . import validate
+
     logger = applogger.Logger(applogger.FileLogger() if (log) else applogger.ConsoleLogger(verbose))
     # Read and parse a dimacs file
-    logger.info(f"Parsing the Input File started")
+    logger.info("Parsing the Input File started")
     started = time.time()
     
-    graph = parser.read(inputFile)
+    rows, cols = parser.read_arrays(inputFile, cache=cache.GraphCache() if use_cache else None, workers=jobs)
+    graph = parser.edges_to_graph(rows, cols)
     filename = utils.get_file_name(inputFile)
     logger.info(f"Parsing the Input File done in: {(time.time() - started) * 1000.0} milliseconds")
-    
-    if approximation:
-        logger.info("An Approximate Solution with a logarithmic approximation ratio started")
+    record = {"file": filename, "n": graph.number_of_nodes(), "m": graph.number_of_edges(), "timings": {"parse": (time.time() - started) * 1000.0}, "cache_hits": []}
+
+    # The results are addressed by the content of the graph, hashed before any solver modifies it
+    results = cache.ResultCache() if use_cache else None
+    graph_key = results.graph_key(graph) if results is not None else None
+
+    reduced = False
+    if reduce:
+        logger.info("Reduction Rules started")
         started = time.time()
-        
-        approximate_result = algorithm.find_dominating_set_approximation(graph)
 
-        logger.info(f"An Approximate Solution with a logarithmic approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds")
-        
-        answer = utils.string_result_format(approximate_result, count)
-        output = f"{filename}: (Approximation) {answer}"
+        reduced = reduction.reduce_graph(graph)
+
+        kernel, forced, _, statistics = reduced
+        logger.info(f"Reduction Rules done in: {(time.time() - started) * 1000.0} milliseconds")
+        logger.info(f"Kernel with {kernel.number_of_nodes()} vertices and {kernel.number_of_edges()} edges, {len(forced)} forced vertices")
+        for rule, statistic in statistics.items():
+            logger.info(f"Reduction Rule {rule}: applied {statistic['count']} times in {statistic['time']} milliseconds")
+        record["timings"]["reduction"] = (time.time() - started) * 1000.0
+        record["kernel"] = {"n": kernel.number_of_nodes(), "m": kernel.number_of_edges(), "forced": len(forced)}
+        record["reductions"] = statistics
+
+    enabled = {"approximation": approximation, "brute_force": bruteForce}
+    compared = {}
+    solved = {}
+
+    def check(name, label, result):
+        # Validation of a computed set against the parsed edges, which no solver modifies
+        if not verify:
+            return
+        started = time.time()
+        undominated = validate.find_undominated_edges(rows, cols, result or ())
+        logger.info(f"Verification of {label} done in: {(time.time() - started) * 1000.0} milliseconds")
+        record["timings"][f"verify_{name}"] = (time.time() - started) * 1000.0
+        record.setdefault("verified", {})[name] = len(undominated) == 0
+        if len(undominated):
+            output = f"{filename}: ({label}) Verification failed, {len(undominated)} vertices are not dominated, such as {undominated[0] + 1}"
+            utils.println(output, logger, log)
+
+    def report(name, status, result, elapsed, cached=False):
+        # Output of a compared solver, followed by the ratio as soon as both results it needs are known
+        _, solver, label, description = next(comparison for comparison in COMPARISONS if comparison[0] == name)
+        if status == "ok":
+            logger.info(f"{description} done in: {elapsed} milliseconds{_cache_note(cached)}")
+            record["timings"][name] = elapsed
+            if cached:
+                record["cache_hits"].append(name)
+            elif results is not None and graph_key is not None:
+                _store(results, graph_key, solver, reduce, result)
+            record[f"{name}_size"] = len(result) if result else 0
+            compared[name] = result
+            answer = utils.string_result_format(result, count or outputFile is not None)
+            output = f"{filename}: ({label}) {answer}"
+        elif status == "best_found":
+            # Not proven optimal: neither cached nor used for the ratio
+            logger.info(f"{description} stopped by the budget of {budget} seconds after {elapsed} milliseconds with its best set")
+            record["timings"][name] = elapsed
+            record.setdefault("best_found", {})[name] = len(result) if result else 0
+            answer = utils.string_result_format(result, count or outputFile is not None)
+            output = f"{filename}: ({label}) Best Found within {budget} seconds, {answer}"
+        elif status == "timeout":
+            logger.info(f"{description} stopped after the budget of {budget} seconds")
+            record.setdefault("timeouts", []).append(name)
+            output = f"{filename}: ({label}) Timeout after {budget} seconds"
+        else:
+            logger.info(f"{description} failed: {result}")
+            record.setdefault("errors", {})[name] = result
+            output = f"{filename}: ({label}) Error {result}"
         utils.println(output, logger, log)
+        if status in ("ok", "best_found"):
+            check(name, label, result)
+        report_ratio()
 
-    if bruteForce:
-        logger.info("A solution with an exponential-time complexity started")
+    def report_ratio():
+        needed = "brute_force" if bruteForce else "approximation"
+        if "capablanca" not in solved or needed not in compared or solved.get("ratio"):
+            return
+        solved["ratio"] = True
+        novel_result = solved["capablanca"]
+        if novel_result:
+            if bruteForce:
+                output = f"Exact Ratio (Capablanca/Optimal): {len(novel_result)/len(compared['brute_force'])}"
+            else:
+                output = f"Upper Bound for Ratio (Capablanca/Optimal): {(math.log(graph.number_of_nodes())) * len(novel_result)/len(compared['approximation'])}"
+            utils.println(output, logger, log)
+
+    # The compared solvers answered by the result cache are reported first
+    pending = []
+    for name, solver, _, description in COMPARISONS:
+        if enabled[name]:
+            logger.info(f"{description} started")
+            found, result = _lookup(results, graph_key, solver, reduce)
+            if found:
+                report(name, "ok", result, 0.0, cached=True)
+            else:
+                pending.append(name)
+
+    comparison = None
+    shared = None
+    if pending and concurrent and not multiprocessing.current_process().daemon:
+        shared = compare.SharedGraph(rows, cols)
+        comparison = compare.Comparison(shared, pending, reduce=reduced, budget=budget)
+        comparison.start()
+    else:
+        for name in pending:
+            started = time.time()
+            status, result = compare.run_solver(name, graph, reduce=reduced, time_limit=budget)
+            report(name, status, result, (time.time() - started) * 1000.0)
+
+    try:
+        logger.info("Our Approximate Solution with a 2-approximation ratio started")
         started = time.time()
         
-        brute_force_result = algorithm.find_dominating_set_brute_force(graph)
+        stats = instrumentation.Stats() if metrics else None
+        shrinking = []
 
-        logger.info(f"A solution with an exponential-time complexity done in: {(time.time() - started) * 1000.0} milliseconds")
-        
-        answer = utils.string_result_format(brute_force_result, count)
-        output = f"{filename}: (Brute Force) {answer}"
+        def progress(size):
+            elapsed = (time.time() - started) * 1000.0
+            if shrinking:
+                logger.info(f"Local Search: Dominating Set Size {size} after {elapsed} milliseconds, {shrinking[0][1] - size} vertices fewer")
+            else:
+                logger.info(f"Local Search: started from Dominating Set Size {size} after {elapsed} milliseconds")
+            shrinking.append([elapsed, size])
+
+        novel_result, cached = _solve(None if stats or time_budget is not None else results, graph_key, "find_dominating_set", reduce,
+                                      lambda: algorithm.find_dominating_set(graph, workers=jobs, reduce=reduced, stats=stats,
+                                                                            time_budget=time_budget, progress=progress))
+
+        logger.info(f"Our Approximate Solution with a 2-approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds{_cache_note(cached)}")
+        record["timings"]["solve"] = (time.time() - started) * 1000.0
+        if cached:
+            record["cache_hits"].append("solve")
+        record["size"] = len(novel_result)
+        if shrinking:
+            record["local_search"] = shrinking
+        if stats:
+            record["metrics"] = stats.as_dict()
+
+        if outputFile is not None:
+            logger.info("Writing the Output File started")
+            started = time.time()
+            parser.save_dominating_set(novel_result, outputFile)
+            logger.info(f"Writing the Output File done in: {(time.time() - started) * 1000.0} milliseconds")
+            record["timings"]["output"] = (time.time() - started) * 1000.0
+            record["output"] = outputFile
+            answer = f"Dominating Set Size {len(novel_result)} written to {outputFile}" if novel_result else "Empty Graph"
+        else:
+            answer = utils.string_result_format(novel_result, count)
+        output = f"{filename}: {answer}"
         utils.println(output, logger, log)
-        
-    logger.info("Our Approximate Solution with a 2-approximation ratio started")
-    started = time.time()
-    
-    novel_result = algorithm.find_dominating_set(graph)
-
-    logger.info(f"Our Approximate Solution with a 2-approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds")
-
-    answer = utils.string_result_format(novel_result, count)
-    output = f"{filename}: {answer}"
-    utils.println(output, logger, log)
-    if novel_result and (bruteForce or approximation):
-        if bruteForce:    
-            output = f"Exact Ratio (Capablanca/Optimal): {len(novel_result)/len(brute_force_result)}"
-        elif approximation:
-            output = f"Upper Bound for Ratio (Capablanca/Optimal): {(math.log(graph.number_of_nodes())) * len(novel_result)/len(approximate_result)}"
+        check("capablanca", "Capablanca", novel_result)
+        solved["capablanca"] = novel_result
+        report_ratio()
+
+        if comparison is not None:
+            for name, status, result, elapsed in comparison.results():
+                report(name, status, result, elapsed)
+    finally:
+        if comparison is not None:
+            comparison.stop()
+            shared.close()
+
+    if metrics == "json":
+        output = json.dumps({"file": filename, "metrics": record["metrics"]})
+        utils.println(output, logger, log)
+
+    return record
+
+def _approximate_out_of_core(inputFile, memory_limit, verbose, log, count, jobs, verify, outputFile):
+    """
+    Find an approximate Dominating Set without building the graph in memory.
+
+    Args:
+        inputFile: Input file path.
+        memory_limit: Bytes of memory for the arrays of the out-of-core graph.
+        verbose: Enable verbose output.
+        log: Enable file logging.
+        count: Measure the size of the Dominating Set.
+        jobs: Number of processes solving the connected components of a batch in parallel.
+        verify: Check that the computed set dominates the input graph, streaming its adjacency.
+        outputFile: Path of a file receiving the Dominating Set as sorted 1-based ids, or None.
+
+    Returns:
+        The record of approximate_solution, with the statistics of the out-of-core graph under "external".
+    """
+    from . import applogger
+    from . import external
+    from . import parser
+    from . import utils
+
+    logger = applogger.Logger(applogger.FileLogger() if (log) else applogger.ConsoleLogger(verbose))
+    filename = utils.get_file_name(inputFile)
+    with external.OutOfCoreGraph(memory_limit) as graph:
+        logger.info("Parsing the Input File out of core started")
+        started = time.time()
+        graph.read(inputFile)
+        logger.info(f"Parsing the Input File out of core done in: {(time.time() - started) * 1000.0} milliseconds")
+        logger.info(f"Graph with {graph.vertices} vertices and {graph.edges} edges sorted in {graph.statistics['runs']} runs")
+        record = {"file": filename, "n": graph.vertices, "m": graph.edges, "timings": {"parse": (time.time() - started) * 1000.0}, "cache_hits": []}
+
+        logger.info("Our Approximate Solution with a 2-approximation ratio started")
+        started = time.time()
+        novel_result = graph.solve(workers=jobs)
+        logger.info(f"Our Approximate Solution with a 2-approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds")
+        logger.info(f"Solved {graph.statistics['components']} components in {graph.statistics['batches']} batches, {graph.statistics['oversized']} of them larger than a batch")
+        record["timings"]["solve"] = (time.time() - started) * 1000.0
+        record["size"] = len(novel_result)
+        record["external"] = dict(graph.statistics)
+
+        if outputFile is not None:
+            logger.info("Writing the Output File started")
+            started = time.time()
+            parser.save_dominating_set(novel_result, outputFile)
+            logger.info(f"Writing the Output File done in: {(time.time() - started) * 1000.0} milliseconds")
+            record["timings"]["output"] = (time.time() - started) * 1000.0
+            record["output"] = outputFile
+            answer = f"Dominating Set Size {len(novel_result)} written to {outputFile}" if len(novel_result) else "Empty Graph"
+        elif count:
+            answer = f"Dominating Set Size {len(novel_result)}" if len(novel_result) else "Empty Graph"
+        else:
+            answer = utils.string_result_format(novel_result.tolist())
+        output = f"{filename}: {answer}"
         utils.println(output, logger, log)
+
+        if verify:
+            started = time.time()
+            undominated = graph.find_undominated(novel_result)
+            logger.info(f"Verification of Capablanca done in: {(time.time() - started) * 1000.0} milliseconds")
+            record["timings"]["verify_capablanca"] = (time.time() - started) * 1000.0
+            record["verified"] = {"capablanca": len(undominated) == 0}
+            if len(undominated):
+                output = f"{filename}: (Capablanca) Verification failed, {len(undominated)} vertices are not dominated, such as {undominated[0] + 1}"
+                utils.println(output, logger, log)
+
+    return record
+
+def _solve(results, graph_key, solver, reduce, compute):
+    """
+    Runs a solver unless its result for the same graph is in the result cache, storing it otherwise.
+
+    Args:
+        results: A cache.ResultCache, or None to always run the solver.
+        graph_key: The hash of the graph (see cache.ResultCache.graph_key), or None if it cannot be cached.
+        solver: The name of the solver function in algorithm.SOLVER_VERSIONS.
+        reduce: Whether the solver runs on the kernel of the reduction rules.
+        compute: A function running the solver.
+
+    Returns:
+        A tuple (result, cached) with the Dominating Set and whether it came from the cache.
+    """
+    found, result = _lookup(results, graph_key, solver, reduce)
+    if found:
+        return result, True
+
+    result = compute()
+    if results is not None and graph_key is not None:
+        _store(results, graph_key, solver, reduce, result)
+    return result, False
+
+def _lookup(results, graph_key, solver, reduce):
+    """
+    Looks a solver result up in the result cache.
+
+    Args:
+        results: A cache.ResultCache, or None.
+        graph_key: The hash of the graph (see cache.ResultCache.graph_key), or None if it cannot be cached.
+        solver: The name of the solver function in algorithm.SOLVER_VERSIONS.
+        reduce: Whether the solver runs on the kernel of the reduction rules.
+
+    Returns:
+        A tuple (found, result) as returned by cache.ResultCache.load, (False, None) without a cache.
+    """
+    from . import algorithm
+
+    if results is None or graph_key is None:
+        return False, None
+    return results.load(results.key(graph_key, solver, algorithm.SOLVER_VERSIONS[solver], f"reduce={bool(reduce)}"))
+
+def _store(results, graph_key, solver, reduce, result):
+    """
+    Stores a solver result in the result cache.
+
+    Args:
+        results: A cache.ResultCache.
+        graph_key: The hash of the graph (see cache.ResultCache.graph_key).
+        solver: The name of the solver function in algorithm.SOLVER_VERSIONS.
+        reduce: Whether the solver runs on the kernel of the reduction rules.
+        result: The Dominating Set.
+    """
+    from . import algorithm
+
+    # The cache is an optimization, a read-only or full disk must not fail the run
+    with contextlib.suppress(OSError):
+        results.store(results.key(graph_key, solver, algorithm.SOLVER_VERSIONS[solver], f"reduce={bool(reduce)}"), result)
+
+def _cache_note(cached):
+    """
+    Formats the mark of a cache hit in the timing logs.
+
+    Args:
+        cached: Whether the result came from the result cache.
+
+    Returns:
+        A suffix for the log message.
+    """
+    return " (result cache hit)" if cached else ""
           
 def main():
     
@@ -83,16 +401,43 @@ def main():
     helper.add_argument('-c', '--count', action='store_true', help='calculate the size of the Dominating Set')
     helper.add_argument('-v', '--verbose', action='store_true', help='anable verbose output')
     helper.add_argument('-l', '--log', action='store_true', help='enable file logging')
+    helper.add_argument('-j', '--jobs', type=int, default=None, help='number of processes parsing the input and solving the connected components in parallel')
+    helper.add_argument('-r', '--reduce', action='store_true', help='apply the dominating set reduction rules before every solver')
+    helper.add_argument('--no-cache', action='store_true', help='disable the on-disk caches of parsed graphs and solver results')
+    helper.add_argument('--budget', type=float, default=None, help='wall-clock limit in seconds for the solvers compared with -a and -b')
+    helper.add_argument('--sequential', action='store_true', help='run the solvers compared with -a and -b one after another instead of at the same time')
+    helper.add_argument('--time-budget', type=float, default=None, help='seconds given to our solver, which shrinks its solution by local search until then')
+    helper.add_argument('-o', '--output', type=str, default=None, help='write the Dominating Set to this file as sorted 1-based ids, one per line (.xz and .bz2 are compressed, .npy is a binary NumPy array) and print only its size')
+    helper.add_argument('--verify', action='store_true', help='check that every computed set is a dominating set of the input graph')
+    helper.add_argument('--metrics', choices=['json'], default=None, help='print the per-phase timings and work counters of our solver in this format')
+    helper.add_argument('--memory-limit', type=str, default=None, help='solve out of core for graphs larger than the memory: keep the graph in temporary files (in TMPDIR) and its arrays within this size, such as 512M or 4G')
     helper.add_argument('--version', action='version', version='%(prog)s 3.3')
     
     # Initialize the parameters
     args = helper.parse_args()
+    memory_limit = None
+    if args.memory_limit is not None:
+        from . import external
+        try:
+            memory_limit = external.parse_size(args.memory_limit)
+        except ValueError as error:
+            helper.error(str(error))
     approximate_solution(args.inputFile, 
                verbose=args.verbose, 
                log=args.log,
                count=args.count,
                bruteForce=args.bruteForce,
-               approximation=args.approximation)
+               approximation=args.approximation,
+               jobs=args.jobs,
+               use_cache=not args.no_cache,
+               reduce=args.reduce,
+               metrics=args.metrics,
+               budget=args.budget,
+               concurrent=not args.sequential,
+               time_budget=args.time_budget,
+               verify=args.verify,
+               outputFile=args.output,
+               memory_limit=memory_limit)
   
 
 if __name__ == "__main__":
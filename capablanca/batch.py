@@ -2,10 +2,26 @@
 # Author: Frank Vega
 
 import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import signal
+import sys
+import time
+from collections import deque
 from . import utils
 from . import app
 
-def approximate_solutions(inputDirectory, verbose=False, log=False, count=False, bruteForce=False, approximation=False):
+# Files up to this size are solved together by algorithm.find_dominating_sets in the sequential mode
+SMALL_FILE_SIZE = 1 << 16
+
+# Most small files solved by one call of algorithm.find_dominating_sets
+SMALL_FILE_BATCH = 1024
+
+def approximate_solutions(inputDirectory, verbose=False, log=False, count=False, bruteForce=False, approximation=False, jobs=None, use_cache=False, timeout=None, jsonl=None, reduce=False, outputDirectory=None, output_format="txt", workers=None):
     """Find an approximate Dominating Set for several instances.
 
     Args:
@@ -15,15 +31,275 @@ def approximate_solutions(inputDirectory, verbose=False, log=False, count=False,
         count: Measure the size of the Dominating Set.
         bruteForce: Enable brute force approach.
         approximation: Enable an approximate approach within a logarithmic factor.
+        jobs: Number of files solved in parallel, each one in its own process (largest files first).
+        use_cache: Load the parsed graph and the solver results from the on-disk caches (and store them there).
+        timeout: Wall-clock limit in seconds for each file, the process solving a file is killed beyond it.
+        jsonl: Path of a file receiving one JSON record per input file ("-" for the standard output).
+        reduce: Apply the reduction rules once per file and run every solver on the resulting kernel.
+        outputDirectory: Directory receiving the Dominating Set of every file, named after it with the
+            extension of output_format (see parser.save_dominating_set), in which case only its size is printed.
+        output_format: "txt", "xz", "bz2" or "npy".
+        workers: Number of processes solving the connected components of each file in parallel (see
+            app.approximate_solution), in addition to the files solved in parallel by jobs.
+
+    Without jobs, timeout, verbose output, logging, comparisons or reduction, consecutive files of at most
+    SMALL_FILE_SIZE bytes are solved together by algorithm.find_dominating_sets, which skips the per-file
+    setup of app.approximate_solution and the caches (slower than solving graphs that small), without workers.
     """
     
     file_names = utils.get_file_names(inputDirectory)
 
     if file_names:
-        for file_name in file_names:
-            inputFile = f"{inputDirectory}/{file_name}"
-            print(f"Test: {inputDirectory}/{file_name}")
-            app.approximate_solution(inputFile, verbose, log, count, bruteForce, approximation)
+        if outputDirectory is not None:
+            os.makedirs(outputDirectory, exist_ok=True)
+        with _open_records(jsonl) as records:
+            if (jobs is None or jobs <= 1) and timeout is None:
+                batched = not (verbose or log or bruteForce or approximation or reduce)
+                small = []
+
+                def solve_small():
+                    for inputFile, output, record, started in _solve_small_files(small, count, outputDirectory, output_format):
+                        print(f"Test: {inputFile}")
+                        print(output)
+                        _write_record(records, record, "ok", started)
+                    small.clear()
+
+                for file_name in file_names:
+                    inputFile = f"{inputDirectory}/{file_name}"
+                    if batched and os.path.getsize(inputFile) <= SMALL_FILE_SIZE:
+                        small.append(inputFile)
+                        if len(small) == SMALL_FILE_BATCH:
+                            solve_small()
+                        continue
+                    solve_small()
+                    print(f"Test: {inputDirectory}/{file_name}")
+                    started = time.time()
+                    record = app.approximate_solution(inputFile, verbose, log, count, bruteForce, approximation, workers, use_cache=use_cache, reduce=reduce,
+                                                      outputFile=_output_file(outputDirectory, inputFile, output_format))
+                    _write_record(records, record, "ok", started)
+                solve_small()
+            else:
+                # The solvers are loaded before the worker processes are forked, so that no worker imports them again
+                for module in ("algorithm", "cache", "compare", "parser", "reduction"):
+                    importlib.import_module(f".{module}", __package__)
+
+                options = (verbose, log, count, bruteForce, approximation, use_cache, reduce, outputDirectory, output_format, workers)
+                # Schedule the largest files first, using the file size as a cost estimate
+                inputFiles = sorted((f"{inputDirectory}/{file_name}" for file_name in file_names), key=os.path.getsize, reverse=True)
+                for inputFile, output, record, status, started in _run_in_processes(inputFiles, options, max(jobs or 1, 1), timeout):
+                    print(f"Test: {inputFile}")
+                    print(output, end="")
+                    if status == "timeout":
+                        print(f"{utils.get_file_name(inputFile)}: Timeout after {timeout} seconds")
+                    elif status == "error":
+                        print(f"{utils.get_file_name(inputFile)}: Error {record['error']}")
+                    _write_record(records, record, status, started)
+
+def _solve_small_files(inputFiles, count, outputDirectory, output_format):
+    """
+    Solves small files together with algorithm.find_dominating_sets, printing what app.approximate_solution would.
+
+    Args:
+        inputFiles: The input file paths, in order.
+        count: Measure the size of the Dominating Set.
+        outputDirectory: Directory receiving the Dominating Set of every file, or None.
+        output_format: "txt", "xz", "bz2" or "npy".
+
+    Yields:
+        A tuple (inputFile, output, record, started) for every file, where output is its result line and
+        record is the one of app.approximate_solution, with the number of files solved together as "batch"
+        and their common solve time.
+
+    Raises:
+        ValueError: If a file is not in the correct format, once the files before it are yielded.
+    """
+    import numpy as np
+    from . import algorithm
+    from . import parser
+
+    started = time.time()
+    graphs, parse_times = [], []
+    error = None
+    for inputFile in inputFiles:
+        parse_started = time.time()
+        try:
+            graphs.append(parser.read_arrays(inputFile))
+        except (ValueError, FileNotFoundError) as exception:
+            error = exception
+            break
+        parse_times.append((time.time() - parse_started) * 1000.0)
+
+    solve_started = time.time()
+    results = algorithm.find_dominating_sets(graphs)
+    solve_time = (time.time() - solve_started) * 1000.0
+
+    # The files after a bad one are not parsed
+    for inputFile, (rows, cols), parse_time, result in zip(inputFiles[:len(graphs)], graphs, parse_times, results, strict=True):
+        filename = utils.get_file_name(inputFile)
+        record = {"file": filename, "n": len(np.unique(np.concatenate((rows, cols)))), "m": len(rows), "timings": {"parse": parse_time, "solve": solve_time},
+                  "cache_hits": [], "size": len(result), "batch": len(graphs)}
+        outputFile = _output_file(outputDirectory, inputFile, output_format)
+        if outputFile is not None:
+            output_started = time.time()
+            parser.save_dominating_set(result, outputFile)
+            record["timings"]["output"] = (time.time() - output_started) * 1000.0
+            record["output"] = outputFile
+            answer = f"Dominating Set Size {len(result)} written to {outputFile}" if result else "Empty Graph"
+        else:
+            answer = utils.string_result_format(result, count)
+        yield inputFile, f"{filename}: {answer}", record, started
+
+    if error is not None:
+        raise error
+
+def _run_in_processes(inputFiles, options, jobs, timeout):
+    """
+    Solves files in worker processes, at most jobs at a time, killing the ones that exceed the timeout.
+
+    Args:
+        inputFiles: The input file paths in scheduling order.
+        options: The (verbose, log, count, bruteForce, approximation, use_cache, reduce, outputDirectory, output_format, workers) options of approximate_solutions.
+        jobs: Number of worker processes.
+        timeout: Wall-clock limit in seconds for each file, or None.
+
+    Yields:
+        A tuple (inputFile, output, record, status, started) for every file as soon as it is finished,
+        where status is "ok", "error" or "timeout".
+    """
+    # Imported here, the sequential runs and batch_approx -h do not need them
+    import multiprocessing
+    import multiprocessing.connection
+
+    # A daemon process cannot start the process pool solving the components of its file
+    workers = options[-1]
+    daemon = workers is None or workers <= 1
+    pending = deque(inputFiles)
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                inputFile = pending.popleft()
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=_solve_file, args=(inputFile, options, sender), daemon=daemon)
+                process.start()
+                sender.close()
+                running[receiver] = (process, inputFile, time.time())
+
+            wait = None
+            if timeout is not None:
+                wait = max(0.0, min(started + timeout for _, _, started in running.values()) - time.time())
+            for receiver in multiprocessing.connection.wait(list(running), timeout=wait):
+                process, inputFile, started = running.pop(receiver)
+                try:
+                    output, record, status = receiver.recv()
+                except EOFError:
+                    output, record, status = "", {"error": f"worker exited with code {process.exitcode}"}, "error"
+                receiver.close()
+                process.join()
+                yield inputFile, output, {"file": utils.get_file_name(inputFile), **record}, status, started
+
+            if timeout is not None:
+                for receiver, (process, inputFile, started) in list(running.items()):
+                    if time.time() - started >= timeout:
+                        _kill(process)
+                        receiver.close()
+                        del running[receiver]
+                        yield inputFile, "", {"file": utils.get_file_name(inputFile)}, "timeout", started
+    finally:
+        # Interrupted (by Ctrl+C or an error), the workers of other process groups would outlive batch_approx
+        for receiver, (process, _, _) in running.items():
+            _kill(process)
+            receiver.close()
+
+def _kill(process):
+    """
+    Kills a worker process together with the processes it started (see _solve_file).
+
+    Args:
+        process: A multiprocessing.Process running _solve_file.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups (Windows), or the worker has not made its own group yet and started nothing
+        process.kill()
+    process.join()
+
+def _solve_file(inputFile, options, connection):
+    """
+    Solves one file in a worker process and sends back its captured output and record.
+
+    Args:
+        inputFile: Input file path.
+        options: The (verbose, log, count, bruteForce, approximation, use_cache, reduce, outputDirectory, output_format, workers) options of approximate_solutions.
+        connection: The sending end of a pipe to the parent process.
+    """
+    # The worker leads a process group of its own, so that a timeout also kills the processes it starts
+    # (the component pool and the solvers compared by approximate_solution)
+    if hasattr(os, "setpgid"):
+        os.setpgid(0, 0)
+    verbose, log, count, bruteForce, approximation, use_cache, reduce, outputDirectory, output_format, workers = options
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            record = app.approximate_solution(inputFile, verbose, log, count, bruteForce, approximation, workers, use_cache=use_cache, reduce=reduce,
+                                              outputFile=_output_file(outputDirectory, inputFile, output_format))
+        status = "ok"
+    except Exception as error:
+        record, status = {"error": str(error)}, "error"
+    connection.send((output.getvalue(), record, status))
+    connection.close()
+
+def _output_file(outputDirectory, inputFile, output_format):
+    """
+    Names the file receiving the Dominating Set of an input file.
+
+    Args:
+        outputDirectory: The output directory, or None.
+        inputFile: Input file path.
+        output_format: "txt", "xz", "bz2" or "npy".
+
+    Returns:
+        The path of the output file, or None without an output directory.
+    """
+    if outputDirectory is None:
+        return None
+    extension = output_format if output_format in ("txt", "npy") else f"txt.{output_format}"
+    return os.path.join(outputDirectory, f"{utils.get_file_name(inputFile)}.{extension}")
+
+@contextlib.contextmanager
+def _open_records(jsonl):
+    """
+    Opens the destination of the JSON records.
+
+    Args:
+        jsonl: A file path, "-" for the standard output, or None to discard the records.
+
+    Yields:
+        A text stream, or None.
+    """
+    if jsonl is None:
+        yield None
+    elif jsonl == "-":
+        yield sys.stdout
+    else:
+        with open(jsonl, "a") as records:
+            yield records
+
+def _write_record(records, record, status, started):
+    """
+    Writes one JSON record per line, flushing it immediately.
+
+    Args:
+        records: A text stream, or None to discard the record.
+        record: The dictionary returned by approximate_solution (or the file name and error).
+        status: "ok", "error" or "timeout".
+        started: The time the file was started, to measure its wall-clock time.
+    """
+    if records is not None:
+        record = {**record, "status": status, "wall": (time.time() - started) * 1000.0, "host": platform.node()}
+        records.write(json.dumps(record) + "\n")
+        records.flush()
 
 
 def main():
@@ -36,6 +312,14 @@ def main():
     helper.add_argument('-c', '--count', action='store_true', help='calculate the size of the Dominating Set')
     helper.add_argument('-v', '--verbose', action='store_true', help='anable verbose output')
     helper.add_argument('-l', '--log', action='store_true', help='enable file logging')
+    helper.add_argument('-j', '--jobs', type=int, default=None, help='number of files solved in parallel, largest files first (see --workers for the components of each file)')
+    helper.add_argument('-w', '--workers', type=int, default=None, help='number of processes solving the connected components of each file in parallel')
+    helper.add_argument('-t', '--timeout', type=float, default=None, help='wall-clock limit in seconds for each file')
+    helper.add_argument('--jsonl', type=str, default=None, help='append one JSON record per file to this path (- for the standard output)')
+    helper.add_argument('-r', '--reduce', action='store_true', help='apply the dominating set reduction rules before every solver')
+    helper.add_argument('--no-cache', action='store_true', help='disable the on-disk caches of parsed graphs and solver results')
+    helper.add_argument('-o', '--output', type=str, default=None, help='directory receiving the Dominating Set of every file as sorted 1-based ids, only its size is printed')
+    helper.add_argument('--output-format', choices=['txt', 'xz', 'bz2', 'npy'], default='txt', help='format of the files written to the output directory (text, compressed text or binary NumPy array)')
     helper.add_argument('--version', action='version', version='%(prog)s 3.3')
 
     
@@ -46,7 +330,15 @@ def main():
                log=args.log,
                count=args.count,
                bruteForce=args.bruteForce,
-               approximation=args.approximation)
+               approximation=args.approximation,
+               jobs=args.jobs,
+               use_cache=not args.no_cache,
+               timeout=args.timeout,
+               jsonl=args.jsonl,
+               reduce=args.reduce,
+               outputDirectory=args.output,
+               output_format=args.output_format,
+               workers=args.workers)
 
 
 if __name__ == "__main__":
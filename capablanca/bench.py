@@ -0,0 +1,446 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from . import utils
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Graph sizes (number of vertices) of every family by default
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Average degree of the random families by default
+DEFAULT_DEGREE = 4
+
+# Number of vertices of every clique of the cliques family
+CLIQUE_SIZE = 32
+
+# Phases timed for every graph, the throughput of the last three is compared with the baseline
+PHASES = ("generate", "write", "parse", "graph", "solve")
+COMPARED_PHASES = ("parse", "graph", "solve")
+
+# Command lines timed by the startup benchmark: the name, the module run with python -m, its arguments
+# ({graph} is a 5-vertex DIMACS file) and whether it solves a graph, which needs the scientific stack
+STARTUP_COMMANDS = (
+    ("approx --version", "capablanca.app", ["--version"], False),
+    ("approx -h", "capablanca.app", ["-h"], False),
+    ("batch_approx -h", "capablanca.batch", ["-h"], False),
+    ("test_approx -h", "capablanca.test", ["-h"], False),
+    ("bench_approx -h", "capablanca.bench", ["-h"], False),
+    ("approx on a 5-vertex graph", "capablanca.app", ["-i", "{graph}", "--no-cache"], True),
+)
+
+# Modules of the scientific stack, which the command lines solving nothing must not import
+HEAVY_MODULES = ("numpy", "scipy", "networkx")
+
+# Largest import time in milliseconds of the command lines solving nothing, beyond the bare interpreter
+STARTUP_LIMIT = 50.0
+
+def erdos_renyi(n, degree, seed):
+    """
+    Generates an Erdős-Rényi G(n, m) graph with m = n * degree / 2.
+
+    Args:
+        n: Number of vertices.
+        degree: Average degree.
+        seed: Random seed.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    return utils.random_graph_edges(n, min(n * degree // 2, n * (n - 1) // 2), seed=seed)
+
+def grid(n, _degree, _seed):
+    """
+    Generates a square grid with about n vertices (degree and seed are ignored).
+
+    Args:
+        n: Number of vertices, rounded down to a square.
+        _degree: Unused.
+        _seed: Unused.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    import numpy as np
+
+    side = max(1, math.isqrt(n))
+    cells = np.arange(side * side, dtype=np.int64).reshape(side, side)
+    rows = np.concatenate([cells[:, :-1].ravel(), cells[:-1, :].ravel()])
+    cols = np.concatenate([cells[:, 1:].ravel(), cells[1:, :].ravel()])
+    return rows, cols
+
+def power_law(n, degree, seed):
+    """
+    Generates a Barabási-Albert preferential attachment graph, whose degrees follow a power law.
+
+    Args:
+        n: Number of vertices.
+        degree: Average degree, every new vertex attaches to degree / 2 vertices.
+        seed: Random seed.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    import networkx as nx
+
+    return _edges(nx.barabasi_albert_graph(n, max(1, min(degree // 2, n - 1)), seed=seed))
+
+def unit_disk(n, degree, seed):
+    """
+    Generates a unit disk graph of n random points in the unit square, with a radius giving the average degree.
+
+    Args:
+        n: Number of vertices.
+        degree: Expected average degree (ignoring the border).
+        seed: Random seed.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    import networkx as nx
+
+    return _edges(nx.random_geometric_graph(n, math.sqrt(degree / (math.pi * n)), seed=seed))
+
+def tree(n, _degree, seed):
+    """
+    Generates a uniformly random labeled tree (degree is ignored).
+
+    Args:
+        n: Number of vertices.
+        _degree: Unused.
+        seed: Random seed.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    import networkx as nx
+
+    return _edges(nx.random_labeled_tree(n, seed=seed))
+
+def cliques(n, _degree, _seed):
+    """
+    Generates disjoint cliques of CLIQUE_SIZE vertices (degree and seed are ignored).
+
+    Args:
+        n: Number of vertices, rounded down to a multiple of CLIQUE_SIZE.
+        _degree: Unused.
+        _seed: Unused.
+
+    Returns:
+        A tuple (rows, cols) with the 0-based endpoints of every edge.
+    """
+    import numpy as np
+
+    first, second = np.triu_indices(CLIQUE_SIZE, k=1)
+    offsets = np.arange(max(1, n // CLIQUE_SIZE), dtype=np.int64)[:, None] * CLIQUE_SIZE
+    return (offsets + first).ravel(), (offsets + second).ravel()
+
+# Graph families by name
+FAMILIES = {
+    "erdos_renyi": erdos_renyi,
+    "grid": grid,
+    "power_law": power_law,
+    "unit_disk": unit_disk,
+    "tree": tree,
+    "cliques": cliques,
+}
+
+def _edges(graph):
+    """
+    Gets the edges of a NetworkX graph with integer vertices as arrays.
+
+    Args:
+        graph: A NetworkX Graph.
+
+    Returns:
+        A tuple (rows, cols) with the endpoints of every edge.
+    """
+    import numpy as np
+
+    edges = np.array(list(graph.edges()), dtype=np.int64).reshape(-1, 2)
+    return edges[:, 0], edges[:, 1]
+
+def run_case(family, n, degree=DEFAULT_DEGREE, seed=0):
+    """
+    Generates one graph, writes it to a DIMACS file and times parsing and solving it.
+
+    Args:
+        family: The name of a graph family in FAMILIES.
+        n: Number of vertices.
+        degree: Average degree of the random families.
+        seed: Random seed.
+
+    Returns:
+        A dictionary with the family, the requested size, the number of vertices n and edges m, the time
+        in milliseconds of every phase, the throughput in vertices plus edges per second of the compared
+        phases, the size of the Dominating Set and the peak resident memory in bytes of the process.
+    """
+    from . import algorithm
+    from . import parser
+
+    timings = {}
+    started = time.perf_counter()
+    rows, cols = FAMILIES[family](n, degree, seed)
+    vertices = int(max(rows.max(), cols.max())) + 1 if len(rows) else 0
+    timings["generate"] = (time.perf_counter() - started) * 1000.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, f"{family}_{n}.dimacs")
+        started = time.perf_counter()
+        parser.save_edges_to_file(rows, cols, vertices, filename)
+        timings["write"] = (time.perf_counter() - started) * 1000.0
+
+        started = time.perf_counter()
+        rows, cols = parser.read_file_edges(filename)
+        timings["parse"] = (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+    graph = parser.edges_to_graph(rows, cols)
+    timings["graph"] = (time.perf_counter() - started) * 1000.0
+
+    n_vertices, m_edges = graph.number_of_nodes(), graph.number_of_edges()
+    started = time.perf_counter()
+    dominating_set = algorithm.find_dominating_set(graph)
+    timings["solve"] = (time.perf_counter() - started) * 1000.0
+
+    return {
+        "family": family,
+        "size": n,
+        "n": n_vertices,
+        "m": m_edges,
+        "timings": timings,
+        "throughput": {phase: (n_vertices + m_edges) / max(timings[phase] / 1000.0, 1e-9) for phase in COMPARED_PHASES},
+        "dominating_set_size": len(dominating_set),
+        "peak_memory": _peak_memory(),
+    }
+
+def _peak_memory():
+    """
+    Gets the peak resident memory of the current process.
+
+    Returns:
+        The peak resident set size in bytes, or None where the resource module is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run_benchmarks(families, sizes, degree=DEFAULT_DEGREE, seed=0):
+    """
+    Runs every family at every size, each case in a fresh process so that its peak memory is its own.
+
+    Args:
+        families: Names of graph families in FAMILIES.
+        sizes: Numbers of vertices.
+        degree: Average degree of the random families.
+        seed: Random seed.
+
+    Yields:
+        The dictionary of every case (see run_case) as soon as it is finished.
+    """
+    for family in families:
+        for n in sizes:
+            with multiprocessing.Pool(1) as pool:
+                yield pool.apply(run_case, (family, n, degree, seed))
+
+def compare(results, baseline, threshold):
+    """
+    Compares the throughput of every case with the same case of a baseline.
+
+    Args:
+        results: A list of case dictionaries.
+        baseline: A list of case dictionaries of a previous run.
+        threshold: Largest allowed relative drop of throughput, for instance 0.25 for 25%.
+
+    Returns:
+        A list of messages, one for every phase slower than the baseline beyond the threshold.
+    """
+    previous = {(case["family"], case["size"]): case for case in baseline}
+    regressions = []
+    for case in results:
+        reference = previous.get((case["family"], case["size"]))
+        if reference is None:
+            continue
+        for phase in COMPARED_PHASES:
+            current, expected = case["throughput"][phase], reference["throughput"][phase]
+            if current < (1.0 - threshold) * expected:
+                regressions.append(f"{case['family']} n={case['size']}: {phase} throughput {current:.0f}/s is {100.0 * (1.0 - current / expected):.1f}% below the baseline {expected:.0f}/s")
+    return regressions
+
+def _startup_run(arguments):
+    """
+    Runs Python once with -X importtime.
+
+    Args:
+        arguments: The arguments of the interpreter after -X importtime.
+
+    Returns:
+        A tuple (wall, imports, modules) with the wall-clock time in milliseconds, the cumulative import
+        time in milliseconds of every module imported at the top level (not by another module) and the
+        names of all the imported modules.
+    """
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", *arguments], capture_output=True, text=True)
+    wall = (time.perf_counter() - started) * 1000.0
+
+    imports = {}
+    modules = set()
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules.add(fields[2].strip())
+        # Nested imports are indented beyond the single space after the separator
+        if not fields[2].startswith("  "):
+            imports[fields[2].strip()] = int(fields[1]) / 1000.0
+    return wall, imports, modules
+
+def run_startup(repeat=5):
+    """
+    Times the startup of the command lines, keeping the fastest of several runs of each one (the
+    wall-clock and import times are the smallest ones of all the runs, measured independently).
+
+    The import time of a command line counts the modules it imports beyond the ones of the bare
+    interpreter, as reported by python -X importtime.
+
+    Args:
+        repeat: Number of runs of every command line.
+
+    Yields:
+        A dictionary for every command line in STARTUP_COMMANDS with its name, whether it solves a graph,
+        its wall-clock time and its time beyond the bare interpreter in milliseconds, its import time in
+        milliseconds and the modules of HEAVY_MODULES it imports.
+    """
+    bare_runs = [_startup_run(["-c", "pass"]) for _ in range(repeat)]
+    bare_wall = min(wall for wall, _, _ in bare_runs)
+    bare_imports = set().union(*(imports for _, imports, _ in bare_runs))
+
+    with tempfile.TemporaryDirectory() as directory:
+        graph = os.path.join(directory, "path.dimacs")
+        with open(graph, "w") as file:
+            file.write("p edge 5 4\ne 1 2\ne 2 3\ne 3 4\ne 4 5\n")
+
+        for name, module, arguments, solves in STARTUP_COMMANDS:
+            command = ["-m", module, *(argument.format(graph=graph) for argument in arguments)]
+            runs = [_startup_run(command) for _ in range(repeat)]
+            wall = min(wall for wall, _, _ in runs)
+            loaded = {module.split(".")[0] for _, _, modules in runs for module in modules}
+            yield {
+                "command": name,
+                "solves": solves,
+                "wall": wall,
+                "overhead": wall - bare_wall,
+                "imports": min(sum(elapsed for module, elapsed in imports.items() if module not in bare_imports) for _, imports, _ in runs),
+                "heavy": [module for module in HEAVY_MODULES if module in loaded],
+            }
+
+def check_startup(results, limit):
+    """
+    Checks that the command lines solving nothing start fast.
+
+    Args:
+        results: A list of dictionaries returned by run_startup.
+        limit: Largest allowed import time in milliseconds.
+
+    Returns:
+        A list of messages, one for every command line importing the scientific stack or beyond the limit.
+    """
+    regressions = []
+    for result in results:
+        if result["solves"]:
+            continue
+        if result["heavy"]:
+            regressions.append(f"{result['command']} imports {', '.join(result['heavy'])}")
+        if result["imports"] > limit:
+            regressions.append(f"{result['command']} spends {result['imports']:.1f} ms importing modules, beyond the limit of {limit:.1f} ms")
+    return regressions
+
+def main():
+
+    # Define the parameters
+    helper = argparse.ArgumentParser(prog="bench_approx", description="Measure how the 2-Approximate Dominating Set solver scales on generated graph families.")
+    helper.add_argument('-f', '--families', type=str, default=",".join(FAMILIES), help=f'comma-separated graph families among {", ".join(FAMILIES)}')
+    helper.add_argument('-s', '--sizes', type=str, default=",".join(map(str, DEFAULT_SIZES)), help='comma-separated numbers of vertices')
+    helper.add_argument('-d', '--degree', type=int, default=DEFAULT_DEGREE, help='average degree of the random families')
+    helper.add_argument('--seed', type=int, default=0, help='random seed of the generators')
+    helper.add_argument('-o', '--output', type=str, default=None, help='write the results as JSON to this path')
+    helper.add_argument('--baseline', type=str, default=None, help='compare the throughput with the JSON results of a previous run')
+    helper.add_argument('--threshold', type=float, default=0.25, help='largest allowed relative drop of throughput against the baseline')
+    helper.add_argument('--startup', action='store_true', help='time the startup of the command-line tools instead of solving graph families')
+    helper.add_argument('--startup-limit', type=float, default=STARTUP_LIMIT, help='largest allowed import time in milliseconds of the command lines solving nothing')
+    helper.add_argument('--version', action='version', version='%(prog)s 3.3')
+
+    # Initialize the parameters
+    args = helper.parse_args()
+    if args.startup:
+        startup(args)
+        return
+
+    families = [family for family in args.families.split(",") if family]
+    unknown = [family for family in families if family not in FAMILIES]
+    if unknown:
+        helper.error(f"unknown graph families: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = []
+    for case in run_benchmarks(families, sizes, args.degree, args.seed):
+        results.append(case)
+        memory = "" if case["peak_memory"] is None else f", peak memory {case['peak_memory'] / (1 << 20):.1f} MiB"
+        phases = ", ".join(f"{phase} {case['timings'][phase]:.1f} ms" for phase in PHASES)
+        print(f"{case['family']} n={case['n']} m={case['m']}: {phases}{memory}, Dominating Set Size {case['dominating_set_size']}", flush=True)
+
+    if args.output:
+        report = {"host": platform.node(), "python": platform.python_version(), "degree": args.degree, "seed": args.seed, "results": results}
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No throughput regression beyond {100.0 * args.threshold:.0f}% against {args.baseline}")
+
+def startup(args):
+    """
+    Runs the startup benchmark of bench_approx --startup.
+
+    Args:
+        args: The parsed command-line arguments.
+    """
+    results = []
+    for result in run_startup():
+        results.append(result)
+        heavy = f", imports {', '.join(result['heavy'])}" if result["heavy"] else ""
+        print(f"{result['command']}: {result['wall']:.1f} ms, {result['overhead']:.1f} ms over the bare interpreter, {result['imports']:.1f} ms of imports{heavy}", flush=True)
+
+    if args.output:
+        report = {"host": platform.node(), "python": platform.python_version(), "startup": results}
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    regressions = check_startup(results, args.startup_limit)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"No command line solving nothing imports the scientific stack or spends more than {args.startup_limit:.0f} ms importing modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+
+# Default location and size limit (in bytes) of the graph cache, overridable by environment variables
+DEFAULT_CACHE_DIR = os.environ.get("CAPABLANCA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "capablanca"))
+DEFAULT_CACHE_SIZE = int(os.environ.get("CAPABLANCA_CACHE_SIZE", 1 << 32))
+DEFAULT_RESULT_CACHE_SIZE = int(os.environ.get("CAPABLANCA_RESULT_CACHE_SIZE", 1 << 30))
+
+# Every cache file starts with this magic string followed by the number of edges
+MAGIC = b"CAPAEDG1"
+HEADER_SIZE = len(MAGIC) + 8
+
+# Size in bytes of the pieces of the input file hashed at once
+HASH_BLOCK_SIZE = 1 << 20
+
+# Version of the result entries, bumped whenever their layout or the graph hash changes
+RESULT_FORMAT = 2
+
+class _FileCache:
+    """
+    A directory of cache files with one suffix, evicting the least recently used ones beyond a size limit.
+    """
+
+    # Suffix of the cache files, the other files of the directory are never touched
+    suffix = ""
+
+    def __init__(self, directory, max_size):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): The cache directory.
+            max_size (int): The size limit in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def path(self, key):
+        """
+        Gets the path of the cache file of a key.
+
+        Args:
+            key: The key of a cache entry.
+
+        Returns:
+            The path to the cache file.
+        """
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _write(self, key, content):
+        """
+        Writes a cache entry atomically and evicts the least recently used entries beyond the size limit.
+
+        Args:
+            key: The key of a cache entry.
+            content: A function writing the entry to a binary file object.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                content(file)
+            # Readers only ever see complete entries
+            os.replace(temporary, self.path(key))
+        except OSError:
+            self._remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits in its size limit.
+        """
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(self.suffix)]
+        except FileNotFoundError:
+            return
+        entries = sorted(((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path) for entry in entries), reverse=True)
+        total = 0
+        for _, size, path in entries:
+            total += size
+            if total > self.max_size:
+                self._remove(path)
+
+    def _remove(self, path):
+        """
+        Removes a file if it exists.
+
+        Args:
+            path: The path to the file.
+        """
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+class GraphCache(_FileCache):
+    """
+    An on-disk cache of parsed DIMACS files stored as memory-mappable edge files.
+
+    Each entry is keyed by the path, size, modification time and content hash of the source file.
+    The file holds, as 64-bit integers after a small header, the endpoints of the edges in file order,
+    from which the graph is rebuilt exactly as the parser would (the neighbor order decides the ties of
+    the solver, so no adjacency is stored). Entries are loaded with np.memmap without copying, and the
+    least recently used ones are evicted when the cache exceeds its size limit.
+    """
+
+    suffix = ".edges"
+
+    def __init__(self, directory=None, max_size=None):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str, optional): The cache directory. Defaults to DEFAULT_CACHE_DIR.
+            max_size (int, optional): The size limit in bytes. Defaults to DEFAULT_CACHE_SIZE.
+        """
+        super().__init__(directory or DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE if max_size is None else max_size)
+
+    def key(self, filepath):
+        """
+        Computes the key of a source file.
+
+        Args:
+            filepath: The path to the source file.
+
+        Returns:
+            A hexadecimal string hashing the absolute path, size, modification time and content of the file.
+        """
+        status = os.stat(filepath)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{os.path.abspath(filepath)}\0{status.st_size}\0{status.st_mtime_ns}\0".encode())
+        with open(filepath, "rb") as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self, key):
+        """
+        Loads a cache entry without copying it into memory.
+
+        Args:
+            key: The key of a source file.
+
+        Returns:
+            A tuple (rows, cols) of read-only memory-mapped arrays, or None if there is no valid entry.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                header = file.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+                raise ValueError(f"Invalid cache file: {path}")
+            edges = int(np.frombuffer(header, dtype=np.int64, offset=len(MAGIC))[0])
+            lengths = [edges, edges]
+            if os.path.getsize(path) != HEADER_SIZE + 8 * sum(lengths):
+                raise ValueError(f"Invalid cache file: {path}")
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            self._remove(path)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        data = np.memmap(path, dtype=np.int64, mode="r", offset=HEADER_SIZE) if sum(lengths) else np.empty(0, dtype=np.int64)
+        bounds = np.cumsum([0, *lengths])
+        return tuple(data[bounds[i]:bounds[i + 1]] for i in range(len(lengths)))
+
+    def store(self, key, rows, cols):
+        """
+        Stores a cache entry and evicts the least recently used entries beyond the size limit.
+
+        Args:
+            key: The key of a source file.
+            rows: First endpoint of every edge in file order.
+            cols: Second endpoint of every edge in file order.
+        """
+        header = MAGIC + np.array([len(rows)], dtype=np.int64).tobytes()
+
+        def content(file):
+            file.write(header)
+            for array in (rows, cols):
+                np.asarray(array, dtype=np.int64).tofile(file)
+
+        self._write(key, content)
+
+class ResultCache(_FileCache):
+    """
+    An on-disk cache of solver results, addressed by the content of the graph.
+
+    Each entry is keyed by a hash of the vertices and adjacency lists of the graph in order (independent
+    of the file it was read from, but not of the order of its edges) together with the solver name, its
+    version and its options, so that bumping the version of a solver invalidates its previous results. Entries
+    are small JSON files holding the sorted vertices of the solution, and the least recently used ones
+    are evicted when the cache exceeds its size limit.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory=None, max_size=None):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str, optional): The cache directory. Defaults to the results directory of DEFAULT_CACHE_DIR.
+            max_size (int, optional): The size limit in bytes. Defaults to DEFAULT_RESULT_CACHE_SIZE.
+        """
+        super().__init__(directory or os.path.join(DEFAULT_CACHE_DIR, "results"), DEFAULT_RESULT_CACHE_SIZE if max_size is None else max_size)
+
+    def graph_key(self, graph):
+        """
+        Computes the hash of a graph with integer vertices, in the order the solvers see it.
+
+        The vertices are hashed in graph order and the neighbors of every vertex in adjacency order:
+        find_dominating_set breaks ties in that order, so a copy of a file with its edges reordered is
+        another entry, and a hit always returns the set a fresh run would.
+
+        Args:
+            graph: A NetworkX Graph.
+
+        Returns:
+            A hexadecimal string hashing the vertices and the adjacency lists, or None if some vertex is not an integer.
+        """
+        nodes = list(graph)
+        if not all(isinstance(v, (int, np.integer)) for v in nodes):
+            return None
+        index = {v: i for i, v in enumerate(nodes)}
+        degrees = np.fromiter((len(graph.adj[v]) for v in nodes), dtype=np.int64, count=len(nodes))
+        neighbors = np.fromiter((index[u] for v in nodes for u in graph.adj[v]), dtype=np.int64, count=int(degrees.sum()))
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.array([RESULT_FORMAT, len(nodes), len(neighbors)], dtype=np.int64).tobytes())
+        digest.update(np.array(nodes, dtype=np.int64).tobytes())
+        digest.update(degrees.tobytes())
+        digest.update(neighbors.tobytes())
+        return digest.hexdigest()
+
+    def key(self, graph_key, solver, version, options=""):
+        """
+        Computes the key of a solver result.
+
+        Args:
+            graph_key: The hash of the graph (see graph_key).
+            solver: The name of the solver.
+            version: The version of the solver.
+            options: The options changing the result of the solver, as a string.
+
+        Returns:
+            A hexadecimal string.
+        """
+        return hashlib.blake2b(f"{graph_key}\0{solver}\0{version}\0{options}".encode(), digest_size=20).hexdigest()
+
+    def load(self, key):
+        """
+        Loads a cached result.
+
+        Args:
+            key: The key of a solver result.
+
+        Returns:
+            A tuple (found, result) where result is the cached set of vertices (or None when the solver
+            returned None), and found is False if there is no valid entry.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = json.load(file)
+            result = entry["result"]
+        except FileNotFoundError:
+            return False, None
+        except (ValueError, KeyError, TypeError):
+            self._remove(path)
+            return False, None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        return True, None if result is None else set(result)
+
+    def store(self, key, result):
+        """
+        Stores a solver result and evicts the least recently used entries beyond the size limit.
+
+        Args:
+            key: The key of a solver result.
+            result: A set of integer vertices, or None.
+        """
+        entry = {"result": None if result is None else sorted(int(v) for v in result)}
+        self._write(key, lambda file: file.write(json.dumps(entry).encode()))
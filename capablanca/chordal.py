@@ -1,54 +1,445 @@
 import networkx as nx
+import numpy as np
+from . import instrumentation
 
-def approximate_dominating_set_chordal(G):
+def approximate_dominating_set_chordal(G, peo=None, trusted=False, validate=False, stats=None):
     """
     Find an approximate dominating set with a 2-approximation ratio in a chordal graph in polynomial time.
 
     Args:
         G: A NetworkX graph that is assumed to be chordal
+        peo: A perfect elimination ordering of G supplied by the caller (G.nodes() order by default)
+        trusted: Skip the chordality check because the caller guarantees that G is chordal
+        validate: Check that G is chordal and that peo is a perfect elimination ordering, even in trusted mode (for debugging)
+        stats: An instrumentation.Stats object receiving the time of the chordality_check, peo, chordal_build and
+            greedy phases and the work counters (none by default)
 
     Returns:
         A set of vertices forming a 2-approximate dominating set
 
+    Raises:
+        ValueError: If G is not chordal or peo is not a perfect elimination ordering (when checked).
+
     Time Complexity: O(n + m) where n is the number of vertices and m is the number of edges
     """
-    # Verify the graph is chordal (optional check)
-    if not nx.is_chordal(G):
-        raise ValueError("Input graph is not chordal")
+    stats = stats or instrumentation.DISABLED
+
+    # Verify the graph is chordal (skipped in trusted mode)
+    with stats.phase("chordality_check"):
+        if (validate or not trusted) and not nx.is_chordal(G):
+            raise ValueError("Input graph is not chordal")
+
+    # Get the perfect elimination ordering: complete_to_chordal_graph reports the vertices of a
+    # chordal graph in G.nodes() order, so neither that call nor its copy of G is needed
+    with stats.phase("peo"):
+        if peo is None:
+            peo = list(G.nodes())
+        elif validate and not is_perfect_elimination_ordering(G, peo):
+            raise ValueError("The given ordering is not a perfect elimination ordering")
+
+    # Index the vertices and store the adjacency in CSR arrays
+    with stats.phase("chordal_build"):
+        nodes = list(G.nodes())
+        index = {v: i for i, v in enumerate(nodes)}
+        indptr, indices = _graph_copy_to_csr(G, nodes, index)
+
+        # We'll process vertices in reverse PEO
+        reverse_peo = [index[v] for v in reversed(peo)]
+
+    dominating_set = approximate_dominating_set_csr(indptr, indices, reverse_peo, stats)
+
+    return {nodes[i] for i in dominating_set}
+
+def is_perfect_elimination_ordering(G, peo):
+    """
+    Checks whether an ordering of the vertices is a perfect elimination ordering of G.
+
+    Every vertex together with its neighbors placed later in the ordering must form a clique. It is
+    enough to check that those later neighbors, except the earliest one p, are all adjacent to p.
+
+    Args:
+        G: A NetworkX graph
+        peo: A sequence with every vertex of G exactly once
+
+    Returns:
+        True if peo is a perfect elimination ordering of G, False otherwise.
+    """
+    position = {v: i for i, v in enumerate(peo)}
+    if len(position) != len(peo) or len(position) != G.number_of_nodes() or any(v not in G for v in position):
+        return False
+
+    for v in peo:
+        later_neighbors = [u for u in G.neighbors(v) if u != v and position[u] > position[v]]
+        if later_neighbors:
+            parent = min(later_neighbors, key=position.__getitem__)
+            parent_neighbors = G.adj[parent]
+            if any(u != parent and u not in parent_neighbors for u in later_neighbors):
+                return False
+
+    return True
+
+def approximate_dominating_set_csr(indptr, indices, order=None, stats=None):
+    """
+    Find an approximate dominating set with a 2-approximation ratio in a chordal graph stored in CSR arrays.
+
+    The vertices are processed in the given order. For every undominated vertex v the vertex of N[v]
+    covering the most undominated vertices is selected, visiting the neighbors of v in the order
+    they are stored and v itself last (the first maximum wins). This is the same greedy rule as
+    approximate_dominating_set_chordal.
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1
+        indices: CSR column indices, the neighbors of vertex v are indices[indptr[v]:indptr[v + 1]]
+        order: The vertices in the order they are processed (reverse PEO), n - 1 down to 0 by default
+        stats: An instrumentation.Stats object receiving the time of the chordal_build and greedy phases (none by default)
+
+    Returns:
+        A set of vertex indices forming a 2-approximate dominating set
+
+    Time Complexity: O(n + m) where n is the number of vertices and m is the number of edges
+    """
+    stats = stats or instrumentation.DISABLED
+    with stats.phase("chordal_build"):
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        n = len(indptr) - 1
+        if order is None:
+            order = range(n - 1, -1, -1)
+
+        closed_indptr, closed_indices = closed_neighborhood_csr(indptr, indices)
+    stats.count("edges_materialized", len(indices) + len(closed_indices))
+
+    with stats.phase("greedy"):
+        return _greedy_closed_csr(closed_indptr, closed_indices, order, stats=stats)
+
+def closed_neighborhood_csr(indptr, indices):
+    """
+    Appends every vertex to its own row, so that each row is the closed neighborhood N[v].
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1
+        indices: CSR column indices without self loops
+
+    Returns:
+        closed_indptr: CSR row pointers of the closed neighborhoods
+        closed_indices: CSR column indices of the closed neighborhoods, every row ending with its own vertex
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    closed_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(degree + 1, out=closed_indptr[1:])
+    closed_indices = np.empty(closed_indptr[-1], dtype=np.int64)
+    closed_indices[_row_positions(closed_indptr, np.arange(n), degree)] = indices
+    closed_indices[closed_indptr[1:] - 1] = np.arange(n)
+
+    return closed_indptr, closed_indices
+
+def graph_to_csr(G, nodes=None, index=None):
+    """
+    Converts a NetworkX graph to CSR arrays, keeping the order of the neighbors of each vertex.
+
+    Args:
+        G: A NetworkX graph
+        nodes: The vertices of G, the list position of a vertex is its index (G.nodes() order by default)
+        index: A dictionary mapping every vertex to its position in nodes
+
+    Returns:
+        indptr: CSR row pointers, an integer array of length n + 1
+        indices: CSR column indices as vertex indices (self loops are ignored)
+    """
+    if nodes is None:
+        nodes = list(G.nodes())
+    if index is None:
+        index = {v: i for i, v in enumerate(nodes)}
 
-    # Get the perfect elimination ordering
-    G, peo = nx.chordal.complete_to_chordal_graph(G)
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indices = []
+    for i, v in enumerate(nodes):
+        indices.extend(index[u] for u in G.neighbors(v) if u != v)
+        indptr[i + 1] = len(indices)
 
-    # We'll process vertices in reverse PEO
-    reverse_peo = list(reversed(peo))
+    return indptr, np.array(indices, dtype=np.int64)
+
+def _graph_copy_to_csr(G, nodes, index):
+    """
+    Converts a NetworkX graph to CSR arrays with the neighbor order that G.copy() would have.
+
+    G.copy() adds the edges again in node order, so each vertex first lists its neighbors placed
+    before it (in node order) and then the remaining neighbors in their original order. Building
+    that order directly gives the same candidate tie-breaking without copying the graph.
+
+    Args:
+        G: A NetworkX graph
+        nodes: The vertices of G in G.nodes() order
+        index: A dictionary mapping every vertex to its position in nodes
+
+    Returns:
+        indptr: CSR row pointers, an integer array of length n + 1
+        indices: CSR column indices as vertex indices (self loops are ignored)
+    """
+    earlier = [[] for _ in nodes]
+    for i, v in enumerate(nodes):
+        for u in G.neighbors(v):
+            j = index[u]
+            if j > i:
+                earlier[j].append(i)
+
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indices = []
+    for i, v in enumerate(nodes):
+        indices.extend(earlier[i])
+        indices.extend(j for j in (index[u] for u in G.neighbors(v)) if j > i)
+        indptr[i + 1] = len(indices)
+
+    return indptr, np.array(indices, dtype=np.int64)
+
+def _row_positions(indptr, rows, lengths=None):
+    """
+    Returns the positions in the CSR indices array covered by the given rows, concatenated in order.
+
+    Args:
+        indptr: CSR row pointers
+        rows: An integer array of row numbers
+        lengths: The lengths of those rows (computed from indptr if omitted)
 
+    Returns:
+        An integer array of positions into the CSR indices array
+    """
+    starts = indptr[rows]
+    if lengths is None:
+        lengths = indptr[rows + 1] - starts
+    ends = np.cumsum(lengths)
+    return np.repeat(starts - ends + lengths, lengths) + np.arange(ends[-1] if len(ends) else 0)
+
+def _greedy_closed_csr(indptr, indices, order, clique_first=False, dominated=None, stats=instrumentation.DISABLED, blocks=None):
+    """
+    Greedy kernel shared by the chordal solvers: rows of the CSR arrays are closed neighborhoods.
+
+    The number of undominated vertices in every closed neighborhood is kept up to date as vertices
+    become dominated, so choosing the best candidate costs O(|N[v]|) and every vertex updates the
+    counts of its neighborhood once, for O(n + m) total work.
+
+    Args:
+        indptr: CSR row pointers of the closed neighborhoods
+        indices: CSR column indices of the closed neighborhoods, in candidate order
+        order: The vertices in the order they are processed
+        clique_first: Select the vertex covering the most vertices among all of them before processing order, or
+            with blocks, a boolean array telling in which blocks to select the one covering the most of its block
+        dominated: A boolean array marking the vertices that need no dominator (none by default)
+        stats: An instrumentation.Stats object receiving the number of neighborhood_scans, the candidate rows
+            and the rows of newly dominated vertices read, counted once the loop is done
+        blocks: The first vertex of every block of independent vertex ranges, whose closed neighborhoods stay
+            within the block, or None for a single block
+
+    Returns:
+        A set of vertex indices forming a dominating set
+    """
+    n = len(indptr) - 1
+    if dominated is None:
+        dominated = np.zeros(n, dtype=bool)
+        undominated_count = np.diff(indptr)
+    else:
+        dominated = np.array(dominated, dtype=bool)
+        undominated_count = np.add.reduceat((~dominated[indices]).astype(np.int64), indptr[:-1]) if n else np.zeros(0, dtype=np.int64)
+    initially_dominated = int(dominated.sum()) if stats.enabled else 0
     dominating_set = set()
-    dominated = {v: False for v in G.nodes()}
-    
-    # Process vertices in reverse perfect elimination ordering
-    for v in reverse_peo:
+
+    def select(best_vertex):
+        # Add the best vertex to the dominating set
+        dominating_set.add(best_vertex)
+
+        # Mark vertices as dominated
+        row = indices[indptr[best_vertex]:indptr[best_vertex + 1]]
+        newly_dominated = row[~dominated[row]]
+        dominated[newly_dominated] = True
+
+        # Every closed neighborhood containing a newly dominated vertex loses one undominated vertex
+        np.subtract.at(undominated_count, indices[_row_positions(indptr, newly_dominated)], 1)
+
+    if blocks is None:
+        if clique_first:
+            select(int(np.argmax(undominated_count)))
+        initial_selections = int(bool(clique_first))
+    else:
+        # No block touches the counts of another one, so their first choices can all be made up front
+        ends = np.append(blocks[1:], n)
+        for start, end in zip(blocks[clique_first].tolist(), ends[clique_first].tolist(), strict=True):
+            select(start + int(np.argmax(undominated_count[start:end])))
+        initial_selections = int(np.count_nonzero(clique_first))
+
+    # Process vertices in the given order
+    for v in order:
         # If v is not dominated yet, add one of its neighbors to the dominating set
         if not dominated[v]:
-            # Find the best neighbor to add (including v itself)
-            best_vertex = v
-            best_undominated_count = -1
+            # Find the best neighbor to add, np.argmax keeps the first maximum
+            row = indices[indptr[v]:indptr[v + 1]]
+            select(int(row[np.argmax(undominated_count[row])]))
 
-            for neighbor in list(G.neighbors(v)) + [v]:
-                undominated_neighbors_count = 0
-                for u in list(G.neighbors(neighbor)) + [neighbor]:
-                    if not dominated[u]:
-                        undominated_neighbors_count += 1
+    if stats.enabled:
+        # One candidate row per selection made in order, and one row per newly dominated vertex
+        stats.count("neighborhood_scans", len(dominating_set) - initial_selections + int(dominated.sum()) - initially_dominated)
 
-                if undominated_neighbors_count > best_undominated_count:
-                    best_undominated_count = undominated_neighbors_count
-                    best_vertex = neighbor
+    return dominating_set
 
-            # Add the best vertex to the dominating set
-            dominating_set.add(best_vertex)
+def approximate_dominating_set_split(G, dominated=None, stats=None):
+    """
+    Find an approximate dominating set with a 2-approximation ratio in a connected graph through its chordal (split) transformation, without materializing it.
 
-            # Mark vertices as dominated
-            dominated[best_vertex] = True
-            for neighbor in G.neighbors(best_vertex):
-                dominated[neighbor] = True
+    The chordal graph used by find_dominating_set has two copies (i, 0) and (i, 1) of every vertex i,
+    a clique over all (i, 0) copies and the edges (i, 0)-(j, 1) for every j in N[i]. Running
+    approximate_dominating_set_chordal on that graph first selects an (i, 0) copy, which dominates the
+    whole clique, and from then on only chooses (i, 0) copies to dominate the remaining (j, 1) copies.
+    This function replays exactly the same choices on the original adjacency, so it returns the same
+    vertices while using O(n + m) memory instead of the O(n^2) edges of the clique.
 
-    return dominating_set
+    Args:
+        G: A connected NetworkX graph (or subgraph view) with at least one edge
+        dominated: A set of vertices that need no dominator, such as the ones of a reduced kernel (none by default)
+        stats: An instrumentation.Stats object receiving the time of the chordal_build and greedy phases and
+            the work counters (none by default)
+
+    Returns:
+        A set of vertices of G forming a 2-approximate dominating set (of its undominated vertices)
+    """
+    stats = stats or instrumentation.DISABLED
+    with stats.phase("chordal_build"):
+        # Vertex order used to build the chordal graph, the tie-breaking order between candidates
+        order = list(G.nodes())
+        indptr, indices = graph_to_csr(G, order)
+
+        dominated = np.fromiter((v in dominated for v in order), dtype=bool, count=len(order)) if dominated else None
+    stats.count("edges_materialized", len(indices))
+
+    dominating_set = approximate_dominating_set_split_csr(indptr, indices, dominated=dominated, stats=stats)
+
+    return {order[i] for i in dominating_set}
+
+def approximate_dominating_set_split_csr(indptr, indices, component=None, dominated=None, stats=None):
+    """
+    Find an approximate dominating set with a 2-approximation ratio in a connected component stored in CSR arrays through its implicit chordal (split) transformation.
+
+    Args:
+        indptr: CSR row pointers of the whole graph, an integer array of length n + 1
+        indices: CSR column indices of the whole graph, in the order the neighbors were added
+        component: The vertex indices of one connected component in the order used to build the chordal graph (all vertices by default)
+        dominated: A boolean array over all vertices marking the ones that need no dominator (none by default)
+        stats: An instrumentation.Stats object receiving the time of the chordal_build and greedy phases and
+            the work counters (none by default)
+
+    Returns:
+        A set of vertex indices of the component forming a 2-approximate dominating set
+
+    Time Complexity: O((n + m) log n) where n and m are the number of vertices and edges of the component
+    """
+    stats = stats or instrumentation.DISABLED
+    with stats.phase("chordal_build"):
+        structure = _split_structure(indptr, indices, component, dominated)
+    if structure is None:
+        return set()
+    component, closed_indptr, closed_indices, arrival, clique_copy_last, dominated = structure
+    stats.count("edges_materialized", len(closed_indices))
+
+    # The greedy visits the copies in reverse order of arrival
+    with stats.phase("greedy"):
+        dominating_set = _greedy_closed_csr(closed_indptr, closed_indices, arrival[::-1].tolist(), clique_first=bool(clique_copy_last[0]), dominated=dominated, stats=stats)
+
+    return {int(component[i]) for i in dominating_set}
+
+def approximate_dominating_set_split_blocks(indptr, indices, starts, stats=None):
+    """
+    Find approximate dominating sets with a 2-approximation ratio in many connected components at once through their implicit chordal (split) transformations.
+
+    The components are consecutive vertex ranges of one block-diagonal CSR adjacency. The closed
+    neighborhoods and visiting orders of all of them are built by the array operations that
+    approximate_dominating_set_split_csr runs on a single component, and one greedy pass visits every
+    block, so each component gets the vertices approximate_dominating_set_split_csr would choose for it.
+
+    Args:
+        indptr: CSR row pointers of the block-diagonal graph, an integer array of length n + 1
+        indices: CSR column indices, in the order the neighbors were added
+        starts: The first vertex of every component, an increasing integer array starting at 0: a component
+            holds the vertices up to the next start, in the order used to build its chordal graph
+        stats: An instrumentation.Stats object receiving the time of the chordal_build and greedy phases and
+            the work counters (none by default)
+
+    Returns:
+        A set of vertex indices forming a 2-approximate dominating set of every component
+
+    Time Complexity: O((n + m) log n) where n and m are the number of vertices and edges of all the components
+    """
+    stats = stats or instrumentation.DISABLED
+    starts = np.asarray(starts, dtype=np.int64)
+    if not len(starts):
+        return set()
+    with stats.phase("chordal_build"):
+        _, closed_indptr, closed_indices, arrival, clique_copy_last, _ = _split_structure(indptr, indices, None, None, starts)
+    stats.count("edges_materialized", len(closed_indices))
+
+    # Reversing the whole arrival order reverses the one of every block, and the blocks are independent
+    with stats.phase("greedy"):
+        return _greedy_closed_csr(closed_indptr, closed_indices, arrival[::-1].tolist(), clique_first=clique_copy_last, stats=stats, blocks=starts)
+
+def _split_structure(indptr, indices, component, dominated, starts=None):
+    """
+    Builds the closed neighborhoods and the visiting order of the implicit chordal (split) transformation of a component.
+
+    Args:
+        indptr: CSR row pointers of the whole graph
+        indices: CSR column indices of the whole graph
+        component: The vertex indices of the component in chordal build order, or None for all vertices
+        dominated: A boolean array over all vertices marking the ones that need no dominator, or None
+        starts: The first position of every block of independent components in the component order, for a
+            block-diagonal graph (a single block by default)
+
+    Returns:
+        A tuple (component, closed_indptr, closed_indices, arrival, clique_copy_last, dominated) in local
+        vertex positions, where clique_copy_last is a boolean array with one flag per block, or None if
+        every vertex of the component is already dominated
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    component = np.arange(len(indptr) - 1, dtype=np.int64) if component is None else np.asarray(component, dtype=np.int64)
+    size = len(component)
+    if dominated is not None:
+        dominated = np.asarray(dominated, dtype=bool)[component]
+        # Nothing to dominate, a component of a kernel may only hold vertices dominated by forced ones
+        if dominated.all():
+            return None
+
+    # Local position of every vertex in the component order
+    sorter = np.argsort(component)
+    degree = indptr[component + 1] - indptr[component]
+    owner = np.repeat(np.arange(size, dtype=np.int64), degree)
+    neighbors = indices[_row_positions(indptr, component, degree)]
+    neighbors = sorter[np.searchsorted(component, neighbors, sorter=sorter)]
+    loop = neighbors == owner
+    owner, neighbors = owner[~loop], neighbors[~loop]
+
+    # The closed neighborhood of u lists the vertices i with u in N[i] in component order, that is
+    # the row of u sorted increasingly, plus u itself
+    rows = np.concatenate([neighbors, np.arange(size, dtype=np.int64)])
+    columns = np.concatenate([owner, np.arange(size, dtype=np.int64)])
+    permutation = np.lexsort((columns, rows))
+    closed_indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=closed_indptr[1:])
+    closed_indices = columns[permutation]
+
+    # Order in which the (j, 1) copies enter the chordal graph: processing vertex i adds (i, 1)
+    # and then (j, 1) for every neighbor j, skipping copies that are already there
+    sequence = np.empty(size + len(neighbors), dtype=np.int64)
+    heads = np.arange(size, dtype=np.int64) + np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=size))[:-1]])
+    body = np.ones(len(sequence), dtype=bool)
+    body[heads] = False
+    sequence[heads] = np.arange(size, dtype=np.int64)
+    sequence[body] = neighbors
+    _, first = np.unique(sequence, return_index=True)
+    first.sort()
+    arrival = sequence[first]
+
+    # When processing the last vertex (of a block) adds no new copy, the last vertex of the chordal graph is
+    # its clique copy (i, 0); its closed neighborhood contains the whole clique, so every vertex is a candidate first
+    ends = np.append(starts[1:], size) if starts is not None else np.array([size])
+    clique_copy_last = first[ends - 1] < heads[ends - 1]
+
+    return component, closed_indptr, closed_indices, arrival, clique_copy_last, dominated
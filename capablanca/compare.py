@@ -0,0 +1,282 @@
+import multiprocessing
+import multiprocessing.connection
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from . import algorithm
+from . import parser
+
+# Share of the remaining budget given to the solvers that accept a time limit, the rest is left to send their result back
+DEADLINE_SHARE = 0.95
+
+def approximation(graph, reduce=False):
+    """
+    The approximation within a logarithmic factor, see algorithm.find_dominating_set_approximation.
+    """
+    return algorithm.find_dominating_set_approximation(graph, reduce=reduce), True
+
+def brute_force(graph, reduce=False, time_limit=None):
+    """
+    The exact branch and bound, see algorithm.find_dominating_set_exact: its best set when time_limit is
+    reached, which is only finished (proven optimal) if the search completed.
+    """
+    return algorithm.find_dominating_set_exact(graph, time_limit=time_limit, reduce=reduce)
+
+def capablanca(graph, reduce=False):
+    """
+    The 2-approximation, see algorithm.find_dominating_set.
+    """
+    return algorithm.find_dominating_set(graph, reduce=reduce), True
+
+# Solvers that can be compared by name, each called as solver(graph, reduce=...) and returning a tuple
+# (dominating_set, finished), where finished is False for a set the solver could not complete in time
+SOLVERS = {
+    "approximation": approximation,
+    "brute_force": brute_force,
+    "capablanca": capablanca,
+}
+
+# Solvers of SOLVERS that also accept time_limit, the seconds left before the comparison stops them
+TIME_LIMITED = {"brute_force"}
+
+def register_solver(name, solver, time_limited=False):
+    """
+    Adds a solver to the registry, so that a Comparison can run it by name.
+
+    Args:
+        name: The name of the solver.
+        solver: A module-level function solver(graph, reduce=False) returning a tuple (dominating_set, finished),
+            which may modify the graph it receives (every solver gets its own copy).
+        time_limited: Whether the solver also accepts time_limit, the seconds it may run before returning
+            the best set it found with finished set to False.
+
+    Raises:
+        ValueError: If the name is already registered.
+    """
+    if name in SOLVERS:
+        raise ValueError(f"A solver named {name} is already registered.")
+    SOLVERS[name] = solver
+    if time_limited:
+        TIME_LIMITED.add(name)
+
+def run_solver(name, graph, reduce=False, time_limit=None):
+    """
+    Runs a registered solver, giving it the time limit only if it accepts one.
+
+    Args:
+        name: The name of the solver.
+        graph: The graph, which the solver may modify.
+        reduce: The reduce argument of the solver.
+        time_limit: Seconds the solver may run, or None.
+
+    Returns:
+        A tuple (status, result), where status is "ok", or "best_found" for a set the solver could not
+        complete within time_limit, and result is the dominating set.
+    """
+    return _call(SOLVERS[name], name in TIME_LIMITED, graph, reduce, time_limit)
+
+def _call(solver, time_limited, graph, reduce, time_limit):
+    """
+    Calls a solver function, see run_solver.
+
+    Args:
+        solver: A registered solver function.
+        time_limited: Whether the solver accepts time_limit.
+        graph: The graph, which the solver may modify.
+        reduce: The reduce argument of the solver.
+        time_limit: Seconds the solver may run, or None.
+
+    Returns:
+        A tuple (status, result) as returned by run_solver.
+    """
+    if time_limited:
+        result, finished = solver(graph, reduce=reduce, time_limit=time_limit)
+    else:
+        result, finished = solver(graph, reduce=reduce)
+    return ("ok" if finished else "best_found"), result
+
+class SharedGraph:
+    """
+    An immutable graph stored once in shared memory as the edge arrays it was parsed from.
+
+    Worker processes attach to the arrays by name without copying them through a pipe, and see
+    them read-only. Each solver builds its private NetworkX graph from the arrays with
+    parser.edges_to_graph, the same graph parser.read returns, so solvers that remove vertices
+    (as find_dominating_set does with isolated ones) never affect each other.
+    """
+
+    def __init__(self, rows, cols):
+        """
+        Copies the edge arrays into shared memory.
+
+        Args:
+            rows: 0-based first endpoint of every edge.
+            cols: 0-based second endpoint of every edge.
+        """
+        self.blocks = []
+        self.layout = []
+        try:
+            for array in (rows, cols):
+                array = np.asarray(array, dtype=np.int64)
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                self.blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                self.layout.append((block.name, array.shape, array.dtype.str))
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Releases the shared memory, once no worker is attached to it any more.
+        """
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def attach(layout):
+    """
+    Attaches to the edge arrays of a SharedGraph.
+
+    Args:
+        layout: The layout attribute of the SharedGraph, a list of (name, shape, dtype) tuples.
+
+    Returns:
+        A tuple (blocks, rows, cols) with the shared memory blocks, to close once done, and the read-only edge arrays.
+    """
+    blocks, arrays = [], []
+    for name, shape, dtype in layout:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays.append(array)
+    return blocks, arrays[0], arrays[1]
+
+class Comparison:
+    """
+    Runs several registered solvers at the same time, each one in its own process, on a SharedGraph.
+
+    All of them share one wall-clock budget: the solvers accepting a time limit get the remaining
+    budget, and the processes still running at the deadline are killed.
+    """
+
+    def __init__(self, shared, solvers, reduce=False, budget=None):
+        """
+        Prepares the comparison.
+
+        Args:
+            shared: A SharedGraph.
+            solvers: Names of registered solvers.
+            reduce: The reduce argument of the solvers, False or the result of reduction.reduce_graph
+                of the graph (pickled to every process).
+            budget: Wall-clock limit in seconds for all the solvers, or None.
+
+        Raises:
+            ValueError: If a solver is not registered.
+        """
+        unknown = [name for name in solvers if name not in SOLVERS]
+        if unknown:
+            raise ValueError(f"Unknown solvers: {', '.join(unknown)}")
+        self.shared = shared
+        self.solvers = list(solvers)
+        self.reduce = reduce
+        self.budget = budget
+        self.running = {}
+        self.deadline = None
+
+    def start(self):
+        """
+        Starts one process per solver and returns immediately.
+        """
+        self.deadline = None if self.budget is None else time.time() + self.budget
+        for name in self.solvers:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_run_solver, args=(SOLVERS[name], name in TIME_LIMITED, self.shared.layout, self.reduce, self.deadline, sender))
+            process.start()
+            sender.close()
+            self.running[receiver] = (process, name)
+
+    def results(self):
+        """
+        Waits for the solvers.
+
+        Yields:
+            A tuple (name, status, result, elapsed) for every solver as soon as it is finished, where status is
+            "ok", "best_found" (the best set of a solver stopped by its time limit, see run_solver), "error" or
+            "timeout", result is the dominating set (the error message on error, None on timeout) and elapsed
+            is the time in milliseconds the solver ran in its process.
+        """
+        try:
+            while self.running:
+                wait = None if self.deadline is None else max(0.0, self.deadline - time.time())
+                for receiver in multiprocessing.connection.wait(list(self.running), timeout=wait):
+                    process, name = self.running.pop(receiver)
+                    try:
+                        status, result, elapsed = receiver.recv()
+                    except EOFError:
+                        status, result, elapsed = "error", f"worker exited with code {process.exitcode}", None
+                    receiver.close()
+                    process.join()
+                    yield name, status, result, elapsed
+
+                if self.deadline is not None and time.time() >= self.deadline:
+                    for receiver, (_, name) in list(self.running.items()):
+                        self._stop(receiver)
+                        yield name, "timeout", None, (self.budget * 1000.0)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Kills the solvers that are still running.
+        """
+        for receiver in list(self.running):
+            self._stop(receiver)
+
+    def _stop(self, receiver):
+        """
+        Kills the process of one solver.
+
+        Args:
+            receiver: The receiving end of the pipe of the solver.
+        """
+        process, _ = self.running.pop(receiver)
+        process.kill()
+        process.join()
+        receiver.close()
+
+def _run_solver(solver, time_limited, layout, reduce, deadline, connection):
+    """
+    Runs one solver in a worker process and sends back its result.
+
+    Args:
+        solver: A registered solver function.
+        time_limited: Whether the solver accepts time_limit.
+        layout: The layout of the SharedGraph.
+        reduce: The reduce argument of the solver.
+        deadline: The time.time() at which the comparison is stopped, or None.
+        connection: The sending end of a pipe to the parent process.
+    """
+    blocks = []
+    try:
+        blocks, rows, cols = attach(layout)
+        graph = parser.edges_to_graph(rows, cols)
+        time_limit = None if deadline is None else max(0.0, deadline - time.time()) * DEADLINE_SHARE
+        started = time.time()
+        status, result = _call(solver, time_limited, graph, reduce, time_limit)
+        message = (status, result, (time.time() - started) * 1000.0)
+    except Exception as error:
+        message = ("error", str(error), None)
+    finally:
+        for block in blocks:
+            block.close()
+    connection.send(message)
+    connection.close()
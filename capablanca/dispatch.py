@@ -0,0 +1,226 @@
+import itertools
+import numpy as np
+from . import chordal
+from . import exact
+from . import instrumentation
+
+# Components with at most this many vertices are answered from a table of minimum dominating sets, which
+# takes a few milliseconds to build for 6 vertices and about two hundred for 7
+TINY_COMPONENT_SIZE = 6
+
+# Components with at most this many vertices are solved by the branch and bound of exact
+SMALL_COMPONENT_SIZE = 24
+
+# Search nodes given to the branch and bound of one small component before the 2-approximation is kept
+EXACT_NODE_LIMIT = 1000
+
+# Strategies of solve_component, each one counted by instrumentation.Stats as "<strategy>_components"
+STRATEGIES = ("lookup", "exact", "chordal")
+
+# Tables of minimum dominating sets built by optimal_table, by number of vertices
+_tables = {}
+
+def strategy(size, dominated=False):
+    """
+    Chooses how a connected component is solved from its number of vertices.
+
+    Args:
+        size: The number of vertices of the component.
+        dominated: Whether some vertices of the component need no dominator, which the table does not cover.
+
+    Returns:
+        "lookup" for a tiny component, "exact" for a small one and "chordal" for the 2-approximation.
+    """
+    if size <= TINY_COMPONENT_SIZE and not dominated:
+        return "lookup"
+    if size <= SMALL_COMPONENT_SIZE:
+        return "exact"
+    return "chordal"
+
+def optimal_table(size):
+    """
+    Gets the table of minimum dominating sets of every graph on a number of vertices, built on first use.
+
+    A graph on the vertices 0, ..., size - 1 is indexed by its adjacency bitmask, where the edge
+    {i, j} with i < j is the bit j (j - 1) / 2 + i, so every labelling of a graph has its own entry
+    and no canonical form has to be computed. The entry is the bitmask of the first minimum
+    dominating set in order of size and then of bitmask. The table of 6 vertices has 2^15 entries
+    (32 KiB) and takes a few milliseconds to build.
+
+    Args:
+        size: The number of vertices, at most TINY_COMPONENT_SIZE.
+
+    Returns:
+        A uint8 array with 2^(size (size - 1) / 2) entries.
+    """
+    table = _tables.get(size)
+    if table is not None:
+        return table
+
+    # Row v holds the closed neighborhood bitset of v in every graph: the bit p of the graph index is
+    # set in the second half of every run of 2^(p + 1) graphs, so each edge is a strided OR in place
+    edges = size * (size - 1) // 2
+    closed = np.zeros((size, 1 << edges), dtype=np.uint8)
+    for j in range(size):
+        closed[j] |= np.uint8(1 << j)
+        for i in range(j):
+            bit = j * (j - 1) // 2 + i
+            closed[i].reshape(-1, 2, 1 << bit)[:, 1] |= np.uint8(1 << j)
+            closed[j].reshape(-1, 2, 1 << bit)[:, 1] |= np.uint8(1 << i)
+
+    # The sets are tried by increasing size, only on the graphs without a smaller dominating set
+    everything = (1 << size) - 1
+    table = np.zeros(1 << edges, dtype=np.uint8)
+    remaining = np.arange(1 << edges)
+    for k in range(1, size + 1):
+        if not len(remaining):
+            break
+        level = np.zeros(len(remaining), dtype=np.uint8)
+        # Earlier sets overwrite later ones, so the first one in order is kept
+        for subset in reversed(list(itertools.combinations(range(size), k))):
+            cover = closed[subset[0]].copy()
+            for v in subset[1:]:
+                cover |= closed[v]
+            level[cover == everything] = sum(1 << v for v in subset)
+        found = level != 0
+        table[remaining[found]] = level[found]
+        remaining = remaining[~found]
+        closed = closed[:, ~found]
+
+    _tables[size] = table
+    return table
+
+def solve_component(G, dominated=None, stats=None):
+    """
+    Solves a connected component with the strategy chosen by its size.
+
+    Args:
+        G: A connected NetworkX graph (or subgraph view), as given to chordal.approximate_dominating_set_split
+        dominated: A set of vertices that need no dominator (none by default)
+        stats: An instrumentation.Stats object receiving the "<strategy>_components" counters and the phases
+            and counters of chordal.approximate_dominating_set_split (none by default)
+
+    Returns:
+        A set of vertices of G dominating its other vertices: a minimum one for tiny and small components
+        (unless the search reaches EXACT_NODE_LIMIT), a 2-approximate one otherwise
+    """
+    stats = stats or instrumentation.DISABLED
+    nodes = list(G.nodes())
+    marked = bool(dominated) and any(v in dominated for v in nodes)
+    chosen = strategy(len(nodes), marked)
+    stats.count(f"{chosen}_components")
+    if chosen == "chordal":
+        return chordal.approximate_dominating_set_split(G, dominated, stats)
+
+    index = {v: i for i, v in enumerate(nodes)}
+    closed = [1 << i for i in range(len(nodes))]
+    for i, v in enumerate(nodes):
+        for u in G.neighbors(v):
+            closed[i] |= 1 << index[u]
+    undominated = sum(1 << i for i, v in enumerate(nodes) if not marked or v not in dominated)
+    result = _solve_bitsets(closed, undominated, chosen, lambda: {index[v] for v in chordal.approximate_dominating_set_split(G, dominated, stats)})
+    return {nodes[i] for i in result}
+
+def solve_component_csr(indptr, indices, component, dominated=None, stats=None):
+    """
+    Solves a connected component stored in CSR arrays with the strategy chosen by its size.
+
+    Args:
+        indptr: CSR row pointers of the whole graph, an integer array of length n + 1
+        indices: CSR column indices of the whole graph, in the order the neighbors were added
+        component: The vertex indices of the component in the order used to build its chordal graph
+        dominated: A boolean array over all vertices marking the ones that need no dominator (none by default)
+        stats: An instrumentation.Stats object receiving the "<strategy>_components" counters and the phases
+            and counters of chordal.approximate_dominating_set_split_csr (none by default)
+
+    Returns:
+        A set of vertex indices of the component, as for solve_component
+    """
+    stats = stats or instrumentation.DISABLED
+    component = np.asarray(component, dtype=np.int64)
+    marked = dominated is not None and bool(dominated[component].any())
+    chosen = strategy(len(component), marked)
+    stats.count(f"{chosen}_components")
+    if chosen == "chordal":
+        return chordal.approximate_dominating_set_split_csr(indptr, indices, component, dominated, stats)
+
+    nodes = component.tolist()
+    index = {v: i for i, v in enumerate(nodes)}
+    closed = [1 << i for i in range(len(nodes))]
+    for i, v in enumerate(nodes):
+        for u in indices[indptr[v]:indptr[v + 1]].tolist():
+            closed[i] |= 1 << index[u]
+    undominated = sum(1 << i for i, v in enumerate(nodes) if not marked or not dominated[v])
+    result = _solve_bitsets(closed, undominated, chosen, lambda: {index[v] for v in chordal.approximate_dominating_set_split_csr(indptr, indices, component, dominated, stats)})
+    return {nodes[i] for i in result}
+
+def solve_tiny_blocks(indptr, indices, starts, ends):
+    """
+    Looks up minimum dominating sets of many tiny components of a block-diagonal CSR adjacency at once.
+
+    Args:
+        indptr: CSR row pointers of the block-diagonal graph
+        indices: CSR column indices of the block-diagonal graph
+        starts: The first vertex of every tiny component, an integer array
+        ends: The vertex after the last one of every tiny component, at most TINY_COMPONENT_SIZE further
+
+    Returns:
+        An integer array with the vertices of the minimum dominating sets of all those components
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    sizes = np.asarray(ends, dtype=np.int64) - starts
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+
+    # The adjacency bitmask of every component, from the entries (u, v) with u < v in local numbers
+    vertices = np.repeat(starts, sizes) + np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    block = np.repeat(np.arange(len(starts)), sizes)
+    degree = indptr[vertices + 1] - indptr[vertices]
+    owner = np.repeat(block, degree)
+    low = np.repeat(vertices, degree) - starts[owner]
+    high = indices[chordal._row_positions(indptr, vertices, degree)] - starts[owner]
+    edge = low < high
+    masks = np.zeros(len(starts), dtype=np.int64)
+    np.bitwise_or.at(masks, owner[edge], np.left_shift(1, high[edge] * (high[edge] - 1) // 2 + low[edge]))
+
+    subsets = np.zeros(len(starts), dtype=np.int64)
+    for size in np.unique(sizes).tolist():
+        same = sizes == size
+        subsets[same] = optimal_table(size)[masks[same]]
+    # Bit b of the set of a component is its vertex start + b
+    bits = np.arange(TINY_COMPONENT_SIZE)
+    chosen = (subsets[:, None] >> bits) & 1
+    rows, columns = np.nonzero(chosen)
+    return starts[rows] + columns
+
+def _solve_bitsets(closed, undominated, chosen, approximate):
+    """
+    Solves a tiny or small component given by its closed neighborhood bitsets.
+
+    Args:
+        closed: The closed neighborhood bitset of every vertex of the component.
+        undominated: The bitset of the vertices that need a dominator.
+        chosen: "lookup" or "exact".
+        approximate: A function returning the 2-approximate set of the component as local vertex positions,
+            kept when the search reaches EXACT_NODE_LIMIT and it is smaller than the best set found.
+
+    Returns:
+        A collection of local vertex positions forming a dominating set of the component.
+    """
+    size = len(closed)
+    if chosen == "lookup":
+        mask = 0
+        for j in range(size):
+            for i in range(j):
+                if closed[j] >> i & 1:
+                    mask |= 1 << (j * (j - 1) // 2 + i)
+        subset = int(optimal_table(size)[mask])
+        return [i for i in range(size) if subset >> i & 1]
+
+    search = exact._Search(EXACT_NODE_LIMIT, None)
+    best = search.run(closed, undominated)
+    if search.stopped:
+        approximation = approximate()
+        if len(approximation) <= len(best):
+            return approximation
+    return best
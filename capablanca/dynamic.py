@@ -0,0 +1,183 @@
+import networkx as nx
+from . import algorithm
+
+class DynamicDominatingSet:
+    """
+    A dominating set maintained under batches of edge and vertex insertions and deletions.
+
+    The solution is seeded with find_dominating_set. Every vertex keeps the number of its dominators,
+    the vertices of the solution in its closed neighborhood, so an update only looks at the
+    neighborhoods it touches: every undominated vertex is dominated again with the greedy rule of the
+    chordal solver (the vertex of N[v] covering the most undominated vertices, the neighbors of v in
+    adjacency order and v itself last, the first maximum wins), and the vertices of the solution
+    around the changes whose closed neighborhoods are dominated twice are removed. When the solution
+    grows beyond threshold times its size after the last full computation, it is computed again.
+    """
+
+    def __init__(self, graph=None, threshold=1.25):
+        """
+        Initializes the dominating set of a graph.
+
+        Args:
+            graph (nx.Graph, optional): The initial graph, which is copied. Defaults to an empty graph.
+            threshold (float, optional): Growth factor of the solution that triggers a full recomputation,
+                or None to only recompute on demand. Defaults to 1.25.
+        """
+        self.graph = nx.Graph() if graph is None else nx.Graph(graph)
+        self.graph.remove_edges_from(list(nx.selfloop_edges(self.graph)))
+        self.threshold = threshold
+        self.recomputations = 0
+        self.recompute()
+
+    def recompute(self):
+        """
+        Computes the dominating set of the whole graph again with find_dominating_set.
+
+        Returns:
+            set: The dominating set.
+        """
+        # find_dominating_set returns an empty set for graphs without edges and removes isolated vertices
+        self.dominating_set = algorithm.find_dominating_set(self.graph.copy()) | set(nx.isolates(self.graph))
+        self.dominators = dict.fromkeys(self.graph, 0)
+        for u in self.dominating_set:
+            self._count(u, 1)
+        self.baseline = len(self.dominating_set)
+        self.recomputations += 1
+        return self.dominating_set
+
+    def update(self, add_edges=(), remove_edges=(), add_nodes=(), remove_nodes=()):
+        """
+        Applies a batch of changes and repairs the dominating set around them.
+
+        The deletions are applied before the insertions. Missing vertices and edges are ignored on
+        deletion, and the endpoints of inserted edges are added to the graph if needed.
+
+        Args:
+            add_edges: Edges (u, v) to insert (self loops are ignored).
+            remove_edges: Edges (u, v) to delete.
+            add_nodes: Vertices to insert.
+            remove_nodes: Vertices to delete with their edges.
+
+        Returns:
+            set: The dominating set.
+        """
+        # Vertices that may be undominated, and vertices whose number of dominators increased
+        affected, increased = {}, {}
+
+        for u, v in remove_edges:
+            if self.graph.has_edge(u, v) and u != v:
+                self.graph.remove_edge(u, v)
+                for x, y in ((u, v), (v, u)):
+                    if x in self.dominating_set:
+                        self.dominators[y] -= 1
+                    affected[y] = None
+
+        for v in remove_nodes:
+            if v in self.graph:
+                if v in self.dominating_set:
+                    self._count(v, -1)
+                    self.dominating_set.discard(v)
+                for u in self.graph.adj[v]:
+                    affected[u] = None
+                self.graph.remove_node(v)
+                del self.dominators[v]
+                affected.pop(v, None)
+
+        for v in add_nodes:
+            self._add_node(v, affected)
+
+        for u, v in add_edges:
+            if u == v or self.graph.has_edge(u, v):
+                continue
+            self._add_node(u, affected)
+            self._add_node(v, affected)
+            self.graph.add_edge(u, v)
+            for x, y in ((u, v), (v, u)):
+                if x in self.dominating_set:
+                    self.dominators[y] += 1
+                    increased[y] = None
+                affected[y] = None
+
+        # Dominate again the undominated vertices around the changes
+        for v in affected:
+            if v in self.graph and self.dominators[v] == 0:
+                candidates = [*self.graph.adj[v], v]
+                best = max(candidates, key=self._coverage)
+                self.dominating_set.add(best)
+                increased.update(dict.fromkeys(self._count(best, 1)))
+
+        # Remove the vertices of the solution that are no longer needed near the changes
+        for x in list(increased):
+            for u in [*self.graph.adj[x], x] if x in self.graph else ():
+                if u in self.dominating_set and all(self.dominators[w] >= 2 for w in [*self.graph.adj[u], u]):
+                    self.dominating_set.discard(u)
+                    self._count(u, -1)
+
+        if self.threshold is not None and len(self.dominating_set) > self.threshold * max(self.baseline, 1):
+            self.recompute()
+        return self.dominating_set
+
+    def add_edge(self, u, v):
+        """
+        Inserts an edge, see update.
+        """
+        return self.update(add_edges=[(u, v)])
+
+    def remove_edge(self, u, v):
+        """
+        Deletes an edge, see update.
+        """
+        return self.update(remove_edges=[(u, v)])
+
+    def add_node(self, v):
+        """
+        Inserts a vertex, see update.
+        """
+        return self.update(add_nodes=[v])
+
+    def remove_node(self, v):
+        """
+        Deletes a vertex with its edges, see update.
+        """
+        return self.update(remove_nodes=[v])
+
+    def _add_node(self, v, affected):
+        """
+        Inserts a vertex if it is not in the graph yet.
+
+        Args:
+            v: A vertex.
+            affected: The dictionary of vertices to repair, which receives v if it is new.
+        """
+        if v not in self.graph:
+            self.graph.add_node(v)
+            self.dominators[v] = 0
+            affected[v] = None
+
+    def _coverage(self, u):
+        """
+        Counts the undominated vertices of N[u].
+
+        Args:
+            u: A vertex of the graph.
+
+        Returns:
+            int: The number of undominated vertices dominated by u.
+        """
+        return sum(1 for w in self.graph.adj[u] if self.dominators[w] == 0) + (self.dominators[u] == 0)
+
+    def _count(self, u, delta):
+        """
+        Adds delta to the number of dominators of every vertex of N[u].
+
+        Args:
+            u: A vertex of the graph.
+            delta: 1 when u joins the solution, -1 when it leaves it.
+
+        Returns:
+            list: The vertices of N[u].
+        """
+        neighborhood = [*self.graph.adj[u], u]
+        for w in neighborhood:
+            self.dominators[w] += delta
+        return neighborhood
@@ -0,0 +1,193 @@
+import math
+import time
+import networkx as nx
+from . import validate
+
+def find_dominating_set_exact(graph, upper_bound=None, node_limit=None, time_limit=None, dominated=None):
+    """
+    Computes a minimum dominating set by branch and bound over bitsets.
+
+    Closed neighborhoods are stored as integer bitsets. Every search node branches on the
+    undominated vertex with the fewest vertices left that can dominate it, trying first the
+    candidates that dominate the most undominated vertices; the candidates of earlier branches are
+    excluded from later ones. A node is pruned when the size of the partial solution plus a lower
+    bound reaches the best solution found: every undominated vertex is charged one over the largest
+    number of undominated vertices dominated by one of its dominators. Connected components are
+    solved independently.
+
+    Args:
+        graph: A NetworkX Graph.
+        upper_bound: A dominating set of graph used as the initial best solution (none by default).
+        node_limit: Maximum number of search nodes over all components (unlimited by default).
+        time_limit: Maximum time in seconds (unlimited by default).
+        dominated: Vertices that need no dominator, such as the ones of a reduced kernel (none by default).
+
+    Returns:
+        A tuple (dominating_set, optimal) with the best dominating set found and whether it is proven
+        minimum, or (None, True) if the graph is empty or has no edges.
+
+    Raises:
+        ValueError: If upper_bound is not a dominating set of graph.
+    """
+    if graph.number_of_nodes() == 0 or graph.number_of_edges() == 0:
+        return None, True
+    if upper_bound is not None and not validate.is_dominating_set(graph, upper_bound, dominated):
+        raise ValueError("The upper bound is not a dominating set of the graph.")
+
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    search = _Search(node_limit, deadline)
+    dominated = set() if dominated is None else dominated
+    dominating_set = set()
+
+    for component in nx.connected_components(graph):
+        nodes = list(component)
+        index = {v: i for i, v in enumerate(nodes)}
+        closed = [1 << i for i in range(len(nodes))]
+        for i, v in enumerate(nodes):
+            for u in graph.neighbors(v):
+                closed[i] |= 1 << index[u]
+
+        undominated = sum(1 << i for i, v in enumerate(nodes) if v not in dominated)
+
+        best = None if upper_bound is None else [index[v] for v in component if v in upper_bound]
+        dominating_set.update(nodes[i] for i in search.run(closed, undominated, best))
+
+    return dominating_set, not search.stopped
+
+class _Search:
+    """
+    Branch and bound state shared by the components of a graph (search limits and counters).
+    """
+
+    def __init__(self, node_limit, deadline):
+        """
+        Initializes the search limits.
+
+        Args:
+            node_limit: Maximum number of search nodes, or None.
+            deadline: time.monotonic() value at which the search stops, or None.
+        """
+        self.node_limit = node_limit
+        self.deadline = deadline
+        self.nodes = 0
+        self.stopped = False
+
+    def run(self, closed, undominated, best=None):
+        """
+        Searches a minimum dominating set of one connected component.
+
+        Args:
+            closed: The closed neighborhood bitset of every vertex of the component.
+            undominated: The bitset of the vertices that need a dominator.
+            best: A dominating set of the component as a list of vertex indices, or None.
+
+        Returns:
+            The smallest dominating set found as a list of vertex indices.
+        """
+        size = len(closed)
+        if best is None:
+            best = list(range(size))
+        self.best = best
+        path = []
+        everything = (1 << size) - 1
+        root = self._expand(closed, undominated, everything, path)
+        stack = [] if root is None else [root]
+
+        while stack and not self.stopped:
+            frame = stack[-1]
+            undominated, allowed, candidates, position, chosen = frame
+            if position == len(candidates):
+                stack.pop()
+                if chosen is not None:
+                    path.pop()
+                continue
+            frame[3] += 1
+
+            # Candidates of earlier branches are excluded from this one
+            candidate = candidates[position]
+            for earlier in candidates[:position + 1]:
+                allowed &= ~(1 << earlier)
+            path.append(candidate)
+            child = self._expand(closed, undominated & ~closed[candidate], allowed, path)
+            if child is None:
+                path.pop()
+            else:
+                child[4] = candidate
+                stack.append(child)
+
+        return self.best
+
+    def _expand(self, closed, undominated, allowed, path):
+        """
+        Evaluates a search node.
+
+        Args:
+            closed: The closed neighborhood bitsets.
+            undominated: The bitset of undominated vertices.
+            allowed: The bitset of vertices that may still be added.
+            path: The vertices added so far.
+
+        Returns:
+            A frame [undominated, allowed, candidates, 0, None] to branch on, or None if the node is a
+            solution or is pruned.
+        """
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            self.stopped = True
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            # Checked at every node: a node costs O(n) bitset operations, far more than reading the clock
+            self.stopped = True
+        if self.stopped:
+            return None
+
+        if undominated == 0:
+            if len(path) < len(self.best):
+                self.best = list(path)
+            return None
+
+        # Lower bound: every undominated vertex u is charged 1 / (the largest coverage of a vertex
+        # dominating u), so that every added vertex is charged at most 1 in total
+        coverage = {}
+        bits = allowed
+        while bits:
+            low = bits & -bits
+            vertex = low.bit_length() - 1
+            covered = (closed[vertex] & undominated).bit_count()
+            if covered:
+                coverage[vertex] = covered
+            bits ^= low
+        # The weaker bound ceil(undominated / largest coverage) is checked first as it is cheaper
+        if not coverage or len(path) + -(-undominated.bit_count() // max(coverage.values())) >= len(self.best):
+            return None
+        charge = 0.0
+        branch_vertex, fewest = -1, None
+        bits = undominated
+        while bits:
+            low = bits & -bits
+            vertex = low.bit_length() - 1
+            dominators = closed[vertex] & allowed
+            if dominators == 0:
+                return None
+            # Branch on the undominated vertex with the fewest allowed dominators
+            count = dominators.bit_count()
+            if fewest is None or count < fewest:
+                branch_vertex, fewest = vertex, count
+            largest = 0
+            while dominators:
+                dominator = dominators & -dominators
+                largest = max(largest, coverage[dominator.bit_length() - 1])
+                dominators ^= dominator
+            charge += 1.0 / largest
+            bits ^= low
+        if len(path) + math.ceil(charge - 1e-9) >= len(self.best):
+            return None
+
+        candidates = []
+        bits = closed[branch_vertex] & allowed
+        while bits:
+            low = bits & -bits
+            candidates.append(low.bit_length() - 1)
+            bits ^= low
+        candidates.sort(key=lambda c: (closed[c] & undominated).bit_count(), reverse=True)
+
+        return [undominated, allowed, candidates, 0, None]
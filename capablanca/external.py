@@ -0,0 +1,571 @@
+import bz2
+import lzma
+import os
+import tempfile
+import numpy as np
+from . import parser
+from . import utils
+
+# Memory given to the out-of-core solver when no limit is set
+DEFAULT_MEMORY_LIMIT = 1 << 30
+
+# Smallest memory limit accepted, below which the bounded buffers become too small to make progress
+MIN_MEMORY_LIMIT = 1 << 24
+
+# Bytes per edge of a NetworkX graph while find_dominating_set solves it, measured on random graphs
+GRAPH_BYTES_PER_EDGE = 640
+
+# Vertex ids are packed by pairs into 64-bit sort keys
+MAX_VERTICES = 1 << 32
+
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(text):
+    """
+    Parses a memory size such as 512M or 4G (binary units, an optional trailing B).
+
+    Args:
+        text: The size as a number of bytes with an optional K, M, G or T suffix.
+
+    Returns:
+        The size in bytes.
+
+    Raises:
+        ValueError: If the text is not a size.
+    """
+    value = text.strip().upper()
+    if value.endswith("B"):
+        value = value[:-1]
+    unit = value[-1:] if value[-1:] in UNITS else ""
+    try:
+        number = float(value[:len(value) - len(unit)])
+    except ValueError:
+        raise ValueError(f"Not a memory size: {text}") from None
+    if number <= 0:
+        raise ValueError(f"Not a memory size: {text}")
+    return int(number * UNITS[unit])
+
+class OutOfCoreGraph:
+    """
+    A graph kept on disk, for inputs whose NetworkX graph does not fit in memory.
+
+    The edges are streamed from the input file and sorted externally: both directions of every edge
+    are packed into 64-bit keys, sorted in runs that fit in the memory limit, and the runs are
+    merged into a CSR adjacency stored in memory-mapped files. The connected components
+    are found by a union-find whose parent array is memory-mapped as well, and solve() runs
+    algorithm.find_dominating_set on batches of whole components that fit in the memory limit, which
+    gives the same 2-approximation guarantee as solving the whole graph, as it is solved per component.
+
+    The memory limit bounds the arrays of this class. The interpreter and the modules it loads come
+    on top of it, and a component with more edges than the limit allows is still solved in memory on
+    its own (counted in statistics["oversized"]). A repeated edge of a DIMACS file is rejected with
+    its line number, as parser.read does, while those of a .npy file are merged.
+    """
+
+    def __init__(self, memory_limit=DEFAULT_MEMORY_LIMIT, directory=None):
+        """
+        Creates the working directory of the graph.
+
+        Args:
+            memory_limit: Bytes of memory the arrays may use.
+            directory: Directory receiving the temporary files (the system default by default).
+
+        Raises:
+            ValueError: If the memory limit is below MIN_MEMORY_LIMIT.
+        """
+        if memory_limit < MIN_MEMORY_LIMIT:
+            raise ValueError(f"The memory limit must be at least {MIN_MEMORY_LIMIT} bytes.")
+        self.memory_limit = memory_limit
+        self.workspace = tempfile.TemporaryDirectory(prefix="capablanca-", dir=directory)
+        # Sizes of the bounded buffers, in bytes of input text and in numbers of 64-bit keys or edges
+        self.block_size = min(parser.BLOCK_SIZE, memory_limit // 64)
+        self.run_keys = memory_limit // 64
+        self.merge_keys = memory_limit // 128
+        self.scan_step = memory_limit // 256
+        self.batch_edges = memory_limit // (3 * GRAPH_BYTES_PER_EDGE)
+        self.size = 0
+        # The number of the first line of the input not in the DIMACS format, which is read up to it
+        self.bad_line = None
+        self.vertices = 0
+        self.edges = 0
+        self.indptr = None
+        self.indices = None
+        self.statistics = {"runs": 0, "components": 0, "largest_component": 0, "batches": 0, "oversized": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the arrays and removes the working directory.
+        """
+        self.indptr = self.indices = None
+        self.workspace.cleanup()
+
+    def read(self, filepath):
+        """
+        Builds the CSR adjacency of a DIMACS file, which may be compressed with xz/lzma or bz2/bzip2,
+        or of a binary .npy edge file, holding a bounded part of it in memory at a time.
+
+        Args:
+            filepath: The path to the file.
+
+        Raises:
+            FileNotFoundError: If the file is not found.
+            ValueError: If the input is not in the correct format, repeats an edge (the earliest line is
+                reported) or has a vertex number of MAX_VERTICES or more.
+        """
+        runs = self._write_runs(self._edge_keys(filepath), "edges")
+        self.statistics["runs"] = len(runs)
+        self.indptr = np.memmap(self._path("indptr"), dtype=np.int64, mode="w+", shape=(self.size + 1,))
+
+        loops = 0
+        entries = 0
+        last = -1
+        previous = None
+        repeated = 0
+        with open(self._path("indices"), "wb") as f, open(self._path("repeated"), "wb") as r:
+            for keys in self._merge_runs(runs):
+                # A key equal to the one before it is a repeated edge, which may go on from the previous chunk
+                distinct = np.ones(len(keys), dtype=bool)
+                distinct[1:] = keys[1:] != keys[:-1]
+                distinct[0] = keys[0] != previous
+                previous = keys[-1]
+                if not distinct.all():
+                    # Both directions of an edge are repeated, the one from its smaller endpoint names it
+                    twins = keys[~distinct]
+                    twins = np.unique(twins[(twins >> np.uint64(32)) <= (twins & np.uint64(0xFFFFFFFF))])
+                    r.write(twins.tobytes())
+                    repeated += len(twins)
+                    keys = keys[distinct]
+                sources = (keys >> np.uint64(32)).astype(np.int64)
+                targets = (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+                f.write(targets.tobytes())
+                # The keys are sorted by source, a vertex may only continue from the previous chunk
+                vertex, degree = np.unique(sources, return_counts=True)
+                self.indptr[vertex + 1] += degree
+                self.vertices += len(vertex) - int(vertex[0] == last)
+                last = int(vertex[-1])
+                loops += int(np.count_nonzero(sources == targets))
+                entries += len(keys)
+
+        carry = 0
+        for start in range(0, self.size + 1, self.run_keys):
+            segment = self.indptr[start:start + self.run_keys]
+            np.cumsum(segment, out=segment)
+            segment += carry
+            carry = int(segment[-1])
+        self.indptr.flush()
+        if repeated and utils.get_extension_without_dot(filepath) != 'npy':
+            line = self._repeated_line(filepath)
+            raise ValueError(f"The input file contains a repeated edge at line {line}")
+        if self.bad_line is not None:
+            raise ValueError(f"The input file is not in the correct DIMACS format at line {self.bad_line}")
+        os.remove(self._path("repeated"))
+        self.indices = np.memmap(self._path("indices"), dtype=np.uint32, mode="r") if entries else np.zeros(0, dtype=np.uint32)
+        # A self-loop has a single entry, every other edge one per direction
+        self.edges = (entries - loops) // 2 + loops
+
+    def components(self):
+        """
+        Labels every vertex with the smallest vertex of its connected component.
+
+        The edges are merged a chunk at a time into a memory-mapped union-find, where every root is
+        the smallest vertex of its tree: the components of a chunk are found in memory among the
+        roots of its endpoints, and every root is hooked onto the smallest root of its component.
+
+        Returns:
+            A memory-mapped int64 array of length size with the label of every vertex id.
+        """
+        import scipy.sparse as sparse
+        from scipy.sparse.csgraph import connected_components
+
+        parent = np.memmap(self._path("parent"), dtype=np.int64, mode="w+", shape=(max(self.size, 1),))[:self.size]
+        step = self.scan_step
+        for start in range(0, self.size, step):
+            parent[start:start + step] = np.arange(start, min(start + step, self.size))
+
+        for sources, targets in self._edge_chunks(step):
+            keep = sources < targets
+            roots = np.concatenate((_find(parent, sources[keep]), _find(parent, targets[keep])))
+            nodes, local = np.unique(roots, return_inverse=True)
+            if not len(nodes):
+                continue
+            pairs = len(local) // 2
+            adjacency = sparse.coo_matrix((np.ones(pairs, dtype=np.int8), (local[:pairs], local[pairs:])), shape=(len(nodes), len(nodes)))
+            _, labels = connected_components(adjacency, directed=False)
+            # The nodes are sorted, so the first node of every label is its smallest root
+            smallest = np.full(len(nodes), -1, dtype=np.int64)
+            order = np.argsort(labels, kind="stable")
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = labels[order][1:] != labels[order][:-1]
+            smallest[labels[order][first]] = nodes[order][first]
+            parent[nodes] = smallest[labels]
+
+        for start in range(0, self.size, step):
+            _find(parent, np.arange(start, min(start + step, self.size)))
+        parent.flush()
+        return parent
+
+    def solve(self, workers=None):
+        """
+        Finds a 2-approximate Dominating Set, one batch of whole connected components at a time.
+
+        Args:
+            workers: Number of processes solving the components of a batch in parallel (sequential by default).
+
+        Returns:
+            A memory-mapped int64 array with the 0-based vertices of the set in increasing order, valid
+            until the graph is closed.
+        """
+        from . import algorithm
+
+        labels = self.components()
+
+        def batches(labels):
+            for vertices, components in self._component_batches(labels):
+                ends = np.append(np.flatnonzero(components[1:] != components[:-1]) + 1, len(components))
+                entries = np.add.reduceat(self.indptr[vertices + 1] - self.indptr[vertices], np.append(0, ends[:-1]))
+                largest = int(entries.max()) // 2
+                self.statistics["batches"] += 1
+                self.statistics["components"] += len(ends)
+                self.statistics["largest_component"] = max(self.statistics["largest_component"], largest)
+                self.statistics["oversized"] += int(np.count_nonzero(entries > 2 * self.batch_edges))
+                graph = self._subgraph(vertices)
+                yield np.fromiter(algorithm.find_dominating_set(graph, workers=workers), dtype=np.uint64)
+
+        runs = self._write_runs(batches(labels), "solution", self.run_keys // 4)
+        total = 0
+        with open(self._path("solution"), "wb") as f:
+            for vertices in self._merge_runs(runs):
+                f.write(vertices.astype(np.int64).tobytes())
+                total += len(vertices)
+        del labels
+        os.remove(self._path("parent"))
+        return np.memmap(self._path("solution"), dtype=np.int64, mode="r") if total else np.zeros(0, dtype=np.int64)
+
+    def find_undominated(self, dominating_set):
+        """
+        Finds the vertices without a dominator, streaming the CSR adjacency a chunk at a time.
+
+        Args:
+            dominating_set: An integer array with the 0-based vertices of the set.
+
+        Returns:
+            An integer array with the undominated vertices, sorted increasingly.
+        """
+        members = np.memmap(self._path("members"), dtype=bool, mode="w+", shape=(max(self.size, 1),))[:self.size]
+        step = self.scan_step
+        for start in range(0, len(dominating_set), step):
+            members[np.asarray(dominating_set[start:start + step], dtype=np.int64)] = True
+
+        undominated = []
+        for begin, end in self._vertex_ranges(step):
+            degree = np.diff(self.indptr[begin:end + 1])
+            hits = members[self.indices[self.indptr[begin]:self.indptr[end]]]
+            dominators = np.bincount(np.repeat(np.arange(end - begin), degree), weights=hits, minlength=end - begin)
+            undominated.append(begin + np.flatnonzero((degree > 0) & (dominators == 0) & ~members[begin:end]))
+        del members
+        os.remove(self._path("members"))
+        return np.concatenate(undominated) if undominated else np.zeros(0, dtype=np.int64)
+
+    def _path(self, name):
+        return os.path.join(self.workspace.name, name)
+
+    def _edge_keys(self, filepath):
+        """
+        Streams the edges of a file as sort keys, both directions of every edge.
+
+        Args:
+            filepath: The path to the file.
+
+        Yields:
+            uint64 arrays of keys source << 32 | target, one per block of the file.
+
+        Raises:
+            ValueError: If the input is not in the correct format or has a vertex number of MAX_VERTICES or more.
+        """
+        for rows, cols, _ in self._edge_blocks(filepath):
+            if not len(rows):
+                continue
+            largest = int(max(rows.max(), cols.max()))
+            if largest >= MAX_VERTICES:
+                raise ValueError(f"The out-of-core mode supports vertex numbers up to {MAX_VERTICES}, found {largest + 1}")
+            self.size = max(self.size, largest + 1)
+            rows, cols = rows.astype(np.uint64), cols.astype(np.uint64)
+            # A self-loop has a single key, so that a repeated key is a repeated edge
+            loop = rows == cols
+            yield np.concatenate(((rows << np.uint64(32)) | cols, (cols[~loop] << np.uint64(32)) | rows[~loop]))
+
+    def _edge_blocks(self, filepath):
+        """
+        Reads the edges of a file a block at a time. The blocks of a DIMACS file stop at its first
+        line not in the correct format, whose number is kept in self.bad_line.
+
+        Args:
+            filepath: The path to the file.
+
+        Yields:
+            A tuple (rows, cols, lines) of integer arrays with the 0-based endpoints of the edges of
+            every block and their line numbers (None for a .npy file).
+
+        Raises:
+            FileNotFoundError: If the file is not found.
+            ValueError: If a .npy file does not hold an (m, 2) array of non-negative integers.
+        """
+        extension = utils.get_extension_without_dot(filepath)
+        if extension == 'npy':
+            edges = np.load(filepath, mmap_mode='r')
+            if edges.ndim != 2 or edges.shape[1] != 2 or not np.issubdtype(edges.dtype, np.integer):
+                raise ValueError("The input file is not an (m, 2) integer array of edges")
+            step = self.block_size // 16
+            for start in range(0, len(edges), step):
+                block = np.array(edges[start:start + step], dtype=np.int64)
+                if len(block) and block.min() < 0:
+                    raise ValueError("The input file contains a negative vertex number")
+                yield block[:, 0], block[:, 1], None
+            return
+
+        opener = lzma.open if extension in ('xz', 'lzma') else bz2.open if extension in ('bz2', 'bzip2') else open
+        try:
+            file = opener(filepath, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {filepath}") from None
+        with file:
+            for rows, cols, lines, bad_line, _ in parser.iter_edge_blocks(file, self.block_size):
+                self.bad_line = bad_line
+                yield rows, cols, lines
+
+    def _repeated_line(self, filepath):
+        """
+        Finds the earliest line repeating an edge, streaming the file again: only the edges found
+        repeated by read() are tracked.
+
+        Args:
+            filepath: The path to the DIMACS file.
+
+        Returns:
+            The line number of the first edge seen a second time, or None.
+        """
+        repeated = np.memmap(self._path("repeated"), dtype=np.uint64, mode="r")
+        seen = np.memmap(self._path("seen"), dtype=bool, mode="w+", shape=(len(repeated),))
+        for rows, cols, lines in self._edge_blocks(filepath):
+            low, high = np.minimum(rows, cols).astype(np.uint64), np.maximum(rows, cols).astype(np.uint64)
+            keys = (low << np.uint64(32)) | high
+            slots = np.minimum(np.searchsorted(repeated, keys), len(repeated) - 1)
+            hits = np.flatnonzero(repeated[slots] == keys)
+            slots = slots[hits]
+            # A tracked edge repeats if it was seen in an earlier block or earlier in this one
+            again = np.ones(len(slots), dtype=bool)
+            again[np.unique(slots, return_index=True)[1]] = False
+            again |= seen[slots]
+            if again.any():
+                return int(lines[hits[again]].min())
+            seen[slots] = True
+        return None
+
+    def _write_runs(self, chunks, name, run_keys=None):
+        """
+        Sorts a stream of keys into runs written to the working directory, the first phase of the
+        external sort.
+
+        Args:
+            chunks: An iterable of uint64 arrays.
+            name: The prefix of the run files.
+            run_keys: The number of keys sorted at once (self.run_keys by default).
+
+        Returns:
+            The paths of the runs, each one holding sorted uint64 keys.
+        """
+        run_keys = run_keys or self.run_keys
+        runs = []
+        pending = []
+        held = 0
+
+        def flush():
+            path = self._path(f"{name}-{len(runs)}")
+            np.sort(np.concatenate(pending)).tofile(path)
+            runs.append(path)
+
+        for chunk in chunks:
+            pending.append(chunk)
+            held += len(chunk)
+            if held >= run_keys:
+                flush()
+                pending, held = [], 0
+        if held:
+            flush()
+        return runs
+
+    def _merge_runs(self, runs):
+        """
+        Merges sorted runs, the second phase of the external sort, and removes them.
+
+        Every step reads a window of every run and emits all the keys up to the smallest last key of
+        the windows, so the keys come out in order, although a key repeated in a run may go on in the
+        next step.
+
+        Args:
+            runs: The paths of the runs written by _write_runs.
+
+        Yields:
+            Non-empty uint64 arrays of keys in non-decreasing order.
+        """
+        keys = [np.memmap(path, dtype=np.uint64, mode="r") for path in runs if os.path.getsize(path)]
+        window = max(self.merge_keys // max(len(keys), 1), 1 << 12)
+        positions = [0] * len(keys)
+        active = list(range(len(keys)))
+        while active:
+            windows = [keys[i][positions[i]:positions[i] + window] for i in active]
+            threshold = min(w[-1] for w in windows)
+            parts = []
+            for i, w in zip(active, windows, strict=True):
+                cut = int(np.searchsorted(w, threshold, side="right"))
+                parts.append(w[:cut])
+                positions[i] += cut
+            yield np.sort(np.concatenate(parts))
+            active = [i for i in active if positions[i] < len(keys[i])]
+        del keys, windows
+        for path in runs:
+            os.remove(path)
+
+    def _vertex_ranges(self, step):
+        """
+        Splits the vertex ids into ranges with at most step vertices and step CSR entries (unless a
+        single vertex has more).
+
+        Args:
+            step: The largest number of vertices and entries of a range.
+
+        Yields:
+            Tuples (begin, end) of consecutive ranges covering all the vertex ids.
+        """
+        begin = 0
+        while begin < self.size:
+            end = int(np.searchsorted(self.indptr, self.indptr[begin] + step, side="right")) - 1
+            end = min(max(end, begin + 1), begin + step, self.size)
+            yield begin, end
+            begin = end
+
+    def _edge_chunks(self, step):
+        """
+        Streams the CSR entries as (source, target) pairs.
+
+        Args:
+            step: The largest number of vertices and entries of a chunk.
+
+        Yields:
+            Tuples (sources, targets) of int64 arrays.
+        """
+        for begin, end in self._vertex_ranges(step):
+            degree = np.diff(self.indptr[begin:end + 1])
+            sources = np.repeat(np.arange(begin, end, dtype=np.int64), degree)
+            yield sources, self.indices[self.indptr[begin]:self.indptr[end]].astype(np.int64)
+
+    def _component_batches(self, labels):
+        """
+        Groups the vertices by connected component, with an external sort of (label, vertex) keys,
+        and cuts the components into batches of about batch_edges edges.
+
+        Args:
+            labels: The labels returned by components().
+
+        Yields:
+            Tuples (vertices, labels) of int64 arrays with the vertices of whole components, component
+            after component, and the label of every vertex.
+        """
+        step = self.scan_step
+
+        def keys():
+            for begin, end in self._vertex_ranges(step):
+                vertices = np.arange(begin, end, dtype=np.int64)
+                vertices = vertices[np.diff(self.indptr[begin:end + 1]) > 0]
+                yield (labels[vertices].astype(np.uint64) << np.uint64(32)) | vertices.astype(np.uint64)
+
+        held_vertices = np.zeros(0, dtype=np.int64)
+        held_labels = np.zeros(0, dtype=np.int64)
+        runs = self._write_runs(keys(), "components")
+        for chunk in self._merge_runs(runs):
+            held_vertices = np.concatenate((held_vertices, (chunk & np.uint64(0xFFFFFFFF)).astype(np.int64)))
+            held_labels = np.concatenate((held_labels, (chunk >> np.uint64(32)).astype(np.int64)))
+            # The last component may go on in the next chunk
+            cut = int(np.searchsorted(held_labels, held_labels[-1], side="left"))
+            batches, rest = self._cut_batches(held_vertices[:cut], held_labels[:cut])
+            yield from batches
+            held_vertices, held_labels = held_vertices[rest:], held_labels[rest:]
+
+        batches, rest = self._cut_batches(held_vertices, held_labels)
+        yield from batches
+        if rest < len(held_vertices):
+            yield held_vertices[rest:], held_labels[rest:]
+
+    def _cut_batches(self, vertices, labels):
+        """
+        Cuts whole components into batches of at least batch_edges edges, a component with more
+        edges being a batch on its own.
+
+        Args:
+            vertices: The vertices of whole components, component after component.
+            labels: The label of every vertex.
+
+        Returns:
+            A tuple (batches, rest) with the list of (vertices, labels) batches and the position of
+            the first vertex left out of them, as its components have fewer edges than a batch.
+        """
+        if not len(vertices):
+            return [], 0
+        ends = np.append(np.flatnonzero(labels[1:] != labels[:-1]) + 1, len(labels))
+        load = np.cumsum(self.indptr[vertices + 1] - self.indptr[vertices])[ends - 1]
+        batches = []
+        begin = 0
+        base = 0
+        while True:
+            # The first component closing a batch of at least 2 batch_edges CSR entries
+            j = int(np.searchsorted(load, base + 2 * self.batch_edges, side="left"))
+            if j >= len(ends):
+                return batches, begin
+            batches.append((vertices[begin:ends[j]], labels[begin:ends[j]]))
+            begin, base = int(ends[j]), int(load[j])
+
+    def _subgraph(self, vertices):
+        """
+        Builds the NetworkX graph induced by whole components.
+
+        Args:
+            vertices: The vertices of the components, sorted within each component.
+
+        Returns:
+            A NetworkX Graph with every edge of the components, each one added from its smaller endpoint.
+        """
+        starts = self.indptr[vertices]
+        degree = self.indptr[vertices + 1] - starts
+        sources = np.repeat(vertices, degree)
+        # The positions of the CSR entries of every vertex, one range per vertex
+        offsets = np.repeat(starts - np.cumsum(degree) + degree, degree) + np.arange(len(sources))
+        targets = self.indices[offsets].astype(np.int64)
+        keep = sources <= targets
+        return parser.edges_to_graph(sources[keep], targets[keep])
+
+def _find(parent, vertices):
+    """
+    Finds the roots of vertices in a union-find parent array and points the vertices straight at them.
+
+    Args:
+        parent: The parent array, where every root is its own parent.
+        vertices: An integer array of vertices.
+
+    Returns:
+        An int64 array with the root of every vertex.
+    """
+    roots = np.asarray(parent[vertices])
+    while True:
+        above = np.asarray(parent[roots])
+        moved = above != roots
+        if not moved.any():
+            break
+        roots = above
+    parent[vertices] = roots
+    return roots
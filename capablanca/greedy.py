@@ -0,0 +1,77 @@
+import heapq
+import numpy as np
+from . import chordal
+
+def greedy_dominating_set(G, dominated=None):
+    """
+    Find an approximate dominating set within a logarithmic factor with the classical greedy algorithm.
+
+    Args:
+        G: A NetworkX graph
+        dominated: A set of vertices that need no dominator, such as the ones of a reduced kernel (none by default)
+
+    Returns:
+        A set of vertices of G dominating all of its other vertices, at most H(Δ + 1) <= 1 + ln(n) times
+        larger than a minimum dominating set
+    """
+    nodes = list(G.nodes())
+    indptr, indices = chordal.graph_to_csr(G, nodes)
+    dominated = np.fromiter((v in dominated for v in nodes), dtype=bool, count=len(nodes)) if dominated else None
+
+    dominating_set = greedy_dominating_set_csr(indptr, indices, dominated)
+
+    return {nodes[i] for i in dominating_set}
+
+def greedy_dominating_set_csr(indptr, indices, dominated=None):
+    """
+    Find an approximate dominating set within a logarithmic factor in a graph stored in CSR arrays.
+
+    The vertex covering the most undominated vertices is selected until every vertex is dominated.
+    The coverage of every vertex only decreases, so a lazy priority queue is enough: an entry popped
+    with an outdated coverage is pushed back with the current one, and an entry whose coverage is up
+    to date is the maximum (ties go to the smallest vertex index). The coverage of the closed
+    neighborhoods is updated when vertices become dominated, as in the chordal greedy.
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1
+        indices: CSR column indices without self loops
+        dominated: A boolean array marking the vertices that need no dominator (none by default)
+
+    Returns:
+        A set of vertex indices forming a dominating set
+
+    Time Complexity: O((n + m) log n) where n is the number of vertices and m is the number of edges
+    """
+    closed_indptr, closed_indices = chordal.closed_neighborhood_csr(indptr, np.asarray(indices, dtype=np.int64))
+    n = len(closed_indptr) - 1
+    if dominated is None:
+        dominated = np.zeros(n, dtype=bool)
+        coverage = np.diff(closed_indptr)
+    else:
+        dominated = np.array(dominated, dtype=bool)
+        coverage = np.add.reduceat((~dominated[closed_indices]).astype(np.int64), closed_indptr[:-1]) if n else np.zeros(0, dtype=np.int64)
+
+    remaining = n - int(dominated.sum())
+    queue = [(-c, v) for v, c in enumerate(coverage.tolist()) if c]
+    heapq.heapify(queue)
+    dominating_set = set()
+
+    while remaining:
+        negative_coverage, v = heapq.heappop(queue)
+        current = int(coverage[v])
+        if current != -negative_coverage:
+            # Outdated entry, its coverage decreased since it was pushed
+            if current:
+                heapq.heappush(queue, (-current, v))
+            continue
+
+        dominating_set.add(v)
+        row = closed_indices[closed_indptr[v]:closed_indptr[v + 1]]
+        newly_dominated = row[~dominated[row]]
+        dominated[newly_dominated] = True
+        remaining -= len(newly_dominated)
+
+        # Every closed neighborhood containing a newly dominated vertex loses one undominated vertex
+        np.subtract.at(coverage, closed_indices[chordal._row_positions(closed_indptr, newly_dominated)], 1)
+
+    return dominating_set
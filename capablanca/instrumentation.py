@@ -0,0 +1,96 @@
+import contextlib
+import time
+
+class Stats:
+    """
+    Phase timings and work counters of a solver run.
+
+    The solvers accept a Stats object and fill it while they run: every phase adds its elapsed
+    time in nanoseconds, measured with time.perf_counter_ns, and every counter adds the work done
+    (components, CSR entries materialized, neighborhoods scanned, and so on). Phases and counters
+    accumulate, so one object can follow several runs.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Initializes empty timings and counters.
+        """
+        self.timings = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Measures a block of code as a phase.
+
+        Args:
+            name: The name of the phase.
+        """
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter_ns() - started
+
+    def count(self, name, amount=1):
+        """
+        Adds work to a counter.
+
+        Args:
+            name: The name of the counter.
+            amount: The work done.
+        """
+        self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+    def merge(self, other):
+        """
+        Adds the timings and counters of another run, such as the ones of a worker process.
+
+        Args:
+            other: A dictionary returned by as_dict.
+        """
+        for name, elapsed in other["timings_ns"].items():
+            self.timings[name] = self.timings.get(name, 0) + elapsed
+        for name, amount in other["counters"].items():
+            self.count(name, amount)
+
+    def as_dict(self):
+        """
+        Gets the timings and counters as plain dictionaries.
+
+        Returns:
+            A dictionary with the phase timings in nanoseconds ("timings_ns") and the counters ("counters").
+        """
+        return {"timings_ns": dict(self.timings), "counters": dict(self.counters)}
+
+class _DisabledStats:
+    """
+    The Stats used when the caller asks for none: every phase and counter is a no-op.
+    """
+
+    enabled = False
+
+    def phase(self, name):  # noqa: ARG002 (the signature of Stats.phase)
+        """
+        Returns a context manager that does nothing.
+
+        Args:
+            name: The name of the phase (ignored).
+        """
+        return _NO_PHASE
+
+    def count(self, name, amount=1):
+        """
+        Does nothing.
+
+        Args:
+            name: The name of the counter (ignored).
+            amount: The work done (ignored).
+        """
+
+_NO_PHASE = contextlib.nullcontext()
+
+# Shared instance used by the solvers when no Stats object is given
+DISABLED = _DisabledStats()
@@ -0,0 +1,133 @@
+import random
+import time
+from collections import deque
+from . import chordal
+from . import instrumentation
+
+# Probability of keeping a swap that does not shrink the solution, to move along plateaus of equal size
+PLATEAU_PROBABILITY = 0.1
+
+def improve_dominating_set(graph, dominating_set, deadline=None, progress=None, stats=None, seed=0):
+    """
+    Shrinks a dominating set by local search until a deadline.
+
+    Every vertex keeps the number of its dominators, the vertices of the solution in its closed
+    neighborhood. A vertex of the solution is redundant when its whole closed neighborhood is
+    dominated twice, and is then removed. A vertex u of the solution can be swapped for a vertex x
+    outside of it when N[x] contains the private vertices of u (the ones dominated only by u); the
+    swap is kept when it makes some other vertex of the solution redundant, which removes it, and
+    otherwise only with probability PLATEAU_PROBABILITY. Every move keeps the set dominating, so
+    the search can be stopped at any time.
+
+    Args:
+        graph: A NetworkX graph.
+        dominating_set: A dominating set of graph, which may also contain vertices outside of graph (kept as they are).
+        deadline: time.monotonic() value at which the search stops, or None to stop after a pass without improvement.
+        progress: A function called as progress(size) with the initial size and every smaller size found (none by default).
+        stats: An instrumentation.Stats object receiving the number of redundant vertices removed ("pruned")
+            and of swaps kept ("swaps"). Defaults to None.
+        seed: Seed of the random choices.
+
+    Returns:
+        A dominating set of graph no larger than the given one.
+    """
+    stats = stats or instrumentation.DISABLED
+    nodes = list(graph.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    indptr, indices = chordal.graph_to_csr(graph, nodes, index)
+    closed_indptr, closed_indices = chordal.closed_neighborhood_csr(indptr, indices)
+    closed_indptr, closed_indices = closed_indptr.tolist(), closed_indices.tolist()
+    closed = [closed_indices[closed_indptr[i]:closed_indptr[i + 1]] for i in range(len(nodes))]
+
+    outside = {v for v in dominating_set if v not in index}
+    in_set = [False] * len(nodes)
+    dominators = [0] * len(nodes)
+    for v in dominating_set:
+        if v in index:
+            in_set[index[v]] = True
+            for w in closed[index[v]]:
+                dominators[w] += 1
+    size = sum(in_set)
+    if progress is not None:
+        progress(size + len(outside))
+
+    def add(x):
+        in_set[x] = True
+        for w in closed[x]:
+            dominators[w] += 1
+
+    def remove(x):
+        in_set[x] = False
+        for w in closed[x]:
+            dominators[w] -= 1
+
+    def redundant(x):
+        return all(dominators[w] >= 2 for w in closed[x])
+
+    rng = random.Random(seed)
+    # Stamp of the private vertices of the vertex being swapped out
+    private_mark = [0] * len(nodes)
+    stamp = 0
+    queue = deque()
+    improved = moved = True
+
+    # Without a deadline, the search stops once a whole pass over the solution finds no smaller set
+    while (improved or (moved and deadline is not None)) and (deadline is None or time.monotonic() < deadline):
+        improved = moved = False
+        members = [u for u in range(len(nodes)) if in_set[u]]
+        rng.shuffle(members)
+        queue.extend(members)
+
+        while queue:
+            if deadline is not None and time.monotonic() >= deadline:
+                queue.clear()
+                break
+            u = queue.popleft()
+            if not in_set[u]:
+                continue
+            if redundant(u):
+                remove(u)
+                size -= 1
+                stats.count("pruned")
+                improved = True
+                if progress is not None:
+                    progress(size + len(outside))
+                continue
+
+            stamp += 1
+            private = [w for w in closed[u] if dominators[w] == 1]
+            for w in private:
+                private_mark[w] = stamp
+
+            # A replacement must dominate every private vertex of u, so it lies in N[p] for the first one
+            for x in closed[private[0]]:
+                if in_set[x] or sum(1 for w in closed[x] if private_mark[w] == stamp) != len(private):
+                    continue
+                add(x)
+                remove(u)
+                # The vertices of the solution next to the ones x now dominates twice may be redundant
+                removed = []
+                for w in closed[x]:
+                    for y in closed[w]:
+                        if in_set[y] and y != x and redundant(y):
+                            remove(y)
+                            removed.append(y)
+                if removed:
+                    size -= len(removed)
+                    stats.count("swaps")
+                    stats.count("pruned", len(removed))
+                    improved = True
+                    if progress is not None:
+                        progress(size + len(outside))
+                    queue.extend(y for w in closed[x] for y in closed[w] if in_set[y])
+                    break
+                if rng.random() < PLATEAU_PROBABILITY:
+                    stats.count("swaps")
+                    moved = True
+                    queue.append(x)
+                    break
+                # Undo the swap
+                remove(x)
+                add(u)
+
+    return {nodes[i] for i in range(len(nodes)) if in_set[i]} | outside
@@ -1,11 +1,28 @@
 import lzma
 import bz2
+import contextlib
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import scipy.sparse as sparse
 import networkx as nx
 
 from . import utils
 
+# Size in bytes of the blocks of text parsed at once
+BLOCK_SIZE = 1 << 26
+
+# Number of vertex ids formatted and written at once by save_dominating_set
+WRITE_STEP = 1 << 20
+
+# Magic bytes at the start of an xz stream and at the end of its footer
+XZ_HEADER_MAGIC = b"\xfd7zXZ\x00"
+XZ_FOOTER_MAGIC = b"YZ"
+
+# Longest vertex number accepted (in digits), so that it fits in a 64-bit integer
+MAX_DIGITS = 18
+
 def create_sparse_matrix_from_file(file):
     """Creates a sparse matrix from a file containing a DIMACS format representation.
 
@@ -18,20 +35,201 @@ def create_sparse_matrix_from_file(file):
     Raises:
         ValueError: If the input matrix is not the correct DIMACS format.
     """
-    graph = nx.Graph()
-    for i, line in enumerate(file):
-        line = line.strip()  # Remove newline characters
-        if not line.startswith('c') and not line.startswith('p'):
-            edge = [np.int32(node) for node in line.split(' ') if node != 'e']
-            if len(edge) != 2 or min(edge[0], edge[1]) <= 0:
-                raise ValueError(f"The input file is not in the correct DIMACS format at line {i}")
-            elif graph.has_edge(edge[0] - 1, edge[1] - 1):
-                raise ValueError(f"The input file contains a repeated edge at line {i}")
-            else:
-                graph.add_edge(edge[0] - 1, edge[1] - 1)
+    rows, cols = read_edges(file)
     
+    return edges_to_graph(rows, cols)
+
+def edges_to_graph(rows, cols):
+    """Creates a NetworkX graph from edge arrays.
+
+    Args:
+        rows: 0-based first endpoint of every edge.
+        cols: 0-based second endpoint of every edge.
+
+    Returns:
+        A NetworkX Graph with the edges added in the given order.
+    """
+    graph = nx.Graph()
+    graph.add_edges_from(zip(np.asarray(rows).tolist(), np.asarray(cols).tolist(), strict=True))
+
     return graph
 
+def read_edges(file):
+    """Reads the edges of a DIMACS format representation into NumPy arrays.
+
+    The text is parsed in blocks of whole lines, repeated edges are found by sorting and the
+    errors report the (0-based) line number of the first bad or repeated edge.
+
+    Args:
+        file: A file-like object (e.g., an opened file) in binary or text mode containing the matrix data.
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the 0-based endpoints of every edge in file order.
+
+    Raises:
+        ValueError: If the input matrix is not the correct DIMACS format.
+    """
+    rows, cols, lines = [], [], []
+    bad_line = None
+    for block_rows, block_cols, block_lines, block_bad_line, _ in iter_edge_blocks(file):
+        rows.append(block_rows)
+        cols.append(block_cols)
+        lines.append(block_lines)
+        bad_line = block_bad_line
+
+    return merge_edge_blocks(rows, cols, lines, bad_line)
+
+def iter_edge_blocks(file, block_size=BLOCK_SIZE):
+    """Parses a DIMACS format representation a block of whole lines at a time, holding one block in memory.
+
+    Args:
+        file: A file-like object (e.g., an opened file) in binary or text mode containing the matrix data.
+        block_size: The number of bytes read at a time.
+
+    Yields:
+        The result (rows, cols, lines, bad_line, line_count) of parse_edge_block for every block,
+        with line numbers counted from the start of file. No block follows one with a bad line.
+    """
+    bad_line = None
+    first_line = 0
+    remainder = b""
+    while bad_line is None:
+        chunk = file.read(block_size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        if not chunk:
+            block, remainder = remainder, b""
+        else:
+            # Only parse whole lines, the rest is prepended to the next block
+            chunk = remainder + chunk
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0:
+                remainder = chunk
+                continue
+            block, remainder = chunk[:cut], chunk[cut:]
+        if block:
+            parsed = parse_edge_block(block, first_line)
+            bad_line = parsed[3]
+            first_line += parsed[4]
+            yield parsed
+        if not chunk:
+            break
+
+def parse_edge_block(block, first_line=0):
+    """Parses a block of whole lines of a DIMACS format representation with vectorized operations.
+
+    Comment and problem lines (starting with 'c' or 'p') and blank lines are skipped. Any other
+    line must contain exactly two positive vertex numbers and optionally the 'e' descriptor.
+
+    Args:
+        block: The bytes of the lines.
+        first_line: The (0-based) line number of the first line of the block.
+
+    Returns:
+        rows: 0-based first endpoint of every edge before the first bad line.
+        cols: 0-based second endpoint of those edges.
+        lines: The line number of those edges.
+        bad_line: The line number of the first line not in the correct format, or None.
+        line_count: The number of lines in the block.
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    empty = np.empty(0, dtype=np.int64)
+    size = len(data)
+    newline = data == ord("\n")
+    line_count = int(np.count_nonzero(newline)) + (0 if size and newline[-1] else 1)
+    if size == 0:
+        return empty, empty, empty, None, 0
+
+    # Tokens are maximal runs of non-whitespace bytes, each one in the line of its first byte
+    solid = ~(newline | (data == ord(" ")) | ((data >= ord("\t")) & (data <= ord("\r"))))
+    edge = np.diff(np.concatenate(([False], solid, [False])).astype(np.int8))
+    starts = np.flatnonzero(edge == 1)
+    ends = np.flatnonzero(edge == -1)
+    token_line = np.searchsorted(np.flatnonzero(newline), starts)
+    lengths = ends - starts
+
+    # Tokens with a byte other than a digit are not vertex numbers
+    letters = np.flatnonzero(solid & ((data < ord("0")) | (data > ord("9"))))
+    numeric = lengths <= MAX_DIGITS
+    numeric[np.searchsorted(starts, letters, side="right") - 1] = False
+
+    # Lines whose first token starts with 'c' or 'p' are comment and problem lines
+    first_token = np.ones(len(starts), dtype=bool)
+    first_token[1:] = token_line[1:] != token_line[:-1]
+    heads = data[starts[first_token]]
+    skipped = np.zeros(line_count, dtype=bool)
+    skipped[token_line[first_token]] = (heads == ord("c")) | (heads == ord("p"))
+    keep = ~skipped[token_line]
+    starts, lengths, token_line, numeric = starts[keep], lengths[keep], token_line[keep], numeric[keep]
+
+    # Every token must be the 'e' descriptor or a vertex number of at most MAX_DIGITS digits
+    descriptor = (lengths == 1) & (data[starts] == ord("e"))
+    bad = np.zeros(line_count, dtype=bool)
+    bad[token_line[~(numeric | descriptor)]] = True
+
+    # Vertex numbers, one digit position at a time
+    starts, lengths, token_line = starts[numeric], lengths[numeric], token_line[numeric]
+    values = np.zeros(len(starts), dtype=np.int64)
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        more = lengths > k
+        values[more] = values[more] * 10 + (data[starts[more] + k] - ord("0"))
+
+    # Edge lines have exactly two positive vertex numbers
+    numbers = np.bincount(token_line, minlength=line_count)
+    bad |= np.bincount(token_line, weights=values <= 0, minlength=line_count) > 0
+    bad[(numbers != 0) & (numbers != 2)] = True
+    bad_lines = np.flatnonzero(bad)
+
+    pairs = numbers[token_line] == 2
+    values, token_line = values[pairs], token_line[pairs]
+    lines = token_line[0::2]
+    rows, cols = values[0::2] - 1, values[1::2] - 1
+
+    bad_line = None
+    if len(bad_lines):
+        bad_line = int(bad_lines[0])
+        before = lines < bad_line
+        rows, cols, lines = rows[before], cols[before], lines[before]
+        bad_line += first_line
+
+    return rows, cols, lines + first_line, bad_line, line_count
+
+def merge_edge_blocks(rows, cols, lines, bad_line=None):
+    """Concatenates the edges of parsed blocks and checks for repeated edges.
+
+    Args:
+        rows: A list of arrays with the 0-based first endpoints of the edges of each block.
+        cols: A list of arrays with the 0-based second endpoints.
+        lines: A list of arrays with the line number of each edge.
+        bad_line: The line number of the first line not in the correct format, or None.
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the endpoints of every edge in file order.
+
+    Raises:
+        ValueError: If a line is not in the correct format or an edge is repeated (the earliest line is reported).
+    """
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    lines = np.concatenate(lines) if lines else np.empty(0, dtype=np.int64)
+
+    # An edge and its reverse are the same edge: sort by (min, max) and keep the file order of ties
+    low, high = np.minimum(rows, cols), np.maximum(rows, cols)
+    if len(high) and high.max() < 1 << 31:
+        order = np.argsort(low * (1 << 31) + high, kind="stable")
+    else:
+        order = np.lexsort((high, low))
+    low, high = low[order], high[order]
+    repeated = (low[1:] == low[:-1]) & (high[1:] == high[:-1])
+    repeated_line = int(lines[order[1:][repeated]].min()) if repeated.any() else None
+
+    if bad_line is not None and (repeated_line is None or bad_line < repeated_line):
+        raise ValueError(f"The input file is not in the correct DIMACS format at line {bad_line}")
+    if repeated_line is not None:
+        raise ValueError(f"The input file contains a repeated edge at line {repeated_line}")
+
+    return rows, cols
+
 def save_sparse_matrix_to_file(matrix, filename):
     """
     Writes a SciPy sparse matrix to a DIMACS format.
@@ -49,11 +247,408 @@ def save_sparse_matrix_to_file(matrix, filename):
                 f.write(f"e {i + 1} {j + 1}" + "\n")
     
 
-def read(filepath):
+def save_edges_to_file(rows, cols, vertices, filename):
+    """
+    Writes an edge list to a DIMACS file, formatting the edges in bulk with NumPy a chunk at a time.
+
+    Args:
+        rows: First endpoint of every edge, 0-based.
+        cols: Second endpoint of every edge, 0-based.
+        vertices: The number of vertices.
+        filename: The name of the output text file.
+    """
+    step = BLOCK_SIZE // 32
+
+    with open(filename, 'w') as f:
+        f.write(f"p edge {vertices} {len(rows)}" + "\n")
+        for start in range(0, len(rows), step):
+            edges = np.column_stack((rows[start:start + step], cols[start:start + step])).astype(np.int64) + 1
+            np.savetxt(f, edges, fmt="e %d %d")
+
+def save_edges_to_npy(rows, cols, filename):
+    """
+    Writes an edge list to a binary NumPy file, an (m, 2) int64 array of 0-based endpoints.
+
+    Args:
+        rows: First endpoint of every edge, 0-based.
+        cols: Second endpoint of every edge, 0-based.
+        filename: The name of the output file, which should end in .npy.
+    """
+    edges = np.lib.format.open_memmap(filename, mode='w+', dtype=np.int64, shape=(len(rows), 2))
+    step = BLOCK_SIZE // 32
+    for start in range(0, len(rows), step):
+        edges[start:start + step] = np.column_stack((rows[start:start + step], cols[start:start + step]))
+    edges.flush()
+
+def read_npy_edges(filepath):
+    """Reads the edges of a binary NumPy file written by save_edges_to_npy.
+
+    Args:
+        filepath: The path to the file.
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the 0-based endpoints of every edge in file order.
+
+    Raises:
+        ValueError: If the file does not hold an (m, 2) array of non-negative integers.
+    """
+    edges = np.load(filepath, mmap_mode='r')
+    if edges.ndim != 2 or edges.shape[1] != 2 or not np.issubdtype(edges.dtype, np.integer):
+        raise ValueError("The input file is not an (m, 2) integer array of edges")
+    if len(edges) and edges.min() < 0:
+        raise ValueError("The input file contains a negative vertex number")
+
+    return np.array(edges[:, 0], dtype=np.int64), np.array(edges[:, 1], dtype=np.int64)
+
+def save_dominating_set(dominating_set, filename):
+    """
+    Writes a dominating set as its sorted 1-based vertex ids, a chunk at a time, without building
+    the whole text in memory.
+
+    An integer array already in increasing order, such as the memory-mapped result of
+    external.OutOfCoreGraph.find_dominating_set, is streamed from where it is without a copy. Any
+    other set of vertices is sorted in memory first.
+
+    The format follows the extension of filename: a binary NumPy file of int64 ids (.npy), or a text
+    file with one id per line, compressed with xz/lzma or bz2/bzip2 or plain otherwise.
+
+    Args:
+        dominating_set: The 0-based vertices of the set (any iterable or an integer array), or None for an empty graph.
+        filename: The name of the output file.
+
+    Returns:
+        The number of vertices written.
+    """
+    step = WRITE_STEP
+    if isinstance(dominating_set, np.ndarray):
+        ids = dominating_set.reshape(-1)
+        if not _is_sorted(ids, step):
+            ids = np.sort(ids)
+    else:
+        ids = np.fromiter(dominating_set or (), dtype=np.int64)
+        ids.sort()
+
+    extension = utils.get_extension_without_dot(filename)
+    with _open_output(filename, extension) as f:
+        if extension == 'npy':
+            header = {"descr": np.lib.format.dtype_to_descr(np.dtype(np.int64)), "fortran_order": False, "shape": (len(ids),)}
+            np.lib.format.write_array_header_1_0(f, header)
+        for start in range(0, len(ids), step):
+            chunk = np.asarray(ids[start:start + step], dtype=np.int64) + 1
+            f.write(chunk.tobytes() if extension == 'npy' else _format_ids(chunk))
+    return len(ids)
+
+def _open_output(filename, extension):
+    """
+    Opens an output file for writing bytes, compressed according to its extension.
+
+    Args:
+        filename: The name of the output file.
+        extension: Its extension without the dot.
+
+    Returns:
+        A binary file object, to be used as a context manager.
+    """
+    if extension == 'xz' or extension == 'lzma':
+        # A fast preset: result files are written once per run and the ids compress well anyway
+        return lzma.open(filename, 'wb', preset=1)
+    if extension == 'bz2' or extension == 'bzip2':
+        return bz2.open(filename, 'wb')
+    return open(filename, 'wb')
+
+def _is_sorted(ids, step):
+    """
+    Checks that an array is in increasing order, a chunk at a time.
+
+    Args:
+        ids: An integer array, possibly memory-mapped.
+        step: The number of entries read at a time.
+
+    Returns:
+        True if no entry is smaller than the one before it.
+    """
+    for start in range(0, len(ids), step):
+        # Every chunk overlaps the previous one by an entry, which compares them across the boundary
+        chunk = np.asarray(ids[max(start - 1, 0):start + step])
+        if np.any(chunk[1:] < chunk[:-1]):
+            return False
+    return True
+
+def _format_ids(ids):
+    """
+    Formats sorted positive integers as text, one per line, with NumPy instead of one string per number.
+
+    Sorted numbers with the same number of digits are contiguous, so every run of them becomes
+    one byte matrix with a digit per column and the newline in the last one.
+
+    Args:
+        ids: A sorted array of positive integers.
+
+    Returns:
+        The bytes of the text.
+    """
+    pieces = []
+    digits = 1
+    start = 0
+    while start < len(ids):
+        end = int(np.searchsorted(ids, 10 ** digits, side='left'))
+        if end > start:
+            text = np.empty((end - start, digits + 1), dtype=np.uint8)
+            values = ids[start:end]
+            for column in range(digits - 1, -1, -1):
+                text[:, column] = values % 10 + ord('0')
+                values = values // 10
+            text[:, digits] = ord('\n')
+            pieces.append(text.tobytes())
+        start = end
+        digits += 1
+    return b"".join(pieces)
+
+def read_dominating_set(filepath):
+    """Reads a dominating set written by save_dominating_set.
+
+    Args:
+        filepath: The path to the file.
+
+    Returns:
+        An integer array with the 0-based vertices of the set in increasing order.
+
+    Raises:
+        ValueError: If the file does not hold positive integer ids.
+    """
+    extension = utils.get_extension_without_dot(filepath)
+    if extension == 'npy':
+        ids = np.load(filepath)
+    else:
+        opener = lzma.open if extension in ('xz', 'lzma') else bz2.open if extension in ('bz2', 'bzip2') else open
+        with opener(filepath, 'rb') as f:
+            try:
+                ids = np.array(f.read().split(), dtype=np.int64)
+            except ValueError:
+                raise ValueError("The dominating set file contains a line that is not a vertex number") from None
+    if ids.ndim != 1 or not np.issubdtype(ids.dtype, np.integer) or (len(ids) and ids.min() < 1):
+        raise ValueError("The dominating set file does not hold positive vertex numbers")
+
+    return ids.astype(np.int64) - 1
+
+def read_file_edges(filepath, workers=None):
+    """Reads the edges of a DIMACS file, which may be compressed with xz/lzma or bz2/bzip2, or of a binary .npy edge file.
+
+    Args:
+        filepath: The path to the file.
+        workers: Number of processes parsing pieces of the file in parallel (sequential by default).
+            Plain files are split into byte ranges and xz files into their compressed blocks.
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the 0-based endpoints of every edge in file order.
+
+    Raises:
+        FileNotFoundError: If the file is not found.
+        ValueError: If the input matrix is not the correct DIMACS format.
+    """
+    extension = utils.get_extension_without_dot(filepath)
+    if extension == 'npy':
+        return read_npy_edges(filepath)
+    if extension == 'xz' or extension == 'lzma':
+        pieces = _xz_block_pieces(filepath) if workers is not None and workers > 1 else None
+        if pieces is None:
+            with lzma.open(filepath, 'rb') as file:
+                return read_edges(file)
+    elif extension == 'bz2' or extension == 'bzip2':
+        with bz2.open(filepath, 'rb') as file:
+            return read_edges(file)
+    else:
+        size = os.path.getsize(filepath)
+        if workers is None or workers <= 1 or size <= BLOCK_SIZE:
+            with open(filepath, 'rb') as file:
+                return read_edges(file)
+        pieces = [("range", filepath, start, min(BLOCK_SIZE, size - start)) for start in range(0, size, BLOCK_SIZE)]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(pieces))) as executor:
+        return _merge_file_pieces(executor.map(_parse_file_piece, pieces))
+
+def _parse_file_piece(piece):
+    """Parses the complete lines of a piece of a DIMACS file in a worker process.
+
+    A piece is either ("range", filepath, start, length), a byte range of a plain file, or
+    ("xz", filepath, header, start, length, unpadded_size, uncompressed_size), one block of an xz
+    stream. Pieces do not start or end on line boundaries: the bytes up to the first newline and
+    after the last one are returned unparsed so the parent can join them with the neighboring pieces.
+
+    Args:
+        piece: The description of the piece.
+
+    Returns:
+        The bytes of the piece if it has no newline. Otherwise a tuple (head, tail, rows, cols, lines,
+        bad_line, line_count) where head ends with the first newline, tail follows the last one and
+        the rest is the result of parse_edge_block on the lines in between.
+    """
+    kind, filepath = piece[0], piece[1]
+    with open(filepath, 'rb') as file:
+        if kind == "range":
+            _, _, start, length = piece
+            file.seek(start)
+            data = file.read(length)
+        else:
+            _, _, header, start, length, unpadded_size, uncompressed_size = piece
+            file.seek(start)
+            data = lzma.decompress(_xz_single_block_stream(header, file.read(length), unpadded_size, uncompressed_size))
+
+    first = data.find(b"\n")
+    if first < 0:
+        return data
+    last = data.rfind(b"\n")
+    rows, cols, lines, bad_line, line_count = parse_edge_block(data[first + 1:last + 1])
+    return data[:first + 1], data[last + 1:], rows, cols, lines, bad_line, line_count
+
+def _merge_file_pieces(results):
+    """Joins the pieces parsed by _parse_file_piece in file order.
+
+    The partial lines at the boundaries of consecutive pieces are joined and parsed here, and the
+    line numbers of every piece are shifted so that errors report global line numbers.
+
+    Args:
+        results: The results of _parse_file_piece for every piece, in file order.
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the 0-based endpoints of every edge in file order.
+
+    Raises:
+        ValueError: If the input matrix is not the correct DIMACS format.
+    """
+    rows, cols, lines = [], [], []
+    bad_lines = []
+    carry = b""
+    line = 0
+
+    def parse(block, first_line, offset=0):
+        block_rows, block_cols, block_lines, bad_line, line_count = block
+        rows.append(block_rows)
+        cols.append(block_cols)
+        lines.append(block_lines + offset)
+        if bad_line is not None:
+            bad_lines.append(bad_line + offset)
+        return first_line + line_count
+
+    for result in results:
+        if isinstance(result, bytes):
+            carry += result
+            continue
+        head, tail, *body = result
+        line = parse(parse_edge_block(carry + head, line), line)
+        line = parse(body, line, line)
+        carry = tail
+    if carry:
+        parse(parse_edge_block(carry, line), line)
+
+    return merge_edge_blocks(rows, cols, lines, min(bad_lines) if bad_lines else None)
+
+def _xz_block_pieces(filepath):
+    """Lists the blocks of a single-stream xz file from its index.
+
+    Args:
+        filepath: The path to the xz file.
+
+    Returns:
+        A list of ("xz", filepath, header, start, length, unpadded_size, uncompressed_size) pieces,
+        or None if the file has fewer than two blocks or is not a plain single-stream xz file.
+    """
+    size = os.path.getsize(filepath)
+    if size < 32:
+        return None
+    with open(filepath, 'rb') as file:
+        header = file.read(12)
+        file.seek(size - 12)
+        footer = file.read(12)
+        if not header.startswith(XZ_HEADER_MAGIC) or footer[10:] != XZ_FOOTER_MAGIC or footer[8:10] != header[6:8]:
+            return None
+        index_size = (struct.unpack("<I", footer[4:8])[0] + 1) * 4
+        index_start = size - 12 - index_size
+        if index_start < 12:
+            return None
+        file.seek(index_start)
+        index = file.read(index_size)
+
+    if index[0] != 0 or struct.unpack("<I", index[-4:])[0] != zlib.crc32(index[:-4]):
+        return None
+    count, position = _read_varint(index, 1)
+    pieces = []
+    start = 12
+    for _ in range(count):
+        unpadded_size, position = _read_varint(index, position)
+        uncompressed_size, position = _read_varint(index, position)
+        length = (unpadded_size + 3) // 4 * 4
+        pieces.append(("xz", filepath, header, start, length, unpadded_size, uncompressed_size))
+        start += length
+
+    # Several streams or stream padding are read sequentially
+    if start != index_start or len(pieces) < 2:
+        return None
+    return pieces
+
+def _xz_single_block_stream(header, block, unpadded_size, uncompressed_size):
+    """Wraps one block of an xz stream into a complete xz stream that can be decompressed on its own.
+
+    Args:
+        header: The 12-byte stream header of the original stream.
+        block: The bytes of the block, including its padding.
+        unpadded_size: The unpadded size of the block, as recorded in the index.
+        uncompressed_size: The uncompressed size of the block, as recorded in the index.
+
+    Returns:
+        The bytes of an xz stream with the block, an index of one record and a stream footer.
+    """
+    index = b"\x00" + _write_varint(1) + _write_varint(unpadded_size) + _write_varint(uncompressed_size)
+    index += b"\x00" * (-len(index) % 4)
+    index += struct.pack("<I", zlib.crc32(index))
+    backward_size = struct.pack("<I", len(index) // 4 - 1)
+    flags = header[6:8]
+    footer = struct.pack("<I", zlib.crc32(backward_size + flags)) + backward_size + flags + XZ_FOOTER_MAGIC
+    return header + block + index + footer
+
+def _read_varint(data, position):
+    """Reads a variable-length integer of the xz format.
+
+    Args:
+        data: The bytes.
+        position: The position of the first byte of the integer.
+
+    Returns:
+        A tuple (value, position) with the integer and the position after it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, position
+
+def _write_varint(value):
+    """Writes a variable-length integer of the xz format.
+
+    Args:
+        value: A non-negative integer.
+
+    Returns:
+        The bytes of the integer.
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+def read(filepath, cache=None, workers=None):
     """Reads a file and returns its lines in an array format.
 
     Args:
         filepath: The path to the file.
+        cache: A GraphCache to load the parsed graph from, or to store it in after parsing (no caching by default).
+        workers: Number of processes parsing pieces of the file in parallel (sequential by default).
 
     Returns:
         A NetworkX Graph.
@@ -62,18 +657,38 @@ def read(filepath):
         FileNotFoundError: If the file is not found.
     """
 
+    return edges_to_graph(*read_arrays(filepath, cache, workers))
+
+def read_arrays(filepath, cache=None, workers=None):
+    """Reads the edges of a file as arrays, through the parsed graph cache.
+
+    Args:
+        filepath: The path to the file.
+        cache: A GraphCache to load the edges from, or to store them in after parsing (no caching by default).
+        workers: Number of processes parsing pieces of the file in parallel (sequential by default).
+
+    Returns:
+        A tuple (rows, cols) of integer arrays with the 0-based endpoints of every edge in file order,
+        from which edges_to_graph builds the graph returned by read.
+
+    Raises:
+        FileNotFoundError: If the file is not found.
+    """
+
     try:
-        extension = utils.get_extension_without_dot(filepath)
-        if extension == 'xz' or extension == 'lzma':
-            with lzma.open(filepath, 'rt') as file:
-                matrix = create_sparse_matrix_from_file(file)
-        elif extension == 'bz2' or extension == 'bzip2':
-            with bz2.open(filepath, 'rt') as file:
-                matrix = create_sparse_matrix_from_file(file)
-        else:
-            with open(filepath, 'r') as file:
-                matrix = create_sparse_matrix_from_file(file)
+        if cache is not None:
+            key = cache.key(filepath)
+            entry = cache.load(key)
+            if entry is not None:
+                return entry
+
+        rows, cols = read_file_edges(filepath, workers)
+
+        if cache is not None:
+            # The cache is an optimization, an unwritable cache directory is not an error
+            with contextlib.suppress(OSError):
+                cache.store(key, rows, cols)
         
-        return matrix
+        return rows, cols
     except FileNotFoundError:
-        raise FileNotFoundError(f"File not found: {filepath}")
\ No newline at end of file
+        raise FileNotFoundError(f"File not found: {filepath}")
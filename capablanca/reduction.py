@@ -0,0 +1,256 @@
+import time
+from collections import deque
+import networkx as nx
+
+# The neighborhood rules only examine vertices up to this degree, which bounds their cost on hubs
+DEGREE_LIMIT = 64
+
+# Reduction rules in the order they are applied to every vertex
+RULES = ("isolated", "dominated_edge", "redundant", "pendant", "twin", "dominated_neighborhood", "alber")
+
+def reduce_graph(graph, dominated=None):
+    """
+    Applies dominating set reduction rules until none of them changes the graph.
+
+    The result is an annotated kernel: a smaller graph, the vertices forced into the solution and the
+    kernel vertices already dominated by them, which still may be chosen but need no dominator. For
+    every dominating set D of the kernel that dominates its undominated vertices, D plus the forced
+    vertices is a dominating set of graph, and a minimum D gives a minimum dominating set of graph.
+    The rules are:
+
+    - isolated: an isolated vertex is forced unless it is dominated, then it is removed.
+    - dominated_edge: an edge between two dominated vertices is removed.
+    - redundant: a dominated vertex whose neighbors are all dominated by another vertex is removed.
+    - pendant: the neighbor of an undominated vertex of degree one is forced.
+    - twin: of two undominated vertices with the same closed neighborhood, one is removed.
+    - dominated_neighborhood: an undominated neighbor u of an undominated vertex v with N[v] in N[u]
+      is marked as dominated, as every vertex dominating v dominates u.
+    - alber: a vertex v is forced when an undominated neighbor has no neighbor outside N[v] and no
+      neighbor that has one (Alber, Fellows and Niedermeier's rule for a single vertex).
+
+    Args:
+        graph: A NetworkX Graph, which is not modified.
+        dominated: Vertices of graph that need no dominator (none by default).
+
+    Returns:
+        A tuple (kernel, forced, dominated, statistics) with the kernel as a new NetworkX Graph, the
+        set of forced vertices, the set of dominated kernel vertices and a dictionary mapping every
+        rule to the number of times it was applied ("count") and the milliseconds spent on it ("time").
+    """
+    reducer = _Reducer(graph, dominated)
+    reducer.run()
+
+    adjacency = reducer.adjacency
+    kernel = nx.Graph()
+    kernel.add_nodes_from(v for v in graph if v in adjacency)
+    kernel.add_edges_from((v, u) for v in kernel for u in graph.adj[v] if u in adjacency[v])
+
+    return kernel, reducer.forced, reducer.dominated & adjacency.keys(), reducer.statistics
+
+class _Reducer:
+    """
+    The adjacency sets, annotations and worklist of a running reduction.
+    """
+
+    def __init__(self, graph, dominated):
+        """
+        Initializes the reduction with every vertex in the worklist.
+
+        Args:
+            graph: A NetworkX Graph.
+            dominated: Vertices of graph that need no dominator, or None.
+        """
+        self.adjacency = {v: set(graph.adj[v]) - {v} for v in graph}
+        self.dominated = set() if dominated is None else set(dominated)
+        self.forced = set()
+        self.statistics = {rule: {"count": 0, "time": 0.0} for rule in RULES}
+        self.queue = deque(self.adjacency)
+        self.queued = set(self.adjacency)
+
+    def run(self):
+        """
+        Applies the rules to the vertices of the worklist until it is empty.
+        """
+        rules = [(rule, getattr(self, f"_{rule}")) for rule in RULES]
+        while self.queue:
+            v = self.queue.popleft()
+            self.queued.discard(v)
+            for rule, apply in rules:
+                if v not in self.adjacency:
+                    break
+                started = time.perf_counter()
+                apply(v)
+                self.statistics[rule]["time"] += (time.perf_counter() - started) * 1000.0
+
+    def _push(self, v):
+        """
+        Adds a vertex to the worklist.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        if v not in self.queued:
+            self.queued.add(v)
+            self.queue.append(v)
+
+    def _count(self, rule):
+        """
+        Counts one application of a rule.
+
+        Args:
+            rule: The name of the rule.
+        """
+        self.statistics[rule]["count"] += 1
+
+    def _remove(self, v):
+        """
+        Removes a vertex, putting its neighbors back in the worklist.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        for u in self.adjacency.pop(v):
+            self.adjacency[u].discard(v)
+            self._push(u)
+
+    def _dominate(self, v):
+        """
+        Marks a vertex as dominated, putting it and its neighbors back in the worklist.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        if v not in self.dominated:
+            self.dominated.add(v)
+            self._push(v)
+            for u in self.adjacency[v]:
+                self._push(u)
+
+    def _force(self, v):
+        """
+        Adds a vertex to the solution, dominating its neighbors, and removes it.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        self.forced.add(v)
+        for u in self.adjacency[v]:
+            self._dominate(u)
+        self._remove(v)
+
+    def _isolated(self, v):
+        """
+        Forces v if it is isolated and undominated, removing it if it is isolated.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        if not self.adjacency[v]:
+            if v not in self.dominated:
+                self.forced.add(v)
+            self._remove(v)
+            self._count("isolated")
+
+    def _dominated_edge(self, v):
+        """
+        Removes the edges between a dominated v and its dominated neighbors.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        if v in self.dominated:
+            for u in [u for u in self.adjacency[v] if u in self.dominated]:
+                self.adjacency[v].discard(u)
+                self.adjacency[u].discard(v)
+                self._push(u)
+                self._count("dominated_edge")
+
+    def _redundant(self, v):
+        """
+        Removes a dominated v when another vertex dominates all of its neighbors.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        neighbors = self.adjacency[v]
+        if v not in self.dominated or len(neighbors) > DEGREE_LIMIT:
+            return
+        if not neighbors:
+            self._remove(v)
+            self._count("redundant")
+            return
+        # Any vertex dominating all of them is the neighbor y of smallest degree or a neighbor of y
+        y = min(neighbors, key=lambda u: len(self.adjacency[u]))
+        candidates = [y] if len(self.adjacency[y]) > DEGREE_LIMIT else [y, *self.adjacency[y]]
+        for x in candidates:
+            if x != v and all(u == x or u in self.adjacency[x] for u in neighbors):
+                self._remove(v)
+                self._count("redundant")
+                return
+
+    def _pendant(self, v):
+        """
+        Forces the neighbor of v if it is undominated and has degree one.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        if v not in self.dominated and len(self.adjacency[v]) == 1:
+            self._force(next(iter(self.adjacency[v])))
+            self._count("pendant")
+
+    def _twin(self, v):
+        """
+        Removes an undominated neighbor with the same closed neighborhood as an undominated v.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        neighbors = self.adjacency[v]
+        if v in self.dominated or len(neighbors) > DEGREE_LIMIT:
+            return
+        for u in neighbors:
+            if u not in self.dominated and len(self.adjacency[u]) == len(neighbors) and all(w == u or w in self.adjacency[u] for w in neighbors):
+                self._remove(u)
+                self._push(v)
+                self._count("twin")
+                return
+
+    def _dominated_neighborhood(self, v):
+        """
+        Marks as dominated every undominated neighbor u of an undominated v with N[v] in N[u].
+
+        Args:
+            v: A vertex of the graph.
+        """
+        neighbors = self.adjacency[v]
+        if v in self.dominated or len(neighbors) > DEGREE_LIMIT:
+            return
+        for u in list(neighbors):
+            if u not in self.dominated and all(w == u or w in self.adjacency[u] for w in neighbors):
+                self._dominate(u)
+                self._count("dominated_neighborhood")
+
+    def _alber(self, v):
+        """
+        Forces v when an undominated neighbor has no neighbor outside N[v] and no neighbor that has one.
+
+        Args:
+            v: A vertex of the graph.
+        """
+        neighbors = self.adjacency[v]
+        if len(neighbors) > DEGREE_LIMIT:
+            return
+        exits = {}
+
+        def is_exit(w):
+            # A neighbor of v is an exit when it has a neighbor outside N[v]
+            if w not in exits:
+                exits[w] = any(x != v and x not in neighbors for x in self.adjacency[w])
+            return exits[w]
+
+        for w in neighbors:
+            if w not in self.dominated and not is_exit(w) and not any(is_exit(x) for x in self.adjacency[w] if x != v):
+                self._force(v)
+                self._count("alber")
+                return
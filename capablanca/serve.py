@@ -0,0 +1,387 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Address the TCP server listens on by default, only reachable from the same host
+DEFAULT_HOST = "127.0.0.1"
+
+# Jobs waiting for a worker, beyond which the server stops reading requests from its clients
+DEFAULT_QUEUE_SIZE = 64
+
+# Longest request line in bytes, which holds a whole DIMACS payload
+REQUEST_LIMIT = 1 << 28
+
+# Modules imported once by the process the workers are forked from, so that every worker starts with the solver loaded
+PRELOAD = ["capablanca.algorithm", "capablanca.parser", "capablanca.validate"]
+
+def solve_job(job):
+    """
+    Solves one job in a worker process.
+
+    Args:
+        job: A request with either "path", an input file as accepted by approx (plain, compressed or
+            .npy), or "dimacs", the text of a DIMACS file. The optional "reduce", "time_budget" and
+            "verify" fields are the options of approx, and "count" leaves the vertex ids out of the result.
+
+    Returns:
+        A dictionary with the status "ok", the number of vertices n and edges m, the size of the
+        Dominating Set with its sorted 1-based vertex ids, whether it passed the verification when
+        requested and the time in milliseconds of every phase, or the status "error" with the message.
+    """
+    import numpy as np
+    from . import algorithm
+    from . import parser
+    from . import validate
+
+    try:
+        started = time.time()
+        if "path" in job:
+            rows, cols = parser.read_arrays(job["path"])
+        elif "dimacs" in job:
+            rows, cols = parser.read_edges(io.BytesIO(job["dimacs"].encode()))
+        else:
+            raise ValueError("A job needs either a path or a dimacs payload.")
+        graph = parser.edges_to_graph(rows, cols)
+        result = {"status": "ok", "n": graph.number_of_nodes(), "m": graph.number_of_edges(), "timings": {"parse": (time.time() - started) * 1000.0}}
+
+        started = time.time()
+        dominating_set = algorithm.find_dominating_set(graph, reduce=bool(job.get("reduce", False)), time_budget=job.get("time_budget"))
+        result["timings"]["solve"] = (time.time() - started) * 1000.0
+        result["size"] = len(dominating_set)
+        if job.get("verify"):
+            result["verified"] = len(validate.find_undominated_edges(rows, cols, dominating_set)) == 0
+        if not job.get("count"):
+            result["dominating_set"] = (np.sort(np.fromiter(dominating_set, dtype=np.int64)) + 1).tolist()
+        return result
+    except Exception as error:
+        return {"status": "error", "error": str(error)}
+
+class Server:
+    """
+    A long-running solver service speaking line-delimited JSON over a Unix socket or a TCP port.
+
+    Every request line is a job for solve_job, and every job gets one result line, carrying the
+    "id" of its request, as soon as it is solved: a client may send many jobs over one connection
+    and receive their results in completion order, each with the milliseconds spent in a worker
+    ("wall"). The jobs are solved by a pool of worker
+    processes that keep the solver imported between jobs. They wait in a bounded queue: once it
+    is full, the server stops reading requests, so the clients are slowed down by the socket
+    instead of filling the memory of the server. If a worker dies, the pool is replaced and the
+    jobs it interrupted are tried again once.
+    """
+
+    def __init__(self, jobs=None, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Prepares the server.
+
+        Args:
+            jobs: Number of worker processes (the number of CPUs by default).
+            queue_size: Number of jobs waiting for a worker before the server applies backpressure.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.executor = None
+        self.queue = None
+        self.dispatchers = []
+        self.server = None
+        self.socket_path = None
+
+    async def start(self, socket_path=None, host=DEFAULT_HOST, port=None):
+        """
+        Starts the workers and listens on a Unix socket or a TCP port.
+
+        Args:
+            socket_path: Path of the Unix socket (replaced if it exists).
+            host: Address of the TCP server.
+            port: Port of the TCP server, 0 for any free port, used when socket_path is None.
+
+        Returns:
+            The address the server listens on, the socket path or a (host, port) tuple.
+
+        Raises:
+            ValueError: If neither socket_path nor port is given.
+        """
+        if socket_path is None and port is None:
+            raise ValueError("The server needs a socket path or a port.")
+
+        self.executor = self._create_executor()
+        # The first job starts the workers, so that they are ready before the first request
+        await asyncio.get_running_loop().run_in_executor(self.executor, os.getpid)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.jobs)]
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = await asyncio.start_unix_server(self._handle, path=socket_path, limit=REQUEST_LIMIT)
+            self.socket_path = socket_path
+            return socket_path
+        self.server = await asyncio.start_server(self._handle, host=host, port=port, limit=REQUEST_LIMIT)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Serves the clients until the task is cancelled.
+        """
+        await self.server.serve_forever()
+
+    async def close(self):
+        """
+        Stops listening, cancels the waiting jobs and shuts the workers down.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.socket_path is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _create_executor(self):
+        """
+        Creates the worker pool.
+
+        The workers are forked from a server process that only imported the solver (where the
+        platform supports it), so they do not inherit the client sockets, which would otherwise stay
+        open after the server closes them, nor the signal handlers of the event loop.
+
+        Returns:
+            A ProcessPoolExecutor with self.jobs workers.
+        """
+        context = None
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(PRELOAD)
+        return ProcessPoolExecutor(max_workers=self.jobs, mp_context=context, initializer=_init_worker)
+
+    def _replace_executor(self, broken):
+        """
+        Replaces a worker pool broken by the death of one of its workers.
+
+        Args:
+            broken: The broken pool, left alone if another dispatcher already replaced it.
+        """
+        if self.executor is broken:
+            self.executor = self._create_executor()
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    async def _dispatch(self):
+        """
+        Feeds the jobs of the queue to the worker pool, one at a time.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            job, future = await self.queue.get()
+            try:
+                if not future.done():
+                    started = time.time()
+                    result = await self._solve(loop, job)
+                    result["wall"] = (time.time() - started) * 1000.0
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as error:
+                # The job could not be sent to a worker, or its worker died twice
+                if not future.done():
+                    future.set_result({"status": "error", "error": str(error) or type(error).__name__})
+            finally:
+                self.queue.task_done()
+
+    async def _solve(self, loop, job):
+        """
+        Solves a job in the worker pool, replacing the pool if a worker dies.
+
+        When a worker dies, every job of its pool fails, also the ones other workers were solving:
+        they are tried once more in a new pool, so that only a job whose worker dies again fails.
+
+        Args:
+            loop: The running event loop.
+            job: A request for solve_job.
+
+        Returns:
+            The result of solve_job.
+
+        Raises:
+            BrokenProcessPool: If the worker solving the job died in both pools.
+        """
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, solve_job, job)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, solve_job, job)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise
+
+    async def _handle(self, reader, writer):
+        """
+        Serves one connection: queues its jobs and writes their results as they are solved.
+
+        Args:
+            reader: The asyncio stream reader of the connection.
+            writer: The asyncio stream writer of the connection.
+        """
+        lock = asyncio.Lock()
+        replies = []
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self._reply(writer, lock, {"status": "error", "error": f"Request longer than {REQUEST_LIMIT} bytes."})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    job = json.loads(line)
+                    if not isinstance(job, dict):
+                        raise ValueError("A request must be a JSON object.")
+                except ValueError as error:
+                    await self._reply(writer, lock, {"status": "error", "error": str(error)})
+                    continue
+
+                future = asyncio.get_running_loop().create_future()
+                # Waits while the queue is full, which stops reading from this client
+                await self.queue.put((job, future))
+                replies.append(asyncio.create_task(self._reply(writer, lock, future, job.get("id"))))
+            await asyncio.gather(*replies)
+        except ConnectionError:
+            pass
+        finally:
+            for reply in replies:
+                reply.cancel()
+            writer.close()
+
+    async def _reply(self, writer, lock, result, job_id=None):
+        """
+        Writes one result line, waiting for the result if needed.
+
+        Args:
+            writer: The asyncio stream writer of the connection.
+            lock: The lock serializing the writes of the connection.
+            result: A result dictionary, or a future of one.
+            job_id: The id of the request, echoed in the result.
+        """
+        if asyncio.isfuture(result):
+            try:
+                result = await result
+            except asyncio.CancelledError:
+                # The client is gone, the job is skipped if it is still waiting
+                result.cancel()
+                raise
+        async with lock:
+            writer.write((json.dumps({"id": job_id, **result}) + "\n").encode())
+            await writer.drain()
+
+def submit(jobs, socket_path=None, host=DEFAULT_HOST, port=None):
+    """
+    Sends jobs to a running server and yields their results, a minimal blocking client.
+
+    The jobs are sent by a background thread while the results are read, so that a client with
+    more jobs than the queue of the server holds is slowed down instead of blocked.
+
+    Args:
+        jobs: An iterable of request dictionaries (see solve_job), each one with an "id" to match its result.
+        socket_path: Path of the Unix socket of the server.
+        host: Address of the TCP server.
+        port: Port of the TCP server, used when socket_path is None.
+
+    Yields:
+        The result dictionaries in completion order.
+    """
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection((host, port))
+
+    def send():
+        try:
+            for job in jobs:
+                connection.sendall((json.dumps(job) + "\n").encode())
+            connection.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    try:
+        with connection.makefile("rb") as results:
+            for line in results:
+                yield json.loads(line)
+    finally:
+        connection.close()
+        sender.join()
+
+def _init_worker():
+    """
+    Restores the default signal handling in a worker process.
+
+    A worker forked straight from the server would otherwise inherit the SIGTERM handler of its event
+    loop and the file descriptor waking it up: the SIGTERM a broken pool sends to its other workers
+    would then stop the server.
+    """
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+async def _serve(socket_path, host, port, jobs, queue_size):
+    """
+    Runs a server until it is interrupted.
+
+    Args:
+        socket_path: Path of the Unix socket, or None.
+        host: Address of the TCP server.
+        port: Port of the TCP server.
+        jobs: Number of worker processes.
+        queue_size: Number of jobs waiting for a worker before the server applies backpressure.
+    """
+    server = Server(jobs, queue_size)
+    # Stopping a sidecar with SIGTERM closes it as cleanly as an interrupt
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        address = await server.start(socket_path, host, port)
+        where = address if socket_path is not None else f"{address[0]}:{address[1]}"
+        print(f"Serving on {where} with {server.jobs} workers", flush=True)
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main():
+
+    # Define the parameters
+    helper = argparse.ArgumentParser(prog="serve_approx", description="Serve 2-Approximate Dominating Sets of undirected graphs as line-delimited JSON over a Unix socket or a local TCP port.")
+    where = helper.add_mutually_exclusive_group(required=True)
+    where.add_argument('-s', '--socket', type=str, help='path of the Unix socket to listen on')
+    where.add_argument('-p', '--port', type=int, help='TCP port to listen on (0 for any free port)')
+    helper.add_argument('--host', type=str, default=DEFAULT_HOST, help='address of the TCP server')
+    helper.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes solving the jobs (the number of CPUs by default)')
+    helper.add_argument('-q', '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, help='number of jobs waiting for a worker before the server stops reading requests')
+    helper.add_argument('--version', action='version', version='%(prog)s 3.3')
+
+    # Initialize the parameters
+    args = helper.parse_args()
+    with contextlib.suppress(KeyboardInterrupt, asyncio.CancelledError):
+        asyncio.run(_serve(args.socket, args.host, args.port, args.jobs, args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
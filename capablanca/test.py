@@ -4,11 +4,7 @@
 import time
 import argparse
 import math
-import networkx as nx
 
-from . import algorithm
-from . import applogger
-from . import parser
 from . import utils
 
 def restricted_float(x):
@@ -28,9 +24,14 @@ def main():
     helper.add_argument('-d', '--dimension', type=int, help="an integer specifying the dimensions of the square matrices", required=True)
     helper.add_argument('-n', '--num_tests', type=int, default=5, help="an integer specifying the number of tests to run")
     helper.add_argument('-s', '--sparsity', type=restricted_float, default=0.95, help="sparsity of the matrices (0.0 for dense, close to 1.0 for very sparse)")
+    helper.add_argument('-m', '--edges', type=int, default=None, help="generate uniformly random graphs with this number of edges in O(m) time and memory instead of matrices")
+    helper.add_argument('-g', '--degree', type=float, default=None, help="generate uniformly random graphs with this average degree in O(m) time and memory instead of matrices")
+    helper.add_argument('--seed', type=int, default=None, help="seed of the random graph generator, the i-th test uses seed + i")
+    helper.add_argument('-f', '--format', choices=['dimacs', 'npy'], default='dimacs', help="format of the files written with -w, DIMACS text or a binary NumPy edge array")
     helper.add_argument('-a', '--approximation', action='store_true', help='enable comparison with a polynomial-time approximation approach within a logarithmic factor')
     helper.add_argument('-b', '--bruteForce', action='store_true', help='enable comparison with the exponential-time brute-force approach')
     helper.add_argument('-c', '--count', action='store_true', help='calculate the size of the Dominating Set')
+    helper.add_argument('-r', '--reduce', action='store_true', help='apply the dominating set reduction rules before every solver')
     helper.add_argument('-w', '--write', action='store_true', help='write the generated random matrix to a file in the current directory')
     helper.add_argument('-v', '--verbose', action='store_true', help='anable verbose output')
     helper.add_argument('-l', '--log', action='store_true', help='enable file logging')
@@ -38,6 +39,15 @@ def main():
     
     # Initialize the parameters
     args = helper.parse_args()
+
+    # The solvers and the scientific stack they need are only imported once the arguments are
+    # parsed, so that -h and --version start without them
+    import scipy.sparse as sparse
+    from . import algorithm
+    from . import applogger
+    from . import parser
+    from . import reduction
+
     num_tests = args.num_tests
     matrix_shape = (args.dimension, args.dimension)
     sparsity = args.sparsity
@@ -46,26 +56,52 @@ def main():
     count = args.count
     bruteForce = args.bruteForce
     approximation = args.approximation
+    # Generate edge arrays directly instead of dense-parameterized matrices
+    generate_edges = args.edges is not None or args.degree is not None
     # Perform the tests    
     for i in range(num_tests):
         
-        logger.info(f"Creating Matrix {i + 1}")
-        
-        sparse_matrix = utils.random_matrix_tests(matrix_shape, sparsity)
+        if generate_edges:
+            logger.info(f"Creating Random Graph {i + 1}")
+
+            rows, cols = utils.random_graph_edges(args.dimension, edges=args.edges, degree=args.degree,
+                                                  seed=None if args.seed is None else args.seed + i)
+
+            graph = parser.edges_to_graph(rows, cols)
+            logger.info(f"Number of vertices: {args.dimension}")
+            logger.info(f"Number of edges: {len(rows)}")
+            logger.info(f"Average degree: {2 * len(rows) / max(args.dimension, 1)}")
+        else:
+            logger.info(f"Creating Matrix {i + 1}")
+
+            sparse_matrix = utils.random_matrix_tests(matrix_shape, sparsity)
+
+            if sparse_matrix is None:
+                continue
+
+            graph = utils.sparse_matrix_to_graph(sparse_matrix)
+            logger.info(f"Matrix shape: {sparse_matrix.shape}")
+            logger.info(f"Number of non-zero elements: {sparse_matrix.nnz}")
+            logger.info(f"Sparsity: {1 - (sparse_matrix.nnz / (sparse_matrix.shape[0] * sparse_matrix.shape[1]))}")
+
+        reduced = False
+        if args.reduce:
+            logger.info("Reduction Rules started")
+            started = time.time()
 
-        if sparse_matrix is None:
-            continue
+            reduced = reduction.reduce_graph(graph)
 
-        graph = utils.sparse_matrix_to_graph(sparse_matrix) 
-        logger.info(f"Matrix shape: {sparse_matrix.shape}")
-        logger.info(f"Number of non-zero elements: {sparse_matrix.nnz}")
-        logger.info(f"Sparsity: {1 - (sparse_matrix.nnz / (sparse_matrix.shape[0] * sparse_matrix.shape[1]))}")
+            kernel, forced, _, statistics = reduced
+            logger.info(f"Reduction Rules done in: {(time.time() - started) * 1000.0} milliseconds")
+            logger.info(f"Kernel with {kernel.number_of_nodes()} vertices and {kernel.number_of_edges()} edges, {len(forced)} forced vertices")
+            for rule, statistic in statistics.items():
+                logger.info(f"Reduction Rule {rule}: applied {statistic['count']} times in {statistic['time']} milliseconds")
         
         if approximation:
             logger.info("An Approximate Solution with a logarithmic approximation ratio started")
             started = time.time()
             
-            approximate_result = algorithm.find_dominating_set_approximation(graph)
+            approximate_result = algorithm.find_dominating_set_approximation(graph, reduce=reduced)
 
             logger.info(f"An Approximate Solution with a logarithmic approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds")
             
@@ -77,7 +113,7 @@ def main():
             logger.info("A solution with an exponential-time complexity started")
             started = time.time()
             
-            brute_force_result = algorithm.find_dominating_set_brute_force(graph)
+            brute_force_result = algorithm.find_dominating_set_brute_force(graph, reduce=reduced)
 
             logger.info(f"A solution with an exponential-time complexity done in: {(time.time() - started) * 1000.0} milliseconds")
             
@@ -89,7 +125,7 @@ def main():
         logger.info("Our Approximate Solution with a 2-approximation ratio started")
         started = time.time()
         
-        novel_result = algorithm.find_dominating_set(graph)
+        novel_result = algorithm.find_dominating_set(graph, reduce=reduced)
 
         logger.info(f"Our Approximate Solution with a 2-approximation ratio done in: {(time.time() - started) * 1000.0} milliseconds")
 
@@ -109,8 +145,16 @@ def main():
             output = f"Saving Matrix Test {i + 1}" 
             utils.println(output, logger, args.log)
     
-            filename = f"sparse_matrix_{i + 1}_{hash_string}"
-            parser.save_sparse_matrix_to_file(sparse_matrix, filename)
+            filename = f"{'random_graph' if generate_edges else 'sparse_matrix'}_{i + 1}_{hash_string}"
+            if args.format == 'npy':
+                filename += ".npy"
+                if not generate_edges:
+                    rows, cols = sparse.triu(sparse_matrix, k=1).nonzero()
+                parser.save_edges_to_npy(rows, cols, filename)
+            elif generate_edges:
+                parser.save_edges_to_file(rows, cols, args.dimension, filename)
+            else:
+                parser.save_sparse_matrix_to_file(sparse_matrix, filename)
             output = f"Matrix Test {i + 1} written to file {filename}." 
             utils.println(output, logger, args.log)
     
@@ -1,12 +1,11 @@
 # Created on 03/25/2025
 # Author: Frank Vega
 
-import scipy.sparse as sparse
-import numpy as np
+# NumPy, SciPy and NetworkX are imported by the functions using them, so that the command-line
+# tools can use the file name helpers without loading the scientific stack
+import os
 import random
 import string
-import os
-import networkx as nx
 
 def get_file_names(directory):
   """
@@ -62,6 +61,8 @@ def has_one_on_diagonal(adjacency_matrix):
     Returns:
         True if there is a 1 on the diagonal, False otherwise.
     """
+    import numpy as np
+
     diagonal = adjacency_matrix.diagonal()
     return np.any(diagonal == 1)
 
@@ -94,6 +95,8 @@ def make_symmetric(matrix):
     Raises:
         TypeError: if the input is not a sparse matrix.
     """
+    import numpy as np
+    import scipy.sparse as sparse
 
     if not sparse.issparse(matrix):
         raise TypeError("Input must be a SciPy sparse matrix.")
@@ -129,6 +132,8 @@ def random_matrix_tests(matrix_shape, sparsity=0.9):
         list: A list containing the results of each test.
         sparse matrix: the sparse matrix that was tested.
     """
+    import numpy as np
+    import scipy.sparse as sparse
 
     rows, cols = matrix_shape
     size = rows * cols
@@ -149,6 +154,88 @@ def random_matrix_tests(matrix_shape, sparsity=0.9):
 
     return symmetric_matrix
 
+def random_graph_edges(vertices, edges=None, degree=None, seed=None):
+    """
+    Generates a uniformly random simple undirected graph with a given number of edges, G(n, m), as edge arrays.
+
+    Every unordered pair {v, w} with w < v has the index v (v - 1) / 2 + w. The pair indices of a
+    G(n, p) graph are sampled in increasing order by adding geometric gaps, a chunk at a time, so
+    no pair is drawn twice and nothing proportional to n^2 is ever stored. The probability p is set
+    slightly above m / (n (n - 1) / 2) and a uniform sample of exactly m of the drawn pairs is kept,
+    which gives G(n, m) in O(n + m) expected time and memory.
+
+    Args:
+        vertices: The number of vertices n.
+        edges: The number of edges m.
+        degree: The average degree, giving m = round(n * degree / 2) when edges is not given.
+        seed: Seed of the random number generator (fresh entropy by default).
+
+    Returns:
+        A tuple (rows, cols) of int64 arrays with the 0-based endpoints of every edge (rows > cols),
+        sorted by pair index.
+
+    Raises:
+        ValueError: If neither edges nor degree is given, or the graph cannot have that many edges.
+    """
+    import numpy as np
+
+    if edges is None:
+        if degree is None:
+            raise ValueError("Either the number of edges or the average degree must be given.")
+        edges = round(vertices * degree / 2)
+    pairs = vertices * (vertices - 1) // 2
+    if vertices < 0 or edges < 0 or edges > pairs:
+        raise ValueError(f"A simple graph with {vertices} vertices cannot have {edges} edges.")
+    if edges == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    # Draw a few standard deviations more pairs than needed, so that a second attempt is very unlikely
+    probability = min(1.0, (edges + 4.0 * np.sqrt(edges) + 16.0) / pairs)
+    while True:
+        keys = _random_pair_indices(rng, pairs, probability)
+        if len(keys) >= edges:
+            break
+        probability = min(1.0, 2.0 * probability)
+
+    if len(keys) > edges:
+        # Dropping a uniform sample of the few extra pairs keeps a uniform sample of m pairs
+        keys = np.delete(keys, rng.choice(len(keys), size=len(keys) - edges, replace=False))
+
+    # Invert k = v (v - 1) / 2 + w, correcting the rounding of the square root
+    rows = ((1.0 + np.sqrt(1.0 + 8.0 * keys.astype(np.float64))) / 2.0).astype(np.int64)
+    rows -= rows * (rows - 1) // 2 > keys
+    rows += (rows + 1) * rows // 2 <= keys
+    cols = keys - rows * (rows - 1) // 2
+
+    return rows, cols
+
+def _random_pair_indices(rng, pairs, probability, chunk=1 << 20):
+    """
+    Samples every index of range(pairs) independently with a probability, in increasing order.
+
+    Args:
+        rng: A NumPy random Generator.
+        pairs: The number of indices.
+        probability: The probability of keeping an index.
+        chunk: The largest number of gaps drawn at once.
+
+    Returns:
+        An int64 array with the sampled indices, sorted increasingly.
+    """
+    import numpy as np
+
+    blocks = []
+    last = -1
+    while last < pairs:
+        # The gap between two consecutive sampled indices is geometric, about p (pairs - last) of them remain
+        expected = probability * (pairs - last - 1)
+        size = min(chunk, int(expected + 4.0 * np.sqrt(expected)) + 16)
+        block = last + np.cumsum(rng.geometric(probability, size=size))
+        last = int(block[-1])
+        blocks.append(block[block < pairs])
+    return np.concatenate(blocks)
+
 def string_result_format(result, count_result=False):
   """
   Returns a string indicating the dominating set.
@@ -186,6 +273,7 @@ def sparse_matrix_to_graph(adj_matrix, is_directed=False):
     Returns:
         A NetworkX graph.
     """
+    import networkx as nx
 
     
     rows, cols = adj_matrix.nonzero()
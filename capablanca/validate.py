@@ -0,0 +1,151 @@
+import numpy as np
+from . import chordal
+
+# SciPy is imported by the functions using it, so that loading the exact solver (which validates
+# its upper bound with is_dominating_set) does not load it on every run
+
+def find_undominated_csr(indptr, indices, members, dominated=None):
+    """
+    Finds the vertices without a dominator with one sparse matrix product over the CSR adjacency.
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1 (both directions of every edge stored).
+        indices: CSR column indices.
+        members: A boolean array of length n marking a candidate set, or an (n, k) boolean matrix with one
+            candidate set per column.
+        dominated: A boolean array of length n marking the vertices that need no dominator (none by default).
+
+    Returns:
+        A boolean array shaped like members, True for the vertices that no member of the set dominates.
+    """
+    import scipy.sparse as sparse
+
+    indptr = np.asarray(indptr, dtype=np.int64)
+    n = len(indptr) - 1
+    adjacency = sparse.csr_matrix((np.ones(len(indices), dtype=np.int32), np.asarray(indices), indptr), shape=(n, n))
+    members = np.asarray(members, dtype=bool)
+    vector = members.astype(np.int32)
+
+    undominated = ((adjacency @ vector) == 0) & ~members
+    if dominated is not None:
+        dominated = np.asarray(dominated, dtype=bool)
+        undominated &= ~(dominated[:, None] if members.ndim == 2 else dominated)
+    return undominated
+
+def is_dominating_set_csr(indptr, indices, dominating_set, dominated=None):
+    """
+    Checks a dominating set of a graph stored in CSR arrays.
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1.
+        indices: CSR column indices.
+        dominating_set: The vertex indices of the set.
+        dominated: A boolean array marking the vertices that need no dominator (none by default).
+
+    Returns:
+        True if every vertex is in the set, adjacent to one of its vertices or needs no dominator.
+    """
+    n = len(indptr) - 1
+    return not find_undominated_csr(indptr, indices, _members(dominating_set, n), dominated).any()
+
+def are_dominating_sets_csr(indptr, indices, candidate_sets, dominated=None):
+    """
+    Checks many candidate sets at once, as the columns of one matrix multiplied by the adjacency.
+
+    Args:
+        indptr: CSR row pointers, an integer array of length n + 1.
+        indices: CSR column indices.
+        candidate_sets: A (k, n) boolean matrix with one candidate set per row, or a list of k collections of vertex indices.
+        dominated: A boolean array marking the vertices that need no dominator (none by default).
+
+    Returns:
+        A boolean array of length k telling which candidate sets are dominating sets.
+    """
+    n = len(indptr) - 1
+    if isinstance(candidate_sets, np.ndarray):
+        members = candidate_sets.astype(bool).T
+    else:
+        members = np.zeros((n, len(candidate_sets)), dtype=bool)
+        for column, candidate_set in enumerate(candidate_sets):
+            members[_indices(candidate_set), column] = True
+    return ~find_undominated_csr(indptr, indices, members, dominated).any(axis=0)
+
+def find_undominated_edges(rows, cols, dominating_set, vertices=None):
+    """
+    Finds the vertices without a dominator straight from the edge arrays, with a sparse matrix product
+    over the edge list taken in both directions (no CSR arrays are built).
+
+    Args:
+        rows: 0-based first endpoint of every edge.
+        cols: 0-based second endpoint of every edge.
+        dominating_set: The vertex indices of the set.
+        vertices: The number of vertices (the largest endpoint or member plus one by default). Vertices
+            in no edge are not part of the graph and need no dominator.
+
+    Returns:
+        An integer array with the undominated vertices, sorted increasingly.
+    """
+    import scipy.sparse as sparse
+
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+    dominating_set = _indices(dominating_set)
+    if vertices is None:
+        vertices = int(max(rows.max(initial=-1), cols.max(initial=-1), dominating_set.max(initial=-1))) + 1
+    adjacency = sparse.coo_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(vertices, vertices))
+    members = _members(dominating_set, vertices)
+    # Weighting the members above the largest degree gives, in one product, the degree of every
+    # vertex (nonzero when it is in some edge) plus its dominators times the weight
+    weight = 2 * len(rows) + 1
+    vector = members.astype(np.int64) * weight + 1
+
+    product = adjacency @ vector + adjacency.T @ vector
+    return np.flatnonzero((product > 0) & (product < weight) & ~members)
+
+def is_dominating_set(graph, dominating_set, dominated=None):
+    """
+    Checks a dominating set of a NetworkX graph.
+
+    Args:
+        graph: A NetworkX graph.
+        dominating_set: A collection of vertices of graph.
+        dominated: A collection of vertices that need no dominator (none by default).
+
+    Returns:
+        True if every vertex of graph is in the set, adjacent to one of its vertices or needs no dominator.
+    """
+    nodes = list(graph.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    indptr, indices = chordal.graph_to_csr(graph, nodes, index)
+    members = [index[v] for v in dominating_set if v in index]
+    dominated = np.fromiter((v in dominated for v in nodes), dtype=bool, count=len(nodes)) if dominated else None
+    return is_dominating_set_csr(indptr, indices, members, dominated)
+
+def _members(dominating_set, n):
+    """
+    Converts a set of vertex indices to a boolean array.
+
+    Args:
+        dominating_set: The vertex indices of the set.
+        n: The number of vertices.
+
+    Returns:
+        A boolean array of length n.
+    """
+    members = np.zeros(n, dtype=bool)
+    members[_indices(dominating_set)] = True
+    return members
+
+def _indices(dominating_set):
+    """
+    Converts a set of vertex indices to an integer array (arrays and lists are converted at once).
+
+    Args:
+        dominating_set: The vertex indices of the set, as a NumPy array or any iterable.
+
+    Returns:
+        An integer array of the vertex indices.
+    """
+    if isinstance(dominating_set, (np.ndarray, list, tuple)):
+        return np.asarray(dominating_set, dtype=np.int64).reshape(-1)
+    return np.fromiter(dominating_set, dtype=np.int64)
@@ -47,7 +47,9 @@ setuptools.setup(
         'console_scripts': [
             'approx = capablanca.app:main',
             'test_approx = capablanca.test:main',
-            'batch_approx = capablanca.batch:main'
+            'batch_approx = capablanca.batch:main',
+            'bench_approx = capablanca.bench:main',
+            'serve_approx = capablanca.serve:main'
         ]
     }
 )
\ No newline at end of file
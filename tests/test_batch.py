@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import time
+import networkx as nx
+import pytest
+from capablanca import algorithm
+from capablanca import parser
+from capablanca import utils
+
+def random_graphs(count, largest, seed=0):
+    """Sparse G(n, p) graphs with many components of every strategy, some without edges."""
+    graphs = []
+    for i in range(count):
+        n = 1 + (seed + i) % largest
+        p = (0.01, 0.03, 0.08, 0.3)[i % 4]
+        graphs.append(nx.gnp_random_graph(n, p, seed=seed + i))
+    return graphs
+
+
+@pytest.mark.parametrize("seed", [0, 1000])
+def test_batch_matches_single_graphs(seed):
+    graphs = random_graphs(140, 80, seed)
+    expected = [algorithm.find_dominating_set(graph.copy()) for graph in graphs]
+    assert algorithm.find_dominating_sets(graphs) == expected
+
+
+def test_batch_matches_single_graphs_from_edge_arrays():
+    arrays = [utils.random_graph_edges(20 + i, 10 + 2 * i, seed=i) for i in range(60)]
+    expected = [algorithm.find_dominating_set(parser.edges_to_graph(rows, cols)) for rows, cols in arrays]
+    assert algorithm.find_dominating_sets(arrays) == expected
+
+
+def test_batch_matches_single_graphs_with_relabeled_vertices():
+    graphs = [nx.relabel_nodes(graph, {v: 1000 - 7 * v for v in graph}) for graph in random_graphs(60, 60, 7)]
+    expected = [algorithm.find_dominating_set(graph.copy()) for graph in graphs]
+    assert algorithm.find_dominating_sets(graphs) == expected
+
+
+def test_parallel_components_match_sequential():
+    graph = nx.disjoint_union_all(random_graphs(40, 300, 3))
+    assert algorithm.find_dominating_set(graph.copy(), workers=2) == algorithm.find_dominating_set(graph.copy())
+
+
+def processes_mentioning(text):
+    """The processes whose command line contains text, read from /proc."""
+    found = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit() and entry != str(os.getpid()):
+            try:
+                with open(f"/proc/{entry}/cmdline", "rb") as cmdline:
+                    if text.encode() in cmdline.read():
+                        found.append(int(entry))
+            except OSError:
+                continue
+    return found
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the process table from /proc")
+def test_timeout_kills_the_processes_started_by_a_file_worker(tmp_path):
+    directory = tmp_path / "graphs"
+    directory.mkdir()
+    rows, cols = utils.random_graph_edges(90, 200, seed=1)
+    parser.save_edges_to_file(rows, cols, 90, str(directory / "graph.dimacs"))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    # The brute force runs in a process of its own, started by the worker of the file. The output goes
+    # to a file, a pipe would stay open as long as any of those processes
+    with open(tmp_path / "output.txt", "w") as output:
+        subprocess.run([sys.executable, "-m", "capablanca.batch", "-i", str(directory), "-b", "-w", "2", "-t", "1", "--no-cache"],
+                       stdout=output, stderr=subprocess.DEVNULL, env=env, timeout=60, check=True)
+    assert "Timeout after 1.0 seconds" in (tmp_path / "output.txt").read_text()
+    time.sleep(0.5)
+    assert processes_mentioning(str(directory)) == []
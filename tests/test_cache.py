@@ -0,0 +1,70 @@
+import random
+import networkx as nx
+import numpy as np
+from capablanca import algorithm
+from capablanca import app
+from capablanca import cache
+from capablanca import parser
+
+def write_graph(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_graph_cache_round_trip(tmp_path):
+    graph_cache = cache.GraphCache(str(tmp_path / "cache"))
+    filename = write_graph(tmp_path / "graph.dimacs", "p edge 4 3\ne 3 4\ne 1 2\ne 2 3\n")
+    rows, cols = parser.read_arrays(filename, cache=graph_cache)
+    cached_rows, cached_cols = parser.read_arrays(filename, cache=graph_cache)
+    assert isinstance(cached_rows, np.memmap)
+    assert cached_rows.tolist() == rows.tolist() == [2, 0, 1]
+    assert cached_cols.tolist() == cols.tolist() == [3, 1, 2]
+    assert list(parser.read(filename, cache=graph_cache).edges()) == list(parser.read(filename).edges())
+
+
+def test_graph_cache_drops_invalid_entries(tmp_path):
+    graph_cache = cache.GraphCache(str(tmp_path / "cache"))
+    filename = write_graph(tmp_path / "graph.dimacs", "e 1 2\n")
+    parser.read_arrays(filename, cache=graph_cache)
+    key = graph_cache.key(filename)
+    with open(graph_cache.path(key), "ab") as file:
+        file.write(b"junk")
+    assert graph_cache.load(key) is None
+    assert parser.read_arrays(filename, cache=graph_cache)[0].tolist() == [0]
+
+
+def test_graph_cache_of_a_file_without_edges(tmp_path):
+    graph_cache = cache.GraphCache(str(tmp_path / "cache"))
+    filename = write_graph(tmp_path / "graph.dimacs", "p edge 3 0\n")
+    parser.read_arrays(filename, cache=graph_cache)
+    rows, cols = graph_cache.load(graph_cache.key(filename))
+    assert len(rows) == len(cols) == 0
+
+
+def test_result_key_follows_the_order_the_solver_sees():
+    results = cache.ResultCache()
+    edges = list(nx.gnp_random_graph(30, 0.1, seed=1).edges())
+    shuffled = edges[:]
+    random.Random(1).shuffle(shuffled)
+    graph = parser.edges_to_graph(*np.array(edges).T)
+    reordered = parser.edges_to_graph(*np.array(shuffled).T)
+    assert nx.utils.graphs_equal(graph, reordered)
+
+    # The solver breaks ties in graph order, so the two orders must not share a cached result
+    assert algorithm.find_dominating_set(graph.copy()) != algorithm.find_dominating_set(reordered.copy())
+    assert results.graph_key(graph) != results.graph_key(reordered)
+    assert results.graph_key(graph) == results.graph_key(parser.edges_to_graph(*np.array(edges).T))
+    assert results.graph_key(nx.relabel_nodes(graph, str)) is None
+
+
+def test_reordered_file_gets_its_own_result(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cache, "DEFAULT_CACHE_DIR", str(tmp_path / "cache"))
+    edges = list(nx.gnp_random_graph(30, 0.1, seed=1).edges())
+    shuffled = edges[:]
+    random.Random(1).shuffle(shuffled)
+    outputs = []
+    for name, order in (("graph", edges), ("reordered", shuffled), ("graph_again", edges), ("reordered_again", shuffled)):
+        filename = write_graph(tmp_path / f"{name}.dimacs", "".join(f"e {u + 1} {v + 1}\n" for u, v in order))
+        app.approximate_solution(filename, count=True, use_cache=True)
+        outputs.append(capsys.readouterr().out.splitlines()[-1].split(": ", 1)[1])
+    assert outputs[0] == outputs[2] != outputs[1] == outputs[3]
@@ -0,0 +1,115 @@
+import itertools
+import networkx as nx
+import pytest
+from capablanca import algorithm
+from capablanca import chordal
+
+SEEDS = range(40)
+
+
+def random_graph(seed):
+    """A small G(n, p) graph, often disconnected and sometimes without edges."""
+    n = 1 + seed % 10
+    p = (seed % 5) / 5
+    return nx.gnp_random_graph(n, p, seed=seed)
+
+
+def split_graph(graph):
+    """The chordal (split) transformation built by the original find_dominating_set."""
+    chordal_graph = nx.Graph()
+    for i in graph.nodes():
+        chordal_graph.add_edge((i, 0), (i, 1))
+        for j in graph.neighbors(i):
+            chordal_graph.add_edge((i, 0), (j, 1))
+    for i in graph.nodes():
+        for j in graph.nodes():
+            if i < j:
+                chordal_graph.add_edge((i, 0), (j, 0))
+    return chordal_graph
+
+
+def reference_greedy(chordal_graph):
+    """The dictionary-based greedy of approximate_dominating_set_chordal before the CSR kernel."""
+    graph, peo = nx.chordal.complete_to_chordal_graph(chordal_graph)
+    dominating_set = set()
+    dominated = dict.fromkeys(graph.nodes(), False)
+    for v in reversed(peo):
+        if not dominated[v]:
+            best_vertex = v
+            best_undominated_count = -1
+            for neighbor in [*list(graph.neighbors(v)), v]:
+                count = sum(not dominated[u] for u in [*list(graph.neighbors(neighbor)), neighbor])
+                if count > best_undominated_count:
+                    best_undominated_count = count
+                    best_vertex = neighbor
+            dominating_set.add(best_vertex)
+            dominated[best_vertex] = True
+            for neighbor in graph.neighbors(best_vertex):
+                dominated[neighbor] = True
+    return dominating_set
+
+
+def minimum_size(graph):
+    """The size of a minimum dominating set, by trying every subset."""
+    for k in range(graph.number_of_nodes() + 1):
+        if any(nx.is_dominating_set(graph, subset) for subset in itertools.combinations(graph, k)):
+            return k
+    return None
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_csr_kernel_matches_reference_greedy(seed):
+    graph = random_graph(seed)
+    if graph.number_of_edges() == 0:
+        graph.add_edge(0, graph.number_of_nodes())
+    for component in nx.connected_components(graph):
+        chordal_graph = split_graph(graph.subgraph(component))
+        assert chordal.approximate_dominating_set_chordal(chordal_graph) == reference_greedy(chordal_graph)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_csr_kernel_on_trees(seed):
+    tree = nx.random_labeled_tree(2 + seed % 15, seed=seed)
+    expected = reference_greedy(tree)
+    assert chordal.approximate_dominating_set_chordal(tree) == expected
+
+    # The reference greedy visits the neighbors in the order of a copy of the graph
+    copy = tree.copy()
+    nodes = list(copy.nodes())
+    indptr, indices = chordal.graph_to_csr(copy, nodes)
+    assert {nodes[i] for i in chordal.approximate_dominating_set_csr(indptr, indices)} == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_find_dominating_set_against_brute_force(seed):
+    graph = random_graph(seed)
+    dominating_set = algorithm.find_dominating_set(graph.copy())
+    if graph.number_of_edges() == 0:
+        # Documented behavior: no edges, no dominating set
+        assert dominating_set == set()
+        assert algorithm.find_dominating_set_brute_force(graph) is None
+        return
+
+    assert nx.is_dominating_set(graph, dominating_set)
+    optimum = minimum_size(graph)
+    assert len(algorithm.find_dominating_set_brute_force(graph)) == optimum
+    assert len(dominating_set) <= 2 * optimum
+
+
+def test_disconnected_graph_with_isolated_vertices():
+    graph = nx.disjoint_union_all([nx.path_graph(4), nx.empty_graph(3), nx.cycle_graph(5), nx.star_graph(3)])
+    dominating_set = algorithm.find_dominating_set(graph.copy())
+    assert nx.is_dominating_set(graph, dominating_set)
+    assert set(nx.isolates(graph)) <= dominating_set
+    assert len(dominating_set) <= 2 * minimum_size(graph)
+
+
+def test_edgeless_graphs():
+    assert algorithm.find_dominating_set(nx.Graph()) == set()
+    assert algorithm.find_dominating_set(nx.empty_graph(5)) == set()
+    assert algorithm.find_dominating_set_brute_force(nx.empty_graph(5)) is None
+
+
+def test_rejects_non_chordal_graph():
+    with pytest.raises(ValueError, match="not chordal"):
+        chordal.approximate_dominating_set_chordal(nx.cycle_graph(5))
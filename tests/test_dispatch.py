@@ -0,0 +1,82 @@
+import itertools
+import random
+import networkx as nx
+import numpy as np
+import pytest
+from capablanca import algorithm
+from capablanca import dispatch
+
+def graph_of_mask(size, mask):
+    """The graph on the vertices 0, ..., size - 1 whose edge {i, j} with i < j is the bit j (j - 1) / 2 + i of mask."""
+    graph = nx.empty_graph(size)
+    graph.add_edges_from((i, j) for j in range(size) for i in range(j) if mask >> (j * (j - 1) // 2 + i) & 1)
+    return graph
+
+
+def masks(size, samples=400):
+    """Every adjacency bitmask of a small size, or a random sample of them."""
+    count = 1 << size * (size - 1) // 2
+    if count <= samples:
+        return range(count)
+    return random.Random(size).sample(range(count), samples)
+
+
+@pytest.mark.parametrize("size", range(1, dispatch.TINY_COMPONENT_SIZE + 1))
+def test_optimal_table_matches_exact_solver(size):
+    table = dispatch.optimal_table(size)
+    assert len(table) == 1 << size * (size - 1) // 2
+    for mask in masks(size):
+        graph = graph_of_mask(size, mask)
+        subset = {v for v in range(size) if table[mask] >> v & 1}
+        assert nx.is_dominating_set(graph, subset)
+        if graph.number_of_edges() == 0:
+            assert subset == set(graph)
+            continue
+        minimum, optimal = algorithm.find_dominating_set_exact(graph)
+        assert optimal
+        assert len(subset) == len(minimum)
+
+
+def test_optimal_table_keeps_the_first_minimum_set():
+    # The path 0 - 1 - 2 is dominated by 1 alone, the triangle and the graph of one edge by 0
+    assert dispatch.optimal_table(3)[0b101] == 0b010
+    assert dispatch.optimal_table(3)[0b111] == 0b001
+    assert dispatch.optimal_table(2)[0b1] == 0b01
+
+
+def test_tiny_components_are_looked_up_with_minimum_sets():
+    graphs = [graph for size in range(2, dispatch.TINY_COMPONENT_SIZE + 1)
+              for graph in (nx.connected_watts_strogatz_graph(size, 2, 0.5, seed=size), nx.path_graph(size), nx.star_graph(size - 1))]
+    for graph in graphs:
+        assert dispatch.strategy(graph.number_of_nodes()) == "lookup"
+        minimum, _ = algorithm.find_dominating_set_exact(graph)
+        dominating_set = dispatch.solve_component(graph)
+        assert nx.is_dominating_set(graph, dominating_set)
+        assert len(dominating_set) == len(minimum)
+
+    # The same components solved all at once from one block-diagonal CSR adjacency
+    union = nx.disjoint_union_all(graphs)
+    starts = np.cumsum([0] + [graph.number_of_nodes() for graph in graphs])
+    indptr = np.zeros(union.number_of_nodes() + 1, dtype=np.int64)
+    indices = []
+    for v in union:
+        indices.extend(union.neighbors(v))
+        indptr[v + 1] = len(indices)
+    chosen = dispatch.solve_tiny_blocks(indptr, np.array(indices, dtype=np.int64), starts[:-1], starts[1:])
+    assert nx.is_dominating_set(union, set(chosen.tolist()))
+    for start, end, graph in zip(starts[:-1], starts[1:], graphs, strict=True):
+        assert np.count_nonzero((chosen >= start) & (chosen < end)) == len(algorithm.find_dominating_set_exact(graph)[0])
+
+
+def test_larger_components_are_searched():
+    assert dispatch.strategy(dispatch.TINY_COMPONENT_SIZE + 1) == "exact"
+    assert dispatch.strategy(dispatch.SMALL_COMPONENT_SIZE + 1) == "chordal"
+    assert dispatch.strategy(2, dominated=True) == "exact"
+    for graph in itertools.islice((nx.gnp_random_graph(12, 0.3, seed=seed) for seed in itertools.count()), 20):
+        for component in nx.connected_components(graph):
+            subgraph = graph.subgraph(component)
+            if subgraph.number_of_edges() == 0:
+                continue
+            dominating_set = dispatch.solve_component(subgraph)
+            assert nx.is_dominating_set(subgraph, dominating_set)
+            assert len(dominating_set) == len(algorithm.find_dominating_set_exact(subgraph)[0])
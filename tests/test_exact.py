@@ -0,0 +1,102 @@
+import itertools
+import networkx as nx
+import pytest
+from capablanca import algorithm
+from capablanca import exact
+
+SEEDS = range(60)
+
+
+def random_graph(seed):
+    """A G(n, p) graph with up to 12 vertices, often disconnected."""
+    n = 2 + seed % 11
+    p = (0.15, 0.3, 0.5, 0.8)[seed % 4]
+    graph = nx.gnp_random_graph(n, p, seed=seed)
+    if graph.number_of_edges() == 0:
+        graph.add_edge(0, 1)
+    return graph
+
+
+def minimum_size(graph, dominated=()):
+    """The size of a smallest set dominating the vertices not in dominated, by trying every subset."""
+    targets = set(graph) - set(dominated)
+    for k in range(graph.number_of_nodes() + 1):
+        for subset in itertools.combinations(graph, k):
+            covered = set(subset).union(*(graph[v] for v in subset))
+            if targets <= covered:
+                return k
+    return None
+
+
+def hard_graph():
+    """A graph on which the search needs far more than a few nodes to prove optimality."""
+    return nx.gnp_random_graph(60, 0.08, seed=1)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_matches_exhaustive_search(seed):
+    graph = random_graph(seed)
+    dominating_set, optimal = exact.find_dominating_set_exact(graph)
+    assert optimal
+    assert nx.is_dominating_set(graph, dominating_set)
+    assert len(dominating_set) == minimum_size(graph)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("reduce", [False, True])
+def test_solver_entry_point_matches_exhaustive_search(seed, reduce):
+    graph = random_graph(seed)
+    dominating_set, optimal = algorithm.find_dominating_set_exact(graph, reduce=reduce)
+    assert optimal
+    assert nx.is_dominating_set(graph, dominating_set)
+    assert len(dominating_set) == minimum_size(graph)
+    assert algorithm.find_dominating_set_brute_force(graph, reduce=reduce) == dominating_set
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dominated_vertices_need_no_dominator(seed):
+    graph = random_graph(seed)
+    dominated = set(list(graph)[::3])
+    dominating_set, optimal = exact.find_dominating_set_exact(graph, dominated=dominated)
+    assert optimal
+    assert set(graph) - dominated <= dominating_set.union(*(graph[v] for v in dominating_set))
+    assert len(dominating_set) == minimum_size(graph, dominated)
+
+
+def test_upper_bound_is_kept_when_optimal():
+    graph = nx.star_graph(5)
+    assert exact.find_dominating_set_exact(graph, upper_bound={0}) == ({0}, True)
+
+
+def test_rejects_an_upper_bound_that_does_not_dominate():
+    with pytest.raises(ValueError, match="not a dominating set"):
+        exact.find_dominating_set_exact(nx.path_graph(4), upper_bound={0})
+
+
+def test_graphs_without_edges():
+    assert exact.find_dominating_set_exact(nx.empty_graph(3)) == (None, True)
+    assert algorithm.find_dominating_set_exact(nx.Graph()) == (None, True)
+
+
+@pytest.mark.parametrize("limits", [{"node_limit": 0}, {"node_limit": 20}, {"time_limit": 0}])
+def test_limits_return_a_valid_set_flagged_not_optimal(limits):
+    graph = hard_graph()
+    dominating_set, optimal = exact.find_dominating_set_exact(graph, **limits)
+    assert not optimal
+    assert nx.is_dominating_set(graph, dominating_set)
+
+    upper_bound = algorithm.find_dominating_set(graph.copy())
+    dominating_set, optimal = exact.find_dominating_set_exact(graph, upper_bound=upper_bound, **limits)
+    assert not optimal
+    assert nx.is_dominating_set(graph, dominating_set)
+    assert len(dominating_set) <= len(upper_bound)
+
+
+@pytest.mark.parametrize("limits", [{"node_limit": 20}, {"time_limit": 0}])
+@pytest.mark.parametrize("reduce", [False, True])
+def test_solver_entry_point_limits(limits, reduce):
+    graph = hard_graph()
+    dominating_set, optimal = algorithm.find_dominating_set_exact(graph, reduce=reduce, **limits)
+    assert not optimal
+    assert nx.is_dominating_set(graph, dominating_set)
+    assert len(dominating_set) <= len(algorithm.find_dominating_set(graph.copy()))
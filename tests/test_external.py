@@ -0,0 +1,72 @@
+import io
+import random
+import networkx as nx
+import numpy as np
+import pytest
+from capablanca import external
+from capablanca import parser
+
+def dimacs_with_errors(seed, edges=3000):
+    """A DIMACS text of a random graph with some of its edges repeated, reversed or not, and sometimes a bad line."""
+    generator = random.Random(seed)
+    n = 50 + seed
+    pairs = list({tuple(sorted(generator.sample(range(1, n + 1), 2))) for _ in range(edges)})
+    pairs += [(v, v) for v in range(1, n + 1, 7)]
+    generator.shuffle(pairs)
+    lines = [f"e {u} {v}" for u, v in pairs]
+    for _ in range(seed % 4):
+        u, v = pairs[generator.randrange(len(pairs))]
+        lines.insert(generator.randrange(len(lines) + 1), f"e {v} {u}" if generator.random() < 0.5 else f"e {u} {v}")
+    if seed % 3 == 0:
+        lines.insert(generator.randrange(len(lines) + 1), "e 1")
+    return "p edge {} {}\n".format(n, len(lines)) + "\n".join(lines) + "\n"
+
+
+def out_of_core(filename, small=False):
+    """The out-of-core graph of a file, with tiny buffers when small, so the keys go through many runs and steps."""
+    graph = external.OutOfCoreGraph(external.MIN_MEMORY_LIMIT)
+    if small:
+        graph.block_size, graph.run_keys, graph.merge_keys = 64, 500, 1
+    graph.read(filename)
+    return graph
+
+
+def error_of(function, *args):
+    """The message of the ValueError raised by function(*args), or None."""
+    try:
+        function(*args)
+    except ValueError as error:
+        return str(error)
+    return None
+
+
+@pytest.mark.parametrize("seed", range(12))
+@pytest.mark.parametrize("small", [False, True])
+def test_errors_match_the_in_memory_parser(tmp_path, seed, small):
+    text = dimacs_with_errors(seed)
+    filename = tmp_path / "graph.dimacs"
+    filename.write_text(text)
+    expected = error_of(parser.read_edges, io.StringIO(text))
+    assert error_of(lambda: out_of_core(str(filename), small).close()) == expected
+    if expected is None:
+        graph = parser.read(str(filename))
+        with out_of_core(str(filename), small) as ours:
+            assert (ours.vertices, ours.edges) == (graph.number_of_nodes(), graph.number_of_edges())
+
+
+def test_repeated_self_loop(tmp_path):
+    filename = tmp_path / "graph.dimacs"
+    filename.write_text("e 1 1\ne 1 2\ne 1 1\n")
+    assert error_of(out_of_core, str(filename)) == "The input file contains a repeated edge at line 2"
+    filename.write_text("e 1 1\ne 1 2\n")
+    with out_of_core(str(filename)) as graph:
+        assert (graph.vertices, graph.edges) == (2, 2)
+
+
+def test_npy_edges_are_merged(tmp_path):
+    filename = str(tmp_path / "graph.npy")
+    parser.save_edges_to_npy(np.array([0, 1, 1, 2]), np.array([1, 2, 0, 3]), filename)
+    with out_of_core(filename) as graph:
+        assert (graph.vertices, graph.edges) == (4, 3)
+        solution = graph.solve()
+        assert nx.is_dominating_set(nx.path_graph(4), solution.tolist())
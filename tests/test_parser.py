@@ -0,0 +1,157 @@
+import bz2
+import io
+import lzma
+import random
+import numpy as np
+import pytest
+from capablanca import parser
+
+def reference_edges(text):
+    """The edges read by the line-by-line parser of create_sparse_matrix_from_file before the vectorized one."""
+    edges, seen = [], set()
+    for i, line in enumerate(io.StringIO(text)):
+        line = line.strip()
+        if not line.startswith('c') and not line.startswith('p'):
+            edge = [int(node) for node in line.split(' ') if node != 'e']
+            if len(edge) != 2 or min(edge[0], edge[1]) <= 0:
+                raise ValueError(f"The input file is not in the correct DIMACS format at line {i}")
+            if frozenset(edge) in seen:
+                raise ValueError(f"The input file contains a repeated edge at line {i}")
+            seen.add(frozenset(edge))
+            edges.append((edge[0] - 1, edge[1] - 1))
+    return edges
+
+
+def random_dimacs(seed, edges=200):
+    """A DIMACS text with comments, a problem line and edges with and without the 'e' descriptor."""
+    generator = random.Random(seed)
+    n = 2 + seed % 50
+    pairs = list({tuple(sorted(generator.sample(range(1, n + 1), 2))) for _ in range(edges)})
+    generator.shuffle(pairs)
+    lines = [f"c graph {seed}", f"p edge {n} {len(pairs)}"]
+    for u, v in pairs:
+        if generator.random() < 0.5:
+            u, v = v, u
+        lines.append(f"e {u} {v}" if generator.random() < 0.8 else f"{u} {v}")
+        if generator.random() < 0.05:
+            lines.append("c a comment between the edges")
+    return "\n".join(lines) + ("\n" if seed % 2 else "")
+
+
+def read_text(text, block_size=parser.BLOCK_SIZE):
+    rows, cols, lines = [], [], []
+    bad_line = None
+    for block_rows, block_cols, block_lines, block_bad_line, _ in parser.iter_edge_blocks(io.BytesIO(text.encode()), block_size):
+        rows.append(block_rows)
+        cols.append(block_cols)
+        lines.append(block_lines)
+        bad_line = block_bad_line
+    rows, cols = parser.merge_edge_blocks(rows, cols, lines, bad_line)
+    return list(zip(rows.tolist(), cols.tolist(), strict=True))
+
+
+def error_of(function, *args):
+    """The message of the ValueError raised by function(*args)."""
+    try:
+        function(*args)
+    except ValueError as error:
+        return str(error)
+    pytest.fail(f"{function.__name__} raised no ValueError")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_line_by_line_parser(seed):
+    text = random_dimacs(seed)
+    assert read_text(text) == reference_edges(text)
+    rows, cols = parser.read_edges(io.StringIO(text))
+    assert list(zip(rows.tolist(), cols.tolist(), strict=True)) == reference_edges(text)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1000])
+def test_blocks_split_lines_anywhere(block_size):
+    text = random_dimacs(3)
+    assert read_text(text, block_size) == reference_edges(text)
+
+
+@pytest.mark.parametrize(("line", "kind"), [
+    ("e 1", "format"),
+    ("e 1 2 3", "format"),
+    ("e 0 2", "format"),
+    ("e 2 0", "format"),
+    ("e -1 2", "format"),
+    ("e 1 x", "format"),
+    ("e 1 2x", "format"),
+    ("f 1 2", "format"),
+    ("e 1 " + "9" * (parser.MAX_DIGITS + 1), "format"),
+    ("e 1 2", "repeated edge"),
+    ("e 2 1", "repeated edge"),
+])
+@pytest.mark.parametrize("block_size", [parser.BLOCK_SIZE, 5])
+def test_error_line_numbers(line, kind, block_size):
+    text = "c example\np edge 4 3\ne 1 2\ne 2 3\n" + line + "\ne 3 4\n"
+    message = error_of(read_text, text, block_size)
+    assert kind in message
+    assert message.endswith("at line 4")
+    # The line-by-line parser accepted any integer and failed on other tokens with the error of int()
+    if "9" * (parser.MAX_DIGITS + 1) not in line:
+        reference = error_of(reference_edges, text)
+        assert message == reference or not reference.startswith("The input file")
+
+
+def test_earliest_error_is_reported():
+    # A repeated edge before a bad line, and a bad line before a repeated edge
+    assert error_of(read_text, "e 1 2\ne 1 2\ne 0 1\n").endswith("repeated edge at line 1")
+    assert error_of(read_text, "e 1 2\ne 0 1\ne 1 2\n").endswith("format at line 1")
+    # The edges after a bad line are not read, even when one of them repeats an earlier edge
+    assert error_of(read_text, "e 1 2\ne 2 3\ne 1\ne 2 1\n").endswith("format at line 2")
+
+
+def test_blank_lines_and_whitespace():
+    text = "c comment\n\n  e 1\t2  \r\ne 2 3\n\n"
+    assert read_text(text) == [(0, 1), (1, 2)]
+
+
+def test_empty_input():
+    assert read_text("") == []
+    assert read_text("c only comments\np edge 0 0\n") == []
+
+
+def test_large_vertex_numbers():
+    big = 10 ** parser.MAX_DIGITS - 1
+    assert read_text(f"e {big} 1\ne 2 {big}\n") == [(big - 1, 0), (1, big - 1)]
+
+
+@pytest.mark.parametrize("extension", ["dimacs", "xz", "bz2", "npy"])
+def test_read_file_edges(tmp_path, extension):
+    text = random_dimacs(11)
+    expected = reference_edges(text)
+    filename = str(tmp_path / f"graph.{extension}")
+    if extension == "npy":
+        rows, cols = np.array(expected).T
+        parser.save_edges_to_npy(rows, cols, filename)
+    else:
+        opener = {"dimacs": open, "xz": lzma.open, "bz2": bz2.open}[extension]
+        with opener(filename, "wt") as file:
+            file.write(text)
+    rows, cols = parser.read_file_edges(filename)
+    assert list(zip(rows.tolist(), cols.tolist(), strict=True)) == expected
+
+
+@pytest.mark.parametrize("extension", ["txt", "xz", "bz2", "npy"])
+def test_save_dominating_set_round_trip(tmp_path, extension, monkeypatch):
+    # Small steps write the sets over many chunks
+    monkeypatch.setattr(parser, "WRITE_STEP", 3)
+    filename = str(tmp_path / f"set.{extension}")
+    for dominating_set in ({5, 0, 12, 99, 100, 1000, 7}, [3, 1, 2], np.arange(0, 40, 3), np.array([9, 2, 30, 4, 11]), None, set()):
+        expected = sorted(int(v) for v in (() if dominating_set is None else dominating_set))
+        assert parser.save_dominating_set(dominating_set, filename) == len(expected)
+        assert parser.read_dominating_set(filename).tolist() == expected
+
+
+def test_save_dominating_set_streams_a_memory_mapped_array(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "WRITE_STEP", 4)
+    path = str(tmp_path / "set.bin")
+    np.arange(0, 100, 7, dtype=np.int64).tofile(path)
+    vertices = np.memmap(path, dtype=np.int64, mode="r")
+    parser.save_dominating_set(vertices, str(tmp_path / "set.txt"))
+    assert (tmp_path / "set.txt").read_text().split() == [str(v + 1) for v in range(0, 100, 7)]
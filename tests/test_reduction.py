@@ -0,0 +1,146 @@
+import itertools
+import networkx as nx
+import pytest
+from capablanca import reduction
+
+SEEDS = range(80)
+
+
+def minimum_set(graph, dominated=()):
+    """A smallest set dominating the vertices not in dominated, by trying every subset."""
+    targets = set(graph) - set(dominated)
+    for k in range(graph.number_of_nodes() + 1):
+        for subset in itertools.combinations(graph, k):
+            if targets <= set(subset).union(*(graph[v] for v in subset)):
+                return set(subset)
+    return None
+
+
+def random_graph(seed):
+    """A G(n, p) graph with up to 12 vertices, often with pendant and isolated vertices."""
+    n = 1 + seed % 12
+    p = (0.1, 0.2, 0.35, 0.6)[seed % 4]
+    return nx.gnp_random_graph(n, p, seed=seed)
+
+
+def reducer(edges, nodes=(), dominated=None):
+    graph = nx.Graph(edges)
+    graph.add_nodes_from(nodes)
+    return reduction._Reducer(graph, dominated)
+
+
+def count(reducer, rule):
+    return reducer.statistics[rule]["count"]
+
+
+def test_isolated():
+    state = reducer([], nodes=[0, 1], dominated={1})
+    state._isolated(0)
+    state._isolated(1)
+    assert state.forced == {0}
+    assert state.adjacency == {}
+    assert count(state, "isolated") == 2
+
+
+def test_dominated_edge():
+    state = reducer([(0, 1), (1, 2)], dominated={0, 1})
+    state._dominated_edge(0)
+    assert state.adjacency == {0: set(), 1: {2}, 2: {1}}
+    assert count(state, "dominated_edge") == 1
+
+
+def test_redundant():
+    # Vertex 0 dominates both neighbors of the dominated vertex 4
+    state = reducer([(4, 1), (4, 2), (0, 1), (0, 2)], dominated={4})
+    state._redundant(4)
+    assert 4 not in state.adjacency
+    assert count(state, "redundant") == 1
+
+    state = reducer([(4, 1), (4, 2), (0, 1)], dominated={4})
+    state._redundant(4)
+    assert 4 in state.adjacency
+    assert count(state, "redundant") == 0
+
+
+def test_pendant():
+    state = reducer([(0, 1), (1, 2)])
+    state._pendant(0)
+    assert state.forced == {1}
+    assert state.dominated == {0, 2}
+    assert state.adjacency == {0: set(), 2: set()}
+
+    state = reducer([(0, 1), (1, 2)], dominated={0})
+    state._pendant(0)
+    assert state.forced == set()
+
+
+def test_twin():
+    state = reducer([(0, 1), (0, 2), (1, 2), (2, 3)])
+    state._twin(0)
+    assert set(state.adjacency) == {0, 2, 3}
+    assert count(state, "twin") == 1
+
+
+def test_dominated_neighborhood():
+    state = reducer([(0, 1), (1, 2)])
+    state._dominated_neighborhood(0)
+    assert state.dominated == {1}
+    assert count(state, "dominated_neighborhood") == 1
+
+
+def test_alber():
+    state = reducer([(0, 1), (0, 2), (0, 3), (3, 4)])
+    state._alber(0)
+    assert state.forced == {0}
+    assert count(state, "alber") == 1
+
+    # Every neighbor of a cycle vertex has a neighbor outside its closed neighborhood
+    state = reducer(nx.cycle_graph(6).edges())
+    state._alber(0)
+    assert state.forced == set()
+
+
+def test_hubs_are_skipped():
+    star = nx.star_graph(reduction.DEGREE_LIMIT + 1)
+    state = reduction._Reducer(star, None)
+    state._alber(0)
+    state._twin(0)
+    assert state.forced == set()
+    assert count(state, "twin") == 0
+
+
+def test_input_graph_is_not_modified():
+    graph = nx.path_graph(5)
+    edges = list(graph.edges())
+    reduction.reduce_graph(graph)
+    assert list(graph.edges()) == edges
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_kernel_keeps_the_optimum(seed):
+    graph = random_graph(seed)
+    kernel, forced, dominated, _ = reduction.reduce_graph(graph)
+    assert set(kernel) <= set(graph)
+    assert not forced & set(kernel)
+    solution = minimum_set(kernel, dominated)
+    assert nx.is_dominating_set(graph, solution | forced)
+    assert len(solution) + len(forced) == len(minimum_set(graph))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_kernel_keeps_the_optimum_with_dominated_vertices(seed):
+    graph = random_graph(seed)
+    given = set(list(graph)[1::3])
+    kernel, forced, dominated, _ = reduction.reduce_graph(graph, given)
+    solution = minimum_set(kernel, dominated) | forced
+    assert set(graph) - given <= solution.union(*(graph[v] for v in solution))
+    assert len(solution) == len(minimum_set(graph, given))
+
+
+def test_every_rule_applies_on_random_graphs():
+    counts = dict.fromkeys(reduction.RULES, 0)
+    for seed in SEEDS:
+        for given in (None, set(list(random_graph(seed))[1::3])):
+            for rule, statistics in reduction.reduce_graph(random_graph(seed), given)[3].items():
+                counts[rule] += statistics["count"]
+    assert all(counts.values()), counts
@@ -0,0 +1,87 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from capablanca import parser
+from capablanca import serve
+from capablanca import utils
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the process tree from /proc")
+
+
+def children(pid):
+    """The processes whose parent is pid, read from /proc."""
+    found = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as stat:
+                    # The fields after the parenthesized command name start with the state and the parent pid
+                    fields = stat.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) == pid:
+                found.append(int(entry))
+    return found
+
+
+def workers(server):
+    """The worker processes of a server: its children, or the ones of its forkserver, but not the helpers of multiprocessing."""
+    found = []
+    for child in children(server):
+        try:
+            with open(f"/proc/{child}/cmdline", "rb") as cmdline:
+                command = cmdline.read()
+        except OSError:
+            continue
+        if b"forkserver import main" in command:
+            found.extend(children(child))
+        elif b"resource_tracker import main" not in command:
+            found.append(child)
+    return found
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "serve.sock")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    process = subprocess.Popen([sys.executable, "-m", "capablanca.serve", "-s", socket_path, "-j", "2"],
+                               stdout=subprocess.PIPE, text=True, env=env)
+    assert process.stdout.readline().startswith("Serving on")
+    yield process, socket_path
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+def test_server_survives_a_killed_worker(server, tmp_path):
+    process, socket_path = server
+    rows, cols = utils.random_graph_edges(100000, 200000, seed=1)
+    graph_path = str(tmp_path / "graph.dimacs")
+    parser.save_edges_to_file(rows, cols, 100000, graph_path)
+
+    results = []
+    jobs = [{"id": i, "path": graph_path, "count": True} for i in range(2)]
+    client = threading.Thread(target=lambda: results.extend(serve.submit(jobs, socket_path=socket_path)))
+    client.start()
+    deadline = time.monotonic() + 10
+    while not workers(process.pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    # The pool breaks and stops its other workers, which must not stop the server
+    os.kill(workers(process.pid)[0], signal.SIGKILL)
+    client.join(timeout=60)
+
+    assert sorted(result["id"] for result in results) == [0, 1]
+    assert all(result["status"] == "ok" for result in results)
+    after = list(serve.submit([{"id": "after", "dimacs": "p edge 3 2\ne 1 2\ne 2 3\n"}], socket_path=socket_path))
+    assert after[0]["status"] == "ok"
+    assert after[0]["dominating_set"] == [2]
+    assert process.poll() is None
+    assert os.path.exists(socket_path)
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=10) == 0
+    assert not os.path.exists(socket_path)